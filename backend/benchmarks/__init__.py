@@ -0,0 +1 @@
+"""Offline benchmarks for ingestion, query and retrieval, with local stand-ins."""
@@ -0,0 +1,117 @@
+"""Deterministic synthetic legal corpora (text, PDF and DOCX)."""
+
+import random
+from typing import List
+from docx import Document
+
+VOCABULARY = (
+    "agreement party parties shall hereby warrant indemnify covenant breach notice "
+    "termination clause section herein thereof lessee lessor tenant landlord premises "
+    "contract obligation liability damages remedy arbitration jurisdiction venue court "
+    "plaintiff defendant witness testimony exhibit deposition counsel motion ruling "
+    "statute regulation compliance confidential disclosure property payment invoice "
+    "delivery schedule amendment assignment successor consent waiver default interest "
+    "settlement claim dispute evidence hearing judgment appeal order license royalty "
+    "employee employer severance benefits insurance coverage premium policy deductible"
+).split()
+
+
+def make_sentence(rng: random.Random, min_words: int = 8, max_words: int = 20) -> str:
+    """Build one pseudo-legal sentence."""
+    words = [rng.choice(VOCABULARY) for _ in range(rng.randint(min_words, max_words))]
+    return " ".join(words).capitalize() + "."
+
+
+def make_paragraph(rng: random.Random, sentences: int = 4) -> str:
+    """Build one paragraph of sentences."""
+    return " ".join(make_sentence(rng) for _ in range(sentences))
+
+
+def make_page_lines(rng: random.Random, lines: int = 45, width: int = 90) -> List[str]:
+    """Build the lines of one page, wrapped to ``width`` characters."""
+    words = " ".join(make_sentence(rng) for _ in range(lines)).split()
+    page_lines, current = [], ""
+    for word in words:
+        if len(current) + len(word) + 1 > width:
+            page_lines.append(current)
+            if len(page_lines) == lines:
+                break
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    return page_lines
+
+
+def _pdf_escape(text: str) -> str:
+    """Escape a string for a PDF literal."""
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: str, pages: int, seed: int) -> None:
+    """
+    Write a text PDF with ``pages`` pages of Helvetica text.
+
+    The file is assembled directly (no PDF library is needed for writing) and
+    is readable by PyPDF2's text extraction.
+
+    Args:
+        path: Output path
+        pages: Number of pages
+        seed: Random seed; the same seed yields the same bytes
+    """
+    rng = random.Random(seed)
+    # Object numbers: 1 catalog, 2 pages tree, 3 font, then (page, content) pairs
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    for index in range(pages):
+        page_id, content_id = 4 + index * 2, 5 + index * 2
+        kids.append(f"{page_id} 0 R")
+        lines = make_page_lines(rng)
+        text = "BT /F1 10 Tf 12 TL 50 760 Td " + " ".join(
+            f"({_pdf_escape(line)}) Tj T*" for line in lines
+        ) + " ET"
+        stream = text.encode("latin-1")
+        objects[content_id] = (
+            f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream"
+        )
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode()
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>".encode()
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(output)
+        output += f"{number} 0 obj\n".encode() + objects[number] + b"\nendobj\n"
+    xref_offset = len(output)
+    count = max(objects) + 1
+    output += f"xref\n0 {count}\n0000000000 65535 f \n".encode()
+    for number in range(1, count):
+        output += f"{offsets[number]:010d} 00000 n \n".encode()
+    output += (
+        f"trailer\n<< /Size {count} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+    ).encode()
+
+    with open(path, "wb") as pdf_file:
+        pdf_file.write(output)
+
+
+def write_docx(path: str, paragraphs: int, seed: int) -> None:
+    """
+    Write a DOCX document with ``paragraphs`` paragraphs.
+
+    Args:
+        path: Output path
+        paragraphs: Number of paragraphs
+        seed: Random seed
+    """
+    rng = random.Random(seed)
+    document = Document()
+    for _ in range(paragraphs):
+        document.add_paragraph(make_paragraph(rng))
+    document.save(path)
@@ -0,0 +1,196 @@
+"""
+Ingestion throughput benchmark.
+
+Generates a synthetic PDF/DOCX corpus and runs it through the production
+IngestPipeline (DocumentProcessor, the OllamaEmbeddings client and the
+Neo4jVectorStore writer). The backends are local stand-ins: a fake Ollama
+embedding server and an in-memory vector index.
+
+Usage (from backend/):
+    python -m benchmarks.ingest_bench --pdf-docs 20 --pages 30 --docx-docs 10 \\
+        --output ingest.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from benchmarks.corpus import write_docx, write_pdf
+from benchmarks.stand_ins import (
+    FakeOllamaServer,
+    InMemoryStorage,
+    InMemoryVectorIndex,
+    local_vector_store,
+)
+from config import settings
+from services.document_processor import DocumentProcessor
+from services.ingest_pipeline import STAGES, IngestPipeline
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def build_corpus(directory: str, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Write the synthetic corpus and return pipeline items for it."""
+    items = []
+    for index in range(args.pdf_docs):
+        filename = f"contract_{index:04d}.pdf"
+        path = os.path.join(directory, filename)
+        write_pdf(path, args.pages, seed=args.seed + index)
+        items.append({"filename": filename, "local_path": path})
+    for index in range(args.docx_docs):
+        filename = f"memo_{index:04d}.docx"
+        path = os.path.join(directory, filename)
+        write_docx(path, args.paragraphs, seed=args.seed + 100_000 + index)
+        items.append({"filename": filename, "local_path": path})
+    for item in items:
+        item.update(client_doc_id="bench-client", client_name="Benchmark Client")
+    return items
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run the benchmark.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        JSON-serialisable report
+    """
+    directory = tempfile.mkdtemp(prefix="ingest-bench-")
+    try:
+        corpus_started = time.perf_counter()
+        items = build_corpus(directory, args)
+        corpus_seconds = time.perf_counter() - corpus_started
+        corpus_bytes = sum(os.path.getsize(item["local_path"]) for item in items)
+        rss_before = peak_rss_mb()
+
+        with FakeOllamaServer(
+            dims=args.dims,
+            embed_latency=args.embed_latency_ms / 1000,
+            embed_latency_per_input=args.embed_latency_per_text_ms / 1000,
+        ) as ollama:
+            index = InMemoryVectorIndex()
+            pipeline = IngestPipeline(
+                InMemoryStorage(),
+                DocumentProcessor(),
+                local_vector_store(ollama.url, index),
+                stage_workers={
+                    "upload": args.upload_workers,
+                    "parse": args.parse_workers,
+                    "embed": args.embed_workers,
+                    "write": args.write_workers,
+                },
+            )
+            result = asyncio.run(pipeline.run(items))
+            embed_counts = dict(ollama.counts)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    done = result["items"]
+    wall = result["stats"]["wall_seconds"]
+    stages = result["stats"]["stages"]
+    pages = sum(item.get("page_count") or 0 for item in done)
+    chunks = sum(item["chunk_count"] for item in done)
+    chunk_seconds = sum(item.get("chunk_seconds", 0.0) for item in done)
+
+    stage_seconds = {name: stages[name]["busy_seconds"] for name in STAGES}
+    stage_seconds["chunk"] = round(chunk_seconds, 4)
+    stage_seconds["parse"] = round(max(0.0, stage_seconds["parse"] - chunk_seconds), 4)
+
+    return {
+        "benchmark": "ingest",
+        "config": {
+            "pdf_docs": args.pdf_docs,
+            "pages_per_pdf": args.pages,
+            "docx_docs": args.docx_docs,
+            "paragraphs_per_docx": args.paragraphs,
+            "seed": args.seed,
+            "embedding_dims": args.dims,
+            "embed_latency_ms": args.embed_latency_ms,
+            "embed_latency_per_text_ms": args.embed_latency_per_text_ms,
+            "chunk_size": settings.CHUNK_SIZE,
+            "chunk_overlap": settings.CHUNK_OVERLAP,
+            "stage_workers": {name: stages[name]["workers"] for name in STAGES},
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "corpus": {
+            "files": len(done),
+            "bytes": corpus_bytes,
+            "generation_seconds": round(corpus_seconds, 3),
+        },
+        "results": {
+            "wall_seconds": wall,
+            "files_ok": sum(1 for item in done if item["status"] == "processed"),
+            "files_failed": sum(1 for item in done if item["status"] == "error"),
+            "pages": pages,
+            "chunks": chunks,
+            "indexed_chunks": index.size(),
+            "pages_per_second": round(pages / wall, 2) if wall else None,
+            "chunks_per_second": round(chunks / wall, 2) if wall else None,
+            "files_per_second": round(len(done) / wall, 2) if wall else None,
+            "peak_rss_mb": peak_rss_mb(),
+            "peak_rss_before_run_mb": rss_before,
+            "stage_seconds": stage_seconds,
+            "stage_utilisation": {name: stages[name]["utilisation"] for name in STAGES},
+            "embedding_requests": embed_counts.get("embed_requests", 0),
+        },
+        "errors": [
+            {"filename": item["filename"], "message": item["message"]}
+            for item in done
+            if item["status"] == "error"
+        ],
+    }
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pdf-docs", type=int, default=10, help="number of PDF files")
+    parser.add_argument("--pages", type=int, default=20, help="pages per PDF")
+    parser.add_argument("--docx-docs", type=int, default=5, help="number of DOCX files")
+    parser.add_argument("--paragraphs", type=int, default=60, help="paragraphs per DOCX")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dims", type=int, default=768, help="embedding dimension")
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0,
+                        help="simulated latency per embedding request")
+    parser.add_argument("--embed-latency-per-text-ms", type=float, default=0.0,
+                        help="simulated latency per embedded chunk")
+    parser.add_argument("--upload-workers", type=int, default=settings.INGEST_UPLOAD_WORKERS)
+    parser.add_argument("--parse-workers", type=int, default=settings.INGEST_PARSE_WORKERS)
+    parser.add_argument("--embed-workers", type=int, default=settings.INGEST_EMBED_WORKERS)
+    parser.add_argument("--write-workers", type=int, default=settings.INGEST_WRITE_WORKERS)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    """Run the benchmark and print or save the report."""
+    args = parse_args(argv)
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
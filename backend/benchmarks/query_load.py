@@ -0,0 +1,310 @@
+"""
+/query load test against a mock LLM.
+
+Seeds a local corpus for several clients and serves the real FastAPI app with
+uvicorn on a local port. Supabase, Neo4j and Ollama are swapped for the
+stand-ins in benchmarks/stand_ins.py; the LLM is a mock with configurable
+per-token latency. /query is then driven at a fixed concurrency. Everything
+runs offline on one machine.
+
+Usage (from backend/):
+    python -m benchmarks.query_load --concurrency 8 --requests 200 \\
+        --token-latency-ms 20 --first-token-latency-ms 150 --output query.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Tuple
+import httpx
+
+from benchmarks.corpus import make_paragraph
+from benchmarks.stand_ins import FakeOllamaServer, InMemoryStorage, local_vector_store
+from config import settings
+from utils.metrics import QUERY_STAGE_SECONDS
+
+# Query stages read from the metrics registry before and after the run
+STAGES = ("client_lookup", "embedding", "vector_search", "llm_call", "agent")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def free_port() -> int:
+    """Pick a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def seed_corpus(storage: InMemoryStorage, vector_store, args) -> List[Tuple[str, str]]:
+    """
+    Create clients with documents and write their chunks through the real writer.
+
+    Returns:
+        (client_doc_id, question) pairs to send
+    """
+    rng = random.Random(args.seed)
+    workload = []
+    for client_index in range(args.clients):
+        doc_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        name = f"Client {client_index}"
+        storage.add_client(doc_id, name)
+
+        chunks = []
+        for doc_index in range(args.docs_per_client):
+            for page in range(1, args.chunks_per_doc + 1):
+                chunks.append(
+                    {
+                        "text": make_paragraph(rng),
+                        "source": f"document_{doc_index:03d}.pdf",
+                        "location": f"p.{page}",
+                        "chunk_id": f"document_{doc_index:03d}.pdf_{page}",
+                    }
+                )
+        vector_store.add_documents_for_client(chunks, doc_id, name)
+
+        for _ in range(args.questions_per_client):
+            sentence = rng.choice(chunks)["text"].split(".")[0]
+            workload.append((doc_id, f"What do the documents say about {sentence.lower()}?"))
+    rng.shuffle(workload)
+    return workload
+
+
+class AppServer:
+    """Runs the FastAPI app under uvicorn in a background thread."""
+
+    def __init__(self, app, port: int):
+        import uvicorn
+
+        self.port = port
+        self.server = uvicorn.Server(
+            uvicorn.Config(
+                app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"
+            )
+        )
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self) -> "AppServer":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.should_exit = True
+        self.thread.join()
+
+
+async def drive(
+    url: str, path: str, workload: List[Tuple[str, str]], concurrency: int, total: int
+) -> Tuple[List[float], Dict[str, int], float]:
+    """
+    Send ``total`` requests with ``concurrency`` closed-loop workers.
+
+    Returns:
+        (latencies of successful requests, status code counts, wall seconds)
+    """
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    next_index = 0
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal next_index
+        while next_index < total:
+            doc_id, question = workload[next_index % len(workload)]
+            next_index += 1
+            started = time.perf_counter()
+            try:
+                response = await client.post(
+                    path, json={"question": question, "client_doc_id": doc_id}
+                )
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = e.__class__.__name__
+            elapsed = time.perf_counter() - started
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == "200":
+                latencies.append(elapsed)
+
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=url, timeout=600.0) as client:
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def stage_totals() -> Dict[str, Tuple[float, int]]:
+    """Current (sum, count) of each query stage histogram."""
+    return {
+        stage: (
+            QUERY_STAGE_SECONDS.total(stage=stage),
+            QUERY_STAGE_SECONDS.count(stage=stage),
+        )
+        for stage in STAGES
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run the load test.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        JSON-serialisable report
+    """
+    with FakeOllamaServer(
+        dims=args.dims,
+        embed_latency=args.embed_latency_ms / 1000,
+        first_token_latency=args.first_token_latency_ms / 1000,
+        token_latency=args.token_latency_ms / 1000,
+        answer_tokens=args.answer_tokens,
+    ) as ollama:
+        # Point every Ollama client at the mock before services are built
+        settings.OLLAMA_BASE_URL = ollama.url
+        import main as app_module
+        from services import registry
+        from services.agent import LegalRAGAgent
+
+        logging.getLogger().setLevel(logging.WARNING)
+        storage = InMemoryStorage()
+        vector_store = local_vector_store(ollama.url)
+        registry.set_instance("supabase", storage)
+        registry.set_instance("vector_store", vector_store)
+        registry.set_instance("rag_agent", LegalRAGAgent(vector_store))
+
+        seed_started = time.perf_counter()
+        workload = seed_corpus(storage, vector_store, args)
+        seed_seconds = time.perf_counter() - seed_started
+
+        # The agent prints its reasoning to stdout (verbose=True); keep the report clean
+        with AppServer(app_module.app, free_port()) as server, contextlib.redirect_stdout(
+            io.StringIO()
+        ):
+            url = f"http://127.0.0.1:{server.port}"
+            asyncio.run(drive(url, args.path, workload, args.concurrency, args.warmup))
+            before = stage_totals()
+            chat_before = ollama.counts["chat_requests"]
+            latencies, statuses, wall = asyncio.run(
+                drive(url, args.path, workload, args.concurrency, args.requests)
+            )
+            after = stage_totals()
+            chat_requests = ollama.counts["chat_requests"] - chat_before
+
+    stages = {
+        stage: {
+            "seconds": round(after[stage][0] - before[stage][0], 4),
+            "count": after[stage][1] - before[stage][1],
+        }
+        for stage in STAGES
+    }
+    retrieval = stages["embedding"]["seconds"] + stages["vector_search"]["seconds"]
+    generation = stages["llm_call"]["seconds"]
+    agent = stages["agent"]["seconds"]
+    request_seconds = sum(latencies)
+    breakdown = {
+        "retrieval": retrieval,
+        "generation": generation,
+        "agent_overhead": max(0.0, agent - retrieval - generation),
+        "client_lookup": stages["client_lookup"]["seconds"],
+        # HTTP handling plus time spent waiting for the event loop
+        "server_and_queueing": max(
+            0.0, request_seconds - agent - stages["client_lookup"]["seconds"]
+        ),
+    }
+
+    return {
+        "benchmark": "query_load",
+        "config": {
+            "path": args.path,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "clients": args.clients,
+            "chunks_per_client": args.docs_per_client * args.chunks_per_doc,
+            "seed": args.seed,
+            "first_token_latency_ms": args.first_token_latency_ms,
+            "token_latency_ms": args.token_latency_ms,
+            "answer_tokens": args.answer_tokens,
+            "embed_latency_ms": args.embed_latency_ms,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "seed_seconds": round(seed_seconds, 3),
+        "results": {
+            "wall_seconds": round(wall, 4),
+            "statuses": statuses,
+            "throughput_rps": round(len(latencies) / wall, 3) if wall else None,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50) * 1000, 2),
+                "p95": round(percentile(latencies, 95) * 1000, 2),
+                "p99": round(percentile(latencies, 99) * 1000, 2),
+                "max": round(max(latencies, default=0.0) * 1000, 2),
+                "mean": round(request_seconds / len(latencies) * 1000, 2) if latencies else 0.0,
+            },
+            "llm_calls_per_query": round(chat_requests / max(1, sum(statuses.values())), 2),
+            "stages": stages,
+            "time_share": {
+                name: round(seconds / request_seconds, 4) if request_seconds else 0.0
+                for name, seconds in breakdown.items()
+            },
+        },
+    }
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--path", default="/query", help="endpoint to drive")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=50, help="measured requests")
+    parser.add_argument("--warmup", type=int, default=4, help="unmeasured requests first")
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--docs-per-client", type=int, default=5)
+    parser.add_argument("--chunks-per-doc", type=int, default=20)
+    parser.add_argument("--questions-per-client", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dims", type=int, default=256, help="embedding dimension")
+    parser.add_argument("--embed-latency-ms", type=float, default=5.0)
+    parser.add_argument("--first-token-latency-ms", type=float, default=100.0,
+                        help="mock LLM prompt-processing delay per call")
+    parser.add_argument("--token-latency-ms", type=float, default=10.0,
+                        help="mock LLM delay per generated token")
+    parser.add_argument("--answer-tokens", type=int, default=60)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    """Run the load test and print or save the report."""
+    args = parse_args(argv)
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
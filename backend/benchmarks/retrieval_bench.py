@@ -0,0 +1,366 @@
+"""
+Retrieval quality and latency benchmark.
+
+Builds seeded multi-client corpora of the requested sizes. Every chunk
+mentions its own parties and clause numbers, and labelled questions are
+derived from sampled chunks, so each question has one known answer chunk.
+Each question is then sent through ``Neo4jVectorStore.search_by_client``
+once per configuration (strategy, k and over-fetch factor). The report
+gives recall@k, MRR@k and the number of results returned.
+
+By default writes and searches go to the in-memory index from
+benchmarks/stand_ins.py. Its exact cosine search stands in for Neo4j's
+HNSW index, so its recall is an upper bound on what Neo4j returns, and
+its latency says nothing about Neo4j and is not reported.
+
+With ``--neo4j`` the corpus is written to a real Neo4j database through
+the production store, and the report adds per-query latency. The database
+(``--neo4j-database``, on ``--neo4j-url``) is wiped before each corpus, so
+it must not be the one the API uses. Query embeddings come from the fake
+Ollama server in both modes.
+
+Usage (from backend/):
+    python -m benchmarks.retrieval_bench --sizes 1000,10000,100000 --clients 200 \\
+        --k 1,4,8 --overfetch 2,4,16 --output retrieval.json
+
+    # 1M chunks: lower the dimension to keep the matrix in memory
+    python -m benchmarks.retrieval_bench --sizes 1000000 --clients 1000 --dims 64
+
+    # Recall and latency against Neo4j's vector index
+    python -m benchmarks.retrieval_bench --neo4j --neo4j-database retrievalbench \\
+        --sizes 10000,100000 --output retrieval-neo4j.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import time
+import uuid
+from typing import Any, Dict, List, Tuple
+
+from neo4j import GraphDatabase
+
+from benchmarks.corpus import VOCABULARY, make_paragraph
+from benchmarks.query_load import percentile
+from benchmarks.stand_ins import FakeOllamaServer, hash_embedding, local_vector_store
+from config import settings
+from services.neo4j_store import SEARCH_STRATEGIES, Neo4jVectorStore
+from utils.metrics import QUERY_STAGE_SECONDS
+
+# Syllables for party names; three-syllable names give 8000 distinct parties
+SYLLABLES = (
+    "ka ro mi zen tal bor vin esh dru pel nor qua sil tem har lod fay gri ost ux"
+).split()
+
+# Chunks written per add_embedded_documents_for_client call
+WRITE_BATCH = 2000
+
+# Seconds to wait for Neo4j to finish populating the vector index
+INDEX_WAIT_SECONDS = 600
+
+
+def make_party(rng: random.Random) -> str:
+    """Build a pseudo party name."""
+    return "".join(rng.choice(SYLLABLES) for _ in range(3)).capitalize()
+
+
+def make_chunk(rng: random.Random) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build one chunk text and the facts a question about it can refer to.
+
+    Returns:
+        (text, facts) with the parties, clause number and topic words used
+    """
+    facts = {
+        "parties": [make_party(rng), make_party(rng)],
+        "clause": rng.randint(1, 400),
+        "topic": rng.sample(VOCABULARY, 2),
+    }
+    lead = (
+        f"Under clause {facts['clause']} {facts['parties'][0]} and {facts['parties'][1]} "
+        f"agree on {facts['topic'][0]} {facts['topic'][1]}."
+    )
+    return f"{lead} {make_paragraph(rng, sentences=2)}", facts
+
+
+def make_question(facts: Dict[str, Any]) -> str:
+    """Phrase a question about a chunk from its facts."""
+    first, second = facts["parties"]
+    return (
+        f"What did {first} and {second} agree about {facts['topic'][0]} "
+        f"{facts['topic'][1]} in clause {facts['clause']}?"
+    )
+
+
+def build_corpus(store, size: int, args: argparse.Namespace) -> List[Tuple[str, str, str]]:
+    """
+    Write a corpus of ``size`` chunks spread over the clients.
+
+    Embeddings are computed locally with the same function the fake server
+    uses, then written through the production writer.
+
+    Returns:
+        Labelled (client_doc_id, question, answer chunk_id) triples
+    """
+    rng = random.Random(f"{args.seed}-{size}")
+    clients = min(args.clients, size)
+    per_client = [
+        size // clients + (1 if index < size % clients else 0) for index in range(clients)
+    ]
+    candidates = []
+
+    for client_index, count in enumerate(per_client):
+        doc_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        name = f"Client {client_index}"
+        chunks, embeddings = [], []
+        for position in range(count):
+            text, facts = make_chunk(rng)
+            chunk_id = f"{doc_id}:{position}"
+            chunks.append(
+                {
+                    "text": text,
+                    "source": f"document_{position // 50:04d}.pdf",
+                    "location": f"p.{position % 50 + 1}",
+                    "chunk_id": chunk_id,
+                }
+            )
+            embeddings.append(hash_embedding(text, args.dims))
+            candidates.append((doc_id, chunk_id, facts))
+            if len(chunks) == WRITE_BATCH:
+                store.add_embedded_documents_for_client(chunks, embeddings, doc_id, name)
+                chunks, embeddings = [], []
+        if chunks:
+            store.add_embedded_documents_for_client(chunks, embeddings, doc_id, name)
+
+    sampled = rng.sample(candidates, min(args.queries, len(candidates)))
+    return [(doc_id, make_question(facts), chunk_id) for doc_id, chunk_id, facts in sampled]
+
+
+def configurations(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Every (strategy, k, over-fetch) combination to measure."""
+    configs = []
+    for strategy in args.strategies:
+        for k in args.k:
+            if strategy == "overfetch":
+                configs.extend(
+                    {"strategy": strategy, "k": k, "overfetch": factor}
+                    for factor in args.overfetch
+                )
+            else:
+                configs.append({"strategy": strategy, "k": k, "overfetch": None})
+    return configs
+
+
+def evaluate(
+    store,
+    labelled: List[Tuple[str, str, str]],
+    config: Dict[str, Any],
+    with_latency: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run every labelled question through ``search_by_client`` with one configuration.
+
+    Args:
+        store: Vector store holding the corpus
+        labelled: (client_doc_id, question, answer chunk_id) triples
+        config: Strategy, k and over-fetch factor
+        with_latency: Report latency (only meaningful against Neo4j)
+
+    Returns:
+        recall@k, MRR@k, mean results returned and, if asked, latency figures
+    """
+    hits, reciprocal_ranks, returned, latencies = 0, 0.0, 0, []
+    search_before = QUERY_STAGE_SECONDS.total(stage="vector_search")
+    for doc_id, question, answer in labelled:
+        started = time.perf_counter()
+        docs = store.search_by_client(
+            question,
+            doc_id,
+            k=config["k"],
+            strategy=config["strategy"],
+            overfetch=config["overfetch"],
+        )
+        latencies.append(time.perf_counter() - started)
+        returned += len(docs)
+        ranked = [doc.metadata.get("chunk_id") for doc in docs]
+        if answer in ranked:
+            hits += 1
+            reciprocal_ranks += 1 / (ranked.index(answer) + 1)
+    search_seconds = QUERY_STAGE_SECONDS.total(stage="vector_search") - search_before
+
+    queries = len(labelled)
+    result = {
+        **config,
+        "recall_at_k": round(hits / queries, 4),
+        "mrr_at_k": round(reciprocal_ranks / queries, 4),
+        "mean_results": round(returned / queries, 2),
+    }
+    if with_latency:
+        result["latency_ms"] = {
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "max": round(max(latencies) * 1000, 3),
+        }
+        result["vector_search_ms_mean"] = round(search_seconds / queries * 1000, 3)
+    return result
+
+
+def use_benchmark_database(args: argparse.Namespace, ollama_url: str) -> None:
+    """
+    Point the settings the store reads at the benchmark database and fake Ollama.
+
+    Raises:
+        SystemExit: If the target is the database the API is configured to use
+    """
+    url = args.neo4j_url or settings.NEO4J_URL
+    if (url, args.neo4j_database) == (settings.NEO4J_URL, settings.NEO4J_DATABASE):
+        raise SystemExit(
+            f"--neo4j-database {args.neo4j_database} is the configured API database; "
+            "the benchmark wipes its target, so name a dedicated database"
+        )
+    settings.NEO4J_URL = url
+    settings.NEO4J_DATABASE = args.neo4j_database
+    settings.OLLAMA_BASE_URL = ollama_url
+
+
+def reset_neo4j_database() -> None:
+    """Delete every node and vector index of the benchmark database."""
+    driver = GraphDatabase.driver(
+        settings.NEO4J_URL,
+        auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD),
+        database=settings.NEO4J_DATABASE,
+    )
+    with driver, driver.session() as session:
+        session.run(
+            "MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS"
+        ).consume()
+        # Index dimensions follow --dims, so indexes are recreated per run
+        names = [record["name"] for record in session.run("SHOW VECTOR INDEXES YIELD name")]
+        for name in names:
+            session.run(f"DROP INDEX `{name}` IF EXISTS").consume()
+
+
+def wait_for_indexes(store: Neo4jVectorStore) -> None:
+    """Wait until Neo4j has indexed the written chunks."""
+    with store.driver.session() as session:
+        session.run("CALL db.awaitIndexes($seconds)", seconds=INDEX_WAIT_SECONDS).consume()
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Run the benchmark.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        JSON-serialisable report
+    """
+    logging.getLogger("services.neo4j_store").setLevel(logging.WARNING)
+    corpora, results = [], []
+    with FakeOllamaServer(dims=args.dims) as ollama:
+        if args.neo4j:
+            use_benchmark_database(args, ollama.url)
+        for size in args.sizes:
+            if args.neo4j:
+                reset_neo4j_database()
+                store = Neo4jVectorStore()
+            else:
+                store = local_vector_store(ollama.url)
+            build_started = time.perf_counter()
+            labelled = build_corpus(store, size, args)
+            if args.neo4j:
+                wait_for_indexes(store)
+            build_seconds = time.perf_counter() - build_started
+            corpora.append(
+                {
+                    "chunks": size,
+                    "clients": min(args.clients, size),
+                    "queries": len(labelled),
+                    "build_seconds": round(build_seconds, 2),
+                }
+            )
+            for config in configurations(args):
+                results.append(
+                    {"chunks": size, **evaluate(store, labelled, config, args.neo4j)}
+                )
+            if args.neo4j:
+                store.close()
+            del store
+
+    return {
+        "benchmark": "retrieval",
+        # In memory, search is exact: recall is an upper bound and latency is omitted
+        "backend": "neo4j" if args.neo4j else "in_memory",
+        "recall_is_upper_bound": not args.neo4j,
+        "config": {
+            "sizes": args.sizes,
+            "clients": args.clients,
+            "queries": args.queries,
+            "strategies": args.strategies,
+            "k": args.k,
+            "overfetch": args.overfetch,
+            "embedding_dims": args.dims,
+            "seed": args.seed,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "corpora": corpora,
+        "results": results,
+    }
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+
+def _strategy_list(value: str) -> List[str]:
+    strategies = [part.strip() for part in value.split(",") if part.strip()]
+    unknown = set(strategies) - set(SEARCH_STRATEGIES)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown strategies: {', '.join(sorted(unknown))}")
+    return strategies
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=_int_list, default=[1000, 10000, 100000],
+                        help="comma-separated corpus sizes in chunks")
+    parser.add_argument("--clients", type=int, default=100,
+                        help="clients the chunks are spread over")
+    parser.add_argument("--queries", type=int, default=200, help="labelled questions per size")
+    parser.add_argument("--strategies", type=_strategy_list, default=list(SEARCH_STRATEGIES))
+    parser.add_argument("--k", type=_int_list, default=[1, 4, 8])
+    parser.add_argument("--overfetch", type=_int_list, default=[2, 4, 16],
+                        help="over-fetch factors tried with the overfetch strategy")
+    parser.add_argument("--dims", type=int, default=128, help="embedding dimension")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--neo4j", action="store_true",
+                        help="search a real Neo4j database instead of the in-memory index")
+    parser.add_argument("--neo4j-url", help="Neo4j URL for --neo4j (defaults to NEO4J_URL)")
+    parser.add_argument("--neo4j-database", default="retrievalbench",
+                        help="dedicated database for --neo4j; wiped before each corpus")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    """Run the benchmark and print or save the report."""
+    args = parse_args(argv)
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,452 @@
+"""Local stand-ins for Ollama, Neo4j and Supabase used by the benchmarks."""
+
+import functools
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import numpy as np
+from langchain_core.documents import Document
+from langchain_ollama import OllamaEmbeddings
+from config import settings
+from services.neo4j_store import EMBEDDING_METADATA_KEY, EmbeddingVersion, Neo4jVectorStore
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+CITATION_PATTERN = re.compile(r"\[[^\[\]\n,]+, [^\[\]\n]+\]")
+
+
+@functools.lru_cache(maxsize=65536)
+def _token_feature(token: str, dims: int) -> Tuple[int, float]:
+    """Hashed (bucket, sign) of one token."""
+    digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+    return int.from_bytes(digest[:4], "little") % dims, 1.0 if digest[4] & 1 else -1.0
+
+
+def hash_embedding(text: str, dims: int) -> List[float]:
+    """
+    Deterministic bag-of-words embedding by feature hashing.
+
+    Texts sharing words get similar vectors, so retrieval over a synthetic
+    corpus behaves like a (weak) lexical model rather than random noise.
+
+    Args:
+        text: Input text
+        dims: Vector dimension
+
+    Returns:
+        L2-normalized vector
+    """
+    vector = np.zeros(dims, dtype=np.float32)
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        bucket, sign = _token_feature(token, dims)
+        vector[bucket] += sign
+    norm = float(np.linalg.norm(vector))
+    if norm:
+        vector /= norm
+    return vector.tolist()
+
+
+class FakeOllamaServer:
+    """
+    HTTP server speaking the parts of the Ollama API the app uses.
+
+    ``/api/embed`` returns ``hash_embedding`` vectors after a simulated
+    latency of ``embed_latency`` per request plus ``embed_latency_per_input``
+    per text.
+
+    ``/api/chat`` is a mock LLM that follows the agent's ReAct format: without
+    an observation it asks for ``document_retrieval``, and once one is present
+    it gives a final answer that cites the retrieved passages. Single-shot
+    prompts with a ``Passages:`` section (batch queries) get a cited answer
+    directly. Replies are streamed one word per ``token_latency`` after
+    ``first_token_latency``.
+
+    Runs in a background thread; use as a context manager.
+    """
+
+    def __init__(
+        self,
+        dims: int = 768,
+        embed_latency: float = 0.0,
+        embed_latency_per_input: float = 0.0,
+        first_token_latency: float = 0.0,
+        token_latency: float = 0.0,
+        answer_tokens: int = 60,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize fake Ollama server.
+
+        Args:
+            dims: Embedding dimension
+            embed_latency: Seconds added to every embed request
+            embed_latency_per_input: Seconds added per embedded text
+            first_token_latency: Seconds before the first chat token (prompt processing)
+            token_latency: Seconds between chat tokens
+            answer_tokens: Words in a final answer
+            host: Bind address
+            port: Bind port (0 picks a free port)
+        """
+        self.dims = dims
+        self.embed_latency = embed_latency
+        self.embed_latency_per_input = embed_latency_per_input
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.answer_tokens = answer_tokens
+        self.counts: Dict[str, int] = {
+            "embed_requests": 0,
+            "embedded_texts": 0,
+            "chat_requests": 0,
+            "generated_tokens": 0,
+        }
+        self._counts_lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increment a request counter."""
+        with self._counts_lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    def start(self) -> "FakeOllamaServer":
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def react_reply(self, prompt: str) -> str:
+        """
+        Reply to a ReAct prompt: a retrieval action first, then a cited answer.
+
+        Args:
+            prompt: Full prompt text
+
+        Returns:
+            Model output text
+        """
+        if "Begin!" not in prompt and "Passages:" in prompt:
+            return self._cited_answer(prompt.split("Passages:")[-1])
+
+        # The instructions above "Begin!" mention Observation too; only look below
+        conversation = prompt.split("Begin!")[-1]
+        if "Observation:" not in conversation:
+            match = re.search(r"Question: (.*)", conversation)
+            question = match.group(1).strip() if match else "the documents"
+            return (
+                "Thought: I should search the client's documents first.\n"
+                "Action: document_retrieval\n"
+                f"Action Input: {question}"
+            )
+
+        observation = conversation.split("Observation:")[-1]
+        return "Thought: I now know the final answer\nFinal Answer: " + self._cited_answer(
+            observation
+        )
+
+    def _cited_answer(self, passages: str) -> str:
+        """An answer of ``answer_tokens`` words citing the first two passages."""
+        citations = " ".join(CITATION_PATTERN.findall(passages)[:2])
+        words = TOKEN_PATTERN.findall(passages.lower())
+        filler = " ".join(
+            words[i % len(words)] if words else "clause"
+            for i in range(self.answer_tokens)
+        )
+        return f"According to the documents, {filler} {citations}"
+
+    def stream_chat(self, body: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Stream a mock chat completion as Ollama NDJSON chunks."""
+        messages = body.get("messages", [])
+        prompt = "\n".join(str(message.get("content", "")) for message in messages)
+        reply = self.react_reply(prompt)
+        tokens = reply.split(" ")
+        self.count("chat_requests")
+        self.count("generated_tokens", len(tokens))
+
+        time.sleep(self.first_token_latency)
+        for index, token in enumerate(tokens):
+            if index:
+                time.sleep(self.token_latency)
+            yield {
+                "model": body.get("model"),
+                "message": {
+                    "role": "assistant",
+                    "content": token if index == len(tokens) - 1 else token + " ",
+                },
+                "done": False,
+            }
+        yield {
+            "model": body.get("model"),
+            "message": {"role": "assistant", "content": ""},
+            "done": True,
+            "done_reason": "stop",
+            "load_duration": 0,
+            "prompt_eval_count": len(prompt.split()),
+            "eval_count": len(tokens),
+        }
+
+    def handle_post(
+        self, path: str, body: Dict[str, Any]
+    ) -> Union[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        """
+        Produce the response for a POST request.
+
+        Args:
+            path: Request path
+            body: Parsed JSON body
+
+        Returns:
+            Response body, or an iterator of chunks for streamed responses
+        """
+        if path == "/api/chat":
+            chunks = self.stream_chat(body)
+            if body.get("stream", True):
+                return chunks
+            *_, final = chunks
+            return final
+        if path == "/api/generate":
+            # Model warm-up / keep-alive request
+            return {"model": body.get("model"), "response": "", "done": True, "load_duration": 0}
+        if path == "/api/embed":
+            inputs = body.get("input", [])
+            texts = [inputs] if isinstance(inputs, str) else list(inputs)
+            self.count("embed_requests")
+            self.count("embedded_texts", len(texts))
+            time.sleep(self.embed_latency + self.embed_latency_per_input * len(texts))
+            return {
+                "model": body.get("model"),
+                "embeddings": [hash_embedding(text, self.dims) for text in texts],
+                "load_duration": 0,
+            }
+        if path == "/api/embeddings":
+            self.count("embed_requests")
+            self.count("embedded_texts")
+            time.sleep(self.embed_latency + self.embed_latency_per_input)
+            return {"embedding": hash_embedding(body.get("prompt", ""), self.dims)}
+        raise KeyError(path)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                try:
+                    payload = server.handle_post(self.path, body)
+                except KeyError:
+                    self.send_error(404)
+                    return
+                if isinstance(payload, dict):
+                    self._send_json(payload)
+                    return
+
+                # Streamed NDJSON; the body ends when the connection closes
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                for chunk in payload:
+                    self.wfile.write(json.dumps(chunk).encode() + b"\n")
+                    self.wfile.flush()
+                self.close_connection = True
+
+            def do_GET(self):
+                if self.path in ("/api/ps", "/api/tags"):
+                    self._send_json({"models": []})
+                else:
+                    self.send_error(404)
+
+            def _send_json(self, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+class InMemoryVectorIndex:
+    """
+    Stand-in for ``Neo4jVector`` holding embeddings in a numpy matrix.
+
+    Implements the calls ``Neo4jVectorStore`` makes (``add_embeddings`` and
+    ``similarity_search_by_vector``) with exact cosine search. Metadata
+    filters compare against cached per-key columns, so filtered searches stay
+    vectorized at a million rows.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.texts: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self._blocks: List[np.ndarray] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._columns: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def size(self) -> int:
+        """Number of stored documents."""
+        return len(self.texts)
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Store texts with their embeddings and metadata."""
+        block = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        with self._lock:
+            start = len(self.texts)
+            self.texts.extend(texts)
+            self.metadatas.extend(metadatas or [{} for _ in texts])
+            self._blocks.append(block / norms)
+            self._matrix = None
+            self._columns.clear()
+        return [str(index) for index in range(start, start + len(texts))]
+
+    def matrix(self) -> np.ndarray:
+        """Normalized embedding matrix (rebuilt after writes)."""
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.concatenate(self._blocks)
+                self._blocks = [self._matrix]
+            return self._matrix
+
+    def column(self, key: str) -> np.ndarray:
+        """Values of one metadata key for every row (rebuilt after writes)."""
+        with self._lock:
+            if key not in self._columns:
+                values = np.empty(len(self.metadatas), dtype=object)
+                values[:] = [metadata.get(key) for metadata in self.metadatas]
+                self._columns[key] = values
+            return self._columns[key]
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 4, filter: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> List[Document]:
+        """Return the k most similar documents, optionally filtered by metadata equality."""
+        if not self.texts:
+            return []
+        scores = self.matrix() @ np.asarray(embedding, dtype=np.float32)
+        if filter:
+            mask = np.ones(len(scores), dtype=bool)
+            for key, value in filter.items():
+                mask &= self.column(key) == value
+            scores = np.where(mask, scores, -np.inf)
+        k = min(k, len(self.texts))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        # Like the production retrieval query, results carry their vector
+        matrix = self.matrix()
+        return [
+            Document(
+                page_content=self.texts[index],
+                metadata={**self.metadatas[index], EMBEDDING_METADATA_KEY: matrix[index].tolist()},
+            )
+            for index in top
+            if np.isfinite(scores[index])
+        ]
+
+
+def local_vector_store(
+    ollama_url: str, index: Optional[InMemoryVectorIndex] = None
+) -> Neo4jVectorStore:
+    """
+    Build a ``Neo4jVectorStore`` backed by an in-memory index.
+
+    ``__init__`` is bypassed because it connects to Neo4j; everything else is
+    the production class. Embedding goes through the real
+    ``OllamaEmbeddings`` client pointed at ``ollama_url``.
+
+    Args:
+        ollama_url: Base URL of a (fake) Ollama server
+        index: Index to use (a new one by default)
+
+    Returns:
+        Vector store whose writes and searches hit the in-memory index
+    """
+    store = Neo4jVectorStore.__new__(Neo4jVectorStore)
+    store.driver = None
+    store._set_active(
+        EmbeddingVersion.default(settings.OLLAMA_EMBEDDING_MODEL),
+        OllamaEmbeddings(model=settings.OLLAMA_EMBEDDING_MODEL, base_url=ollama_url),
+        index if index is not None else InMemoryVectorIndex(),
+    )
+    return store
+
+
+class InMemoryStorage:
+    """Stand-in for the ``SupabaseService`` client, storage and manifest calls."""
+
+    def __init__(self):
+        """Initialize empty storage."""
+        self.clients: Dict[str, Dict[str, Any]] = {}
+        self.objects: Dict[str, int] = {}
+        self.manifests: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add_client(self, doc_id: str, name: str) -> Dict[str, Any]:
+        """Create a client record."""
+        client = {"doc_id": doc_id, "name": name, "summary": None}
+        with self._lock:
+            self.clients[doc_id] = client
+        return client
+
+    def get_client_by_doc_id(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a client record."""
+        with self._lock:
+            return self.clients.get(doc_id)
+
+    def upload_file(self, file_bytes, doc_id: str, filename: str) -> str:
+        """Record an upload (size only) and return its storage path."""
+        size = len(file_bytes) if isinstance(file_bytes, bytes) else 0
+        path = f"{doc_id}/{filename}"
+        with self._lock:
+            self.objects[path] = size
+        return path
+
+    def upload_page_index(self, data: bytes, doc_id: str, filename: str) -> str:
+        """Record a page-index upload."""
+        return self.upload_file(data, doc_id, f".pages/{filename}")
+
+    def get_file_manifest(self, doc_id: str, filename: str) -> Optional[Dict[str, Any]]:
+        """Return a stored manifest record."""
+        with self._lock:
+            return self.manifests.get((doc_id, filename))
+
+    def upsert_file_manifest(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a manifest record."""
+        with self._lock:
+            self.manifests[(record["client_doc_id"], record["filename"])] = record
+        return record
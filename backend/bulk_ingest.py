@@ -0,0 +1,388 @@
+"""
+Bulk offline ingestion of a directory or manifest of files.
+
+Runs the same IngestPipeline and services as the API (built through
+services.registry). For large loads, parsing runs in a process pool and
+embedding requests of concurrent files are batched. Each finished file is
+appended to a checkpoint file, so an interrupted run picks up where it
+stopped when started again with the same arguments.
+
+Usage (from backend/):
+    python bulk_ingest.py --client-doc-id <uuid> --dir /data/partner-archive \\
+        --checkpoint partner.ckpt.jsonl
+
+    # Manifest (CSV or JSONL) with a "path" column and optional "filename",
+    # "client_doc_id" columns; relative paths resolve against the manifest
+    python bulk_ingest.py --manifest files.csv --checkpoint files.ckpt.jsonl
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+from config import settings
+from services import registry
+from services.embedding_batcher import EmbeddingBatcher
+from services.ingest_pipeline import IngestPipeline
+from utils.helpers import sanitize_filename, storage_filename, validate_file_type
+
+logger = logging.getLogger("bulk_ingest")
+
+# Checkpoint statuses that need no further work on resume
+FINISHED_STATUSES = ("processed", "skipped", "rejected")
+
+
+def iter_directory(root: str) -> Iterator[Dict[str, Any]]:
+    """Yield a source entry for every file under ``root``, in path order."""
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories.sort()
+        for name in sorted(filenames):
+            if name.startswith("."):
+                continue
+            path = os.path.join(directory, name)
+            yield {
+                "local_path": os.path.abspath(path),
+                "filename": storage_filename(os.path.relpath(path, root)),
+            }
+
+
+def iter_manifest(manifest_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield source entries from a CSV (with header) or JSONL manifest.
+
+    Rows need a ``path``; ``filename`` and ``client_doc_id`` are optional.
+    Without a ``filename``, the stored name keeps the folders of ``path`` (as
+    written in the manifest), so same-named files in different folders do
+    not overwrite each other.
+    """
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    with open(manifest_path, newline="") as manifest:
+        if manifest_path.endswith((".jsonl", ".ndjson")):
+            rows = (json.loads(line) for line in manifest if line.strip())
+        else:
+            rows = csv.DictReader(manifest)
+        for row in rows:
+            path = os.path.join(base, row["path"])
+            if row.get("filename"):
+                filename = sanitize_filename(row["filename"])
+            else:
+                filename = storage_filename(row["path"])
+            entry = {"local_path": os.path.abspath(path), "filename": filename}
+            if row.get("client_doc_id"):
+                entry["client_doc_id"] = row["client_doc_id"]
+            yield entry
+
+
+class Checkpoint:
+    """
+    Append-only JSONL record of finished files.
+
+    A file is done when its last record has a finished status and its size
+    and modification time still match, so edited files are picked up again.
+    Failed files are retried on the next run.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (and load) a checkpoint file.
+
+        Args:
+            path: Checkpoint file path; created if missing
+        """
+        self.path = path
+        self.records: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path) as existing:
+                for line in existing:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn last line from a crash mid-write
+                        continue
+                    self.records[record["key"]] = record
+        self._file: TextIO = open(path, "a")
+
+    @staticmethod
+    def key(entry: Dict[str, Any]) -> str:
+        """Checkpoint key of a source entry."""
+        return f"{entry['client_doc_id']}:{entry['local_path']}"
+
+    def is_done(self, entry: Dict[str, Any]) -> bool:
+        """Whether the entry was already finished and is unchanged since."""
+        record = self.records.get(self.key(entry))
+        return (
+            record is not None
+            and record["status"] in FINISHED_STATUSES
+            and record.get("size") == entry.get("size")
+            and record.get("mtime") == entry.get("mtime")
+        )
+
+    def record(self, item: Dict[str, Any]) -> None:
+        """Durably append the outcome of one file."""
+        record = {
+            "key": self.key(item),
+            "filename": item["filename"],
+            "status": item["status"],
+            "chunks": item.get("chunk_count", 0),
+            "size": item.get("size"),
+            "mtime": item.get("mtime"),
+            "message": item.get("message", ""),
+        }
+        self.records[record["key"]] = record
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Close the checkpoint file."""
+        self._file.close()
+
+
+class Progress:
+    """Live files/s, chunks/s and ETA line written to a stream."""
+
+    def __init__(self, total: int, already_done: int, stream: TextIO, interval: float = 2.0):
+        """
+        Initialize progress reporting.
+
+        Args:
+            total: Files in the source, including ones finished by earlier runs
+            already_done: Files skipped because the checkpoint marks them done
+            stream: Output stream (stderr by default)
+            interval: Seconds between progress lines
+        """
+        self.total = total
+        self.already_done = already_done
+        self.stream = stream
+        self.interval = interval
+        self.started = time.perf_counter()
+        self.last_report = 0.0
+        self.counts = {"processed": 0, "skipped": 0, "rejected": 0, "error": 0}
+        self.chunks = 0
+
+    @property
+    def finished(self) -> int:
+        """Files finished in this run."""
+        return sum(self.counts.values())
+
+    def update(self, item: Dict[str, Any]) -> None:
+        """Count a finished file and print a progress line if one is due."""
+        self.counts[item["status"]] = self.counts.get(item["status"], 0) + 1
+        self.chunks += item.get("chunk_count", 0) if item["status"] == "processed" else 0
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report()
+
+    def line(self) -> str:
+        """Current progress as one line."""
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        done = self.already_done + self.finished
+        rate = self.finished / elapsed
+        remaining = self.total - done
+        eta = format_duration(remaining / rate) if rate and remaining else "--:--:--"
+        percent = done / self.total * 100 if self.total else 100.0
+        return (
+            f"{done}/{self.total} files ({percent:.1f}%) | {rate:.2f} files/s "
+            f"{self.chunks / elapsed:.1f} chunks/s | errors {self.counts['error']} "
+            f"| elapsed {format_duration(elapsed)} | ETA {eta}"
+        )
+
+    def report(self) -> None:
+        """Write the current progress line."""
+        print(self.line(), file=self.stream, flush=True)
+
+
+def format_duration(seconds: float) -> str:
+    """Render seconds as H:MM:SS."""
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def collect_entries(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """List the source entries with their client, size and modification time."""
+    source = iter_manifest(args.manifest) if args.manifest else iter_directory(args.dir)
+    entries = []
+    for entry in source:
+        entry.setdefault("client_doc_id", args.client_doc_id)
+        if not entry["client_doc_id"]:
+            raise ValueError(
+                f"No client for {entry['local_path']}; pass --client-doc-id "
+                "or give the manifest a client_doc_id column"
+            )
+        try:
+            stat = os.stat(entry["local_path"])
+            entry["size"], entry["mtime"] = stat.st_size, int(stat.st_mtime)
+        except OSError:
+            entry["size"] = entry["mtime"] = None
+        entries.append(entry)
+    return entries
+
+
+def resolve_clients(entries: List[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+    """Look up each client's name once (None for unknown clients)."""
+    supabase = registry.get_supabase_service()
+    names = {}
+    for doc_id in {entry["client_doc_id"] for entry in entries}:
+        client = supabase.get_client_by_doc_id(doc_id)
+        names[doc_id] = client["name"] if client else None
+    return names
+
+
+def to_item(entry: Dict[str, Any], client_names: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    """Build the pipeline item for a source entry, rejecting what cannot be ingested."""
+    item = {**entry, "client_name": client_names.get(entry["client_doc_id"]) or ""}
+    if client_names.get(entry["client_doc_id"]) is None:
+        item.update(status="rejected", message=f"Client not found: {entry['client_doc_id']}")
+    elif not validate_file_type(entry["filename"]):
+        item.update(status="rejected", message=f"Unsupported file type: {entry['filename']}")
+    elif entry["size"] is None:
+        item.update(status="error", message=f"File not readable: {entry['local_path']}")
+    return item
+
+
+async def ingest(
+    args: argparse.Namespace, stream: TextIO = sys.stderr
+) -> Dict[str, Any]:
+    """
+    Ingest every unfinished source file.
+
+    Args:
+        args: Parsed command-line arguments
+        stream: Where progress lines are written
+
+    Returns:
+        Summary with per-status counts, chunks, files/s and checkpoint path
+    """
+    entries = collect_entries(args)
+    checkpoint = Checkpoint(args.checkpoint)
+    todo = [entry for entry in entries if not checkpoint.is_done(entry)]
+    progress = Progress(len(entries), len(entries) - len(todo), stream, args.progress_interval)
+    print(
+        f"{len(entries)} files, {len(entries) - len(todo)} already done per checkpoint",
+        file=stream,
+        flush=True,
+    )
+
+    client_names = resolve_clients(todo) if todo else {}
+    vector_store = registry.get_vector_store()
+    batcher = EmbeddingBatcher(
+        # Looked up per batch, so a switch of embedding version is followed
+        lambda texts: vector_store.embeddings.embed_documents(texts),
+        max_batch=args.embed_batch_size,
+        max_wait=args.embed_wait_ms / 1000,
+    )
+    executor = (
+        ProcessPoolExecutor(max_workers=args.processes, mp_context=get_context("spawn"))
+        if args.processes > 1
+        else None
+    )
+    pipeline = IngestPipeline(
+        registry.get_supabase_service(),
+        registry.get_document_processor(),
+        vector_store,
+        stage_workers={
+            "upload": args.upload_workers,
+            "parse": max(1, args.processes),
+            "embed": args.embed_workers,
+            "write": args.write_workers,
+        },
+        queue_size=max(settings.INGEST_QUEUE_SIZE, args.processes),
+        parse_executor=executor,
+        embed_batcher=batcher,
+        write_batch_size=args.write_batch_size,
+    )
+
+    def on_item_done(item: Dict[str, Any]) -> None:
+        checkpoint.record(item)
+        progress.update(item)
+
+    try:
+        result = await pipeline.run(
+            (to_item(entry, client_names) for entry in todo), on_item_done=on_item_done
+        )
+    finally:
+        batcher.close()
+        if executor is not None:
+            executor.shutdown()
+        checkpoint.close()
+    progress.report()
+
+    return {
+        "files": len(entries),
+        "already_done": len(entries) - len(todo),
+        "counts": progress.counts,
+        "chunks": progress.chunks,
+        "wall_seconds": result["stats"]["wall_seconds"],
+        "files_per_second": round(progress.finished / result["stats"]["wall_seconds"], 3)
+        if result["stats"]["wall_seconds"]
+        else None,
+        "embedding": batcher.stats(),
+        "stages": result["stats"]["stages"],
+        "errors": [
+            {"filename": item["filename"], "message": item["message"]}
+            for item in result["items"]
+            if item["status"] == "error"
+        ],
+        "checkpoint": args.checkpoint,
+    }
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dir", help="ingest every file under this directory")
+    source.add_argument("--manifest", help="CSV or JSONL list of files to ingest")
+    parser.add_argument("--client-doc-id", help="client for files without their own")
+    parser.add_argument("--checkpoint", required=True,
+                        help="JSONL file recording finished files (resume point)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                        help="parse worker processes (1 parses in threads)")
+    parser.add_argument("--upload-workers", type=int, default=settings.INGEST_UPLOAD_WORKERS)
+    parser.add_argument("--embed-workers", type=int, default=4,
+                        help="files embedding at once (their requests are batched)")
+    parser.add_argument("--write-workers", type=int, default=settings.INGEST_WRITE_WORKERS)
+    parser.add_argument("--embed-batch-size", type=int, default=settings.INGEST_EMBED_BATCH_SIZE)
+    parser.add_argument("--embed-wait-ms", type=float, default=20.0,
+                        help="how long a batch waits for more texts")
+    parser.add_argument("--write-batch-size", type=int, default=settings.INGEST_WRITE_BATCH_SIZE)
+    parser.add_argument("--progress-interval", type=float, default=2.0,
+                        help="seconds between progress lines")
+    parser.add_argument("--verbose", action="store_true", help="log every file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Run a bulk ingest; exit status 1 if any file failed."""
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    try:
+        summary = asyncio.run(ingest(args))
+    except KeyboardInterrupt:
+        print(
+            f"\nInterrupted; finished files are in {args.checkpoint}. "
+            "Run the same command again to resume.",
+            file=sys.stderr,
+        )
+        return 130
+    finally:
+        registry.close_all()
+
+    print(json.dumps(summary, indent=2))
+    return 1 if summary["counts"].get("error") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
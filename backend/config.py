@@ -1,6 +1,7 @@
 """Configuration module for loading environment variables."""
 
 import os
+import tempfile
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -15,6 +16,8 @@ class Settings:
     NEO4J_USER: str = os.getenv("NEO4J_USER", "neo4j")
     NEO4J_PASSWORD: str = os.getenv("NEO4J_PASSWORD", "password123")
     NEO4J_DATABASE: str = os.getenv("NEO4J_DATABASE", "legal_documents")  # Add this line
+    # Chunks deleted per Neo4j transaction when removing clients or files
+    NEO4J_DELETE_BATCH_SIZE: int = int(os.getenv("NEO4J_DELETE_BATCH_SIZE", "5000"))
     # Supabase Configuration
     # qtlR2bGEzOWBqh8H
     SUPABASE_URL: str = os.getenv(
@@ -26,6 +29,34 @@ class Settings:
     )
     SUPABASE_BUCKET: str = os.getenv("SUPABASE_BUCKET", "legal-documents")
 
+    # Storage Upload Configuration
+    STORAGE_MAX_CONCURRENT_UPLOADS: int = int(
+        os.getenv("STORAGE_MAX_CONCURRENT_UPLOADS", "4")
+    )
+    # Files at least this large use resumable (TUS) uploads
+    RESUMABLE_UPLOAD_THRESHOLD: int = int(
+        os.getenv("RESUMABLE_UPLOAD_THRESHOLD", str(20 * 1024 * 1024))
+    )
+    # Supabase requires 6 MB parts for resumable uploads
+    RESUMABLE_UPLOAD_CHUNK_SIZE: int = int(
+        os.getenv("RESUMABLE_UPLOAD_CHUNK_SIZE", str(6 * 1024 * 1024))
+    )
+    UPLOAD_MAX_RETRIES: int = int(os.getenv("UPLOAD_MAX_RETRIES", "5"))
+
+    # Storage Download Cache Configuration (0 bytes disables the cache)
+    STORAGE_CACHE_DIR: str = os.getenv(
+        "STORAGE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "legal-rag-storage-cache")
+    )
+    STORAGE_CACHE_MAX_BYTES: int = int(
+        os.getenv("STORAGE_CACHE_MAX_BYTES", str(2 * 1024 * 1024 * 1024))
+    )
+    STORAGE_CACHE_REVALIDATE: bool = (
+        os.getenv("STORAGE_CACHE_REVALIDATE", "true").lower() == "true"
+    )
+    STORAGE_CACHE_INDEX_SAVE_SECONDS: float = float(
+        os.getenv("STORAGE_CACHE_INDEX_SAVE_SECONDS", "5")
+    )
+
     # Ollama Configuration
     OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "sam860/qwen3:8b-Q4_K_M")
@@ -33,10 +64,133 @@ class Settings:
         "OLLAMA_EMBEDDING_MODEL", "embeddinggemma:latest"
     )
 
+    # keep_alive sent with chat requests (how long Ollama keeps the model loaded)
+    OLLAMA_KEEP_ALIVE: str = os.getenv("OLLAMA_KEEP_ALIVE", "5m")
+
+    # Model Residency Configuration
+    MODEL_WARMUP_ENABLED: bool = (
+        os.getenv("MODEL_WARMUP_ENABLED", "true").lower() == "true"
+    )
+    # "<days> <HH:MM-HH:MM>=<keep_alive>" rules separated by ";" (first match wins)
+    MODEL_RESIDENCY_POLICIES: str = os.getenv(
+        "MODEL_RESIDENCY_POLICIES", "mon-fri 08:00-19:00=15m"
+    )
+    MODEL_RESIDENCY_TIMEZONE: Optional[str] = os.getenv("MODEL_RESIDENCY_TIMEZONE") or None
+    MODEL_KEEPALIVE_INTERVAL: float = float(os.getenv("MODEL_KEEPALIVE_INTERVAL", "60"))
+    # Load durations at or above this many seconds count as cold loads
+    MODEL_COLD_LOAD_THRESHOLD: float = float(
+        os.getenv("MODEL_COLD_LOAD_THRESHOLD", "0.5")
+    )
+
+    # Client Lookup Cache Configuration (seconds / entries)
+    CLIENT_CACHE_TTL: float = float(os.getenv("CLIENT_CACHE_TTL", "300"))
+    CLIENT_CACHE_NEGATIVE_TTL: float = float(os.getenv("CLIENT_CACHE_NEGATIVE_TTL", "5"))
+    CLIENT_CACHE_SIZE: int = int(os.getenv("CLIENT_CACHE_SIZE", "10000"))
+
     # Document Processing Configuration
     CHUNK_SIZE: int = 512
     CHUNK_OVERLAP: int = 50
 
+    # Retrieval Configuration
+    RETRIEVAL_K: int = int(os.getenv("RETRIEVAL_K", "4"))
+    # "overfetch": search the shared index, then keep the client's chunks;
+    # "filtered": apply the client filter inside the vector search
+    RETRIEVAL_STRATEGY: str = os.getenv("RETRIEVAL_STRATEGY", "overfetch")
+    # Candidates fetched per requested result by the "overfetch" strategy
+    RETRIEVAL_OVERFETCH: int = int(os.getenv("RETRIEVAL_OVERFETCH", "2"))
+    # Re-rank candidates by Maximal Marginal Relevance before building the prompt
+    RETRIEVAL_MMR: bool = os.getenv("RETRIEVAL_MMR", "true").lower() == "true"
+    # MMR trade-off: 1 = relevance only, 0 = diversity only
+    RETRIEVAL_MMR_LAMBDA: float = float(os.getenv("RETRIEVAL_MMR_LAMBDA", "0.7"))
+    # Candidates fetched per returned passage for MMR
+    RETRIEVAL_MMR_CANDIDATES: int = int(os.getenv("RETRIEVAL_MMR_CANDIDATES", "4"))
+    # Merge consecutive chunks of the same page into one passage
+    RETRIEVAL_MERGE_ADJACENT: bool = (
+        os.getenv("RETRIEVAL_MERGE_ADJACENT", "true").lower() == "true"
+    )
+    # Multi-query expansion of each search: "off", "rules" or "llm"
+    RETRIEVAL_EXPANSION: str = os.getenv("RETRIEVAL_EXPANSION", "off")
+    # Search queries per expanded question, the question included
+    RETRIEVAL_EXPANSION_QUERIES: int = int(os.getenv("RETRIEVAL_EXPANSION_QUERIES", "4"))
+    # Chat model writing the rewrites in "llm" mode (defaults to OLLAMA_MODEL)
+    RETRIEVAL_EXPANSION_MODEL: str = os.getenv("RETRIEVAL_EXPANSION_MODEL", "")
+
+    # Context Packing Configuration
+    # Token budget for the passages of one document_retrieval call (0 = no limit)
+    CONTEXT_MAX_TOKENS: int = int(os.getenv("CONTEXT_MAX_TOKENS", "1200"))
+    # tiktoken encoding used to count tokens (estimated when unavailable)
+    CONTEXT_TOKENIZER: str = os.getenv("CONTEXT_TOKENIZER", "cl100k_base")
+
+    # Batch Query Configuration
+    QUERY_BATCH_MAX_QUESTIONS: int = int(os.getenv("QUERY_BATCH_MAX_QUESTIONS", "100"))
+    # Concurrent LLM calls per batch (Ollama serves up to OLLAMA_NUM_PARALLEL at once)
+    QUERY_BATCH_GENERATION_CONCURRENCY: int = int(
+        os.getenv("QUERY_BATCH_GENERATION_CONCURRENCY", "2")
+    )
+    QUERY_BATCH_SEARCH_WORKERS: int = int(os.getenv("QUERY_BATCH_SEARCH_WORKERS", "8"))
+
+    # Conversation Session Configuration
+    SESSION_IDLE_SECONDS: float = float(os.getenv("SESSION_IDLE_SECONDS", "1800"))
+    SESSION_MAX_SESSIONS: int = int(os.getenv("SESSION_MAX_SESSIONS", "200"))
+    # Tokens kept per conversation; older turns are dropped beyond it. Keep
+    # below the Ollama context length (OLLAMA_CONTEXT_LENGTH) minus an answer
+    SESSION_MAX_TOKENS: int = int(os.getenv("SESSION_MAX_TOKENS", "6000"))
+
+    # Embedding Version Configuration
+    # How often each process checks Neo4j for a newly activated embedding
+    # version or partition scheme
+    EMBEDDING_VERSION_REFRESH_SECONDS: float = float(
+        os.getenv("EMBEDDING_VERSION_REFRESH_SECONDS", "30")
+    )
+    # Texts per embedding request and write transaction while re-embedding
+    REEMBED_BATCH_SIZE: int = int(os.getenv("REEMBED_BATCH_SIZE", "64"))
+    # Cap on re-embedding throughput, leaving Ollama capacity for queries (0 = no cap)
+    REEMBED_MAX_TEXTS_PER_SECOND: float = float(
+        os.getenv("REEMBED_MAX_TEXTS_PER_SECOND", "50")
+    )
+
+    # Ingestion Pipeline Configuration (workers per stage, bounded queue size)
+    INGEST_UPLOAD_WORKERS: int = int(os.getenv("INGEST_UPLOAD_WORKERS", "4"))
+    INGEST_PARSE_WORKERS: int = int(os.getenv("INGEST_PARSE_WORKERS", "2"))
+    INGEST_EMBED_WORKERS: int = int(os.getenv("INGEST_EMBED_WORKERS", "1"))
+    INGEST_WRITE_WORKERS: int = int(os.getenv("INGEST_WRITE_WORKERS", "1"))
+    INGEST_QUEUE_SIZE: int = int(os.getenv("INGEST_QUEUE_SIZE", "2"))
+    # Chunks per Neo4j write transaction
+    INGEST_WRITE_BATCH_SIZE: int = int(os.getenv("INGEST_WRITE_BATCH_SIZE", "1000"))
+    # Texts per embedding request when requests are batched (bulk ingestion)
+    INGEST_EMBED_BATCH_SIZE: int = int(os.getenv("INGEST_EMBED_BATCH_SIZE", "256"))
+
+    # Services constructed in parallel at startup (empty = build all on first use)
+    STARTUP_WARMUP_SERVICES: str = os.getenv(
+        "STARTUP_WARMUP_SERVICES",
+        "supabase,document_processor,vector_store,summarizer,rag_agent",
+    )
+
+    # Request Profiling Configuration
+    # Profile requests that send "X-Profile: 1"
+    PROFILING_ALLOW_HEADER: bool = (
+        os.getenv("PROFILING_ALLOW_HEADER", "true").lower() == "true"
+    )
+    # Fraction of all requests profiled at random (0 disables sampling)
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    PROFILING_MAX_PROFILES: int = int(os.getenv("PROFILING_MAX_PROFILES", "50"))
+    PROFILING_TOP_FUNCTIONS: int = int(os.getenv("PROFILING_TOP_FUNCTIONS", "40"))
+    # Key required (X-Admin-Key) by admin endpoints and header-triggered
+    # profiling; without it they are refused unless ADMIN_AUTH_DISABLED is true
+    ADMIN_API_KEY: str = os.getenv("ADMIN_API_KEY", "")
+    ADMIN_AUTH_DISABLED: bool = (
+        os.getenv("ADMIN_AUTH_DISABLED", "false").lower() == "true"
+    )
+
+    # Background Jobs Configuration (finished jobs kept for GET /jobs/{job_id})
+    JOBS_MAX_FINISHED: int = int(os.getenv("JOBS_MAX_FINISHED", "100"))
+
+    # Archive Ingestion Configuration
+    ARCHIVE_MAX_WORKERS: int = int(os.getenv("ARCHIVE_MAX_WORKERS", "4"))
+    ARCHIVE_MAX_ENTRY_BYTES: int = int(
+        os.getenv("ARCHIVE_MAX_ENTRY_BYTES", str(500 * 1024 * 1024))
+    )
+
     @classmethod
     def validate(cls) -> None:
         """Validate that required settings are present."""
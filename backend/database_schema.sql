@@ -16,6 +16,9 @@ CREATE INDEX IF NOT EXISTS idx_clients_doc_id ON clients(doc_id);
 -- Create index on created_at for sorting
 CREATE INDEX IF NOT EXISTS idx_clients_created_at ON clients(created_at DESC);
 
+-- Composite index backing keyset pagination of /clients on (created_at, id)
+CREATE INDEX IF NOT EXISTS idx_clients_created_at_id ON clients(created_at DESC, id DESC);
+
 -- Function to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -31,6 +34,38 @@ CREATE TRIGGER update_clients_updated_at
     FOR EACH ROW 
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Client file manifest, written during ingestion
+CREATE TABLE IF NOT EXISTS client_files (
+    id BIGSERIAL PRIMARY KEY,
+    client_doc_id UUID NOT NULL REFERENCES clients(doc_id) ON DELETE CASCADE,
+    filename TEXT NOT NULL,
+    storage_path TEXT NOT NULL,
+    file_hash TEXT,                       -- sha256 of the file content
+    size_bytes BIGINT,
+    page_count INTEGER,                   -- PDFs only
+    chunk_count INTEGER DEFAULT 0,
+    parse_ms INTEGER,
+    embed_ms INTEGER,
+    page_offsets JSONB,                   -- PDFs: [start, end) byte offsets of each page in the .pages sidecar
+    status TEXT NOT NULL DEFAULT 'pending', -- pending | processing | indexed | error
+    error TEXT,
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW(),
+    UNIQUE (client_doc_id, filename)
+);
+
+-- Listing a client's files, newest first
+CREATE INDEX IF NOT EXISTS idx_client_files_client_created_at ON client_files(client_doc_id, created_at DESC);
+
+-- Dedup lookups by content hash
+CREATE INDEX IF NOT EXISTS idx_client_files_client_hash ON client_files(client_doc_id, file_hash);
+
+-- Trigger to automatically update updated_at
+CREATE TRIGGER update_client_files_updated_at
+    BEFORE UPDATE ON client_files
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
 -- Note: Neo4j vector index will be created automatically by the application
 -- The index name is "legal_documents" with:
 -- - Node Label: DocumentChunk
@@ -1,11 +1,31 @@
 """FastAPI application for Legal Document RAG System."""
 
-from datetime import datetime
+import time
+
+# Measured from here so the startup breakdown includes import time
+_IMPORT_STARTED = time.perf_counter()
+
+import hmac
 import logging
-from typing import List
+import os
+import random
+import zipfile
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, List, Optional
 from uuid import UUID
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends
+from fastapi import (
+    FastAPI,
+    UploadFile,
+    File,
+    HTTPException,
+    Depends,
+    Query,
+    Request,
+    Response,
+)
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 from config import settings
 from models.schemas import (
@@ -13,17 +33,35 @@ from models.schemas import (
     ClientResponse,
     QueryRequest,
     QueryResponse,
+    BatchQueryRequest,
+    BatchQueryResult,
+    SessionCreate,
+    SessionResponse,
     UploadResult,
     FileUploadResponse,
     FileInfo,
+    PageResponse,
+    FileDeleteResponse,
+    JobResponse,
+    EmbeddingVersionResponse,
+    ReembedRequest,
     HealthResponse,
 )
-from services.supabase_service import SupabaseService
-from services.document_processor import DocumentProcessor
-from services.neo4j_store import Neo4jVectorStore
-from services.summarization import DocumentSummarizer
-from services.agent import LegalRAGAgent
-from utils.helpers import validate_file_type, sanitize_filename
+from services import registry
+from services.supabase_service import SupabaseService, page_index_path
+from utils.helpers import sanitize_filename, spool_to_temp_file, validate_file_type
+from utils.metrics import (
+    HTTP_REQUESTS,
+    HTTP_REQUEST_SECONDS,
+    QUERY_STAGE_SECONDS,
+    REGISTRY,
+    record_cache_stats,
+    timed,
+)
+from utils.profiling import ProfileSession, ProfileStore, profiling_session
+
+if TYPE_CHECKING:
+    from services.neo4j_store import Neo4jVectorStore
 
 # Configure logging
 logging.basicConfig(
@@ -31,11 +69,61 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm up services in parallel on startup and release them on shutdown.
+
+    Services are built lazily on first use, so a backend that is down at
+    startup only degrades the endpoints that need it.
+    """
+    import_seconds = time.perf_counter() - _IMPORT_STARTED
+    started = time.perf_counter()
+    names = [
+        name.strip()
+        for name in settings.STARTUP_WARMUP_SERVICES.split(",")
+        if name.strip()
+    ]
+    warmup = await registry.warm_up(names)
+    warmup_seconds = time.perf_counter() - started
+
+    app.state.startup = {
+        "import_seconds": round(import_seconds, 3),
+        "warmup_seconds": round(warmup_seconds, 3),
+        "services": warmup,
+    }
+    breakdown = ", ".join(
+        f"{name}={result['seconds']:.3f}s{'' if result['ok'] else ' (failed)'}"
+        for name, result in warmup.items()
+    )
+    logger.info(
+        f"Startup complete: imports {import_seconds:.3f}s, "
+        f"warm-up {warmup_seconds:.3f}s [{breakdown or 'none'}]"
+    )
+
+    model_residency = None
+    if settings.MODEL_WARMUP_ENABLED:
+        try:
+            model_residency = registry.get_model_residency()
+            model_residency.start()
+        except Exception as e:
+            logger.warning(f"Model residency manager not started: {e}")
+
+    yield
+
+    if model_residency is not None:
+        await model_residency.stop()
+    registry.close_all()
+    logger.info("Application shutdown complete")
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Legal Document RAG System",
     description="Legal document query system with citation tracking",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -45,32 +133,130 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Profile-Id"],
 )
 
-# Initialize services (singleton pattern)
-supabase_service = SupabaseService()
-document_processor = DocumentProcessor()
-vector_store = Neo4jVectorStore()
-summarizer = DocumentSummarizer()
-rag_agent = LegalRAGAgent(vector_store)
+# Finished request profiles, kept in memory per process
+profile_store = ProfileStore(settings.PROFILING_MAX_PROFILES)
+
+
+def is_admin(request: Request) -> bool:
+    """
+    Whether the request carries the admin key.
+
+    Without a configured ADMIN_API_KEY no request is admin, unless admin
+    authentication was explicitly turned off with ADMIN_AUTH_DISABLED.
+    """
+    if settings.ADMIN_AUTH_DISABLED:
+        return True
+    if not settings.ADMIN_API_KEY:
+        return False
+    return hmac.compare_digest(
+        request.headers.get("X-Admin-Key", ""), settings.ADMIN_API_KEY
+    )
+
+
+def require_admin(request: Request) -> None:
+    """Dependency rejecting admin requests without a valid X-Admin-Key."""
+    if is_admin(request):
+        return
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=503,
+            detail="Admin endpoints are disabled: ADMIN_API_KEY is not configured",
+        )
+    raise HTTPException(status_code=403, detail="Admin key required")
+
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    """
+    Profile a request when it sends ``X-Profile: 1`` or is picked by sampling.
+
+    The profile id is returned in the ``X-Profile-Id`` header and the profile
+    can be fetched from ``/admin/profiles/{profile_id}``.
+    """
+    if request.url.path.startswith("/admin/") or request.url.path == "/metrics":
+        return await call_next(request)
+
+    trigger = None
+    if (
+        settings.PROFILING_ALLOW_HEADER
+        and request.headers.get("X-Profile", "").lower() in ("1", "true", "yes")
+        and is_admin(request)
+    ):
+        trigger = "header"
+    elif settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE:
+        trigger = "sample"
+
+    if trigger is None:
+        return await call_next(request)
+
+    session = ProfileSession(
+        request.method, request.url.path, trigger, settings.PROFILING_TOP_FUNCTIONS
+    )
+    status = 500
+    try:
+        with profiling_session(session):
+            response = await call_next(request)
+        status = response.status_code
+        response.headers["X-Profile-Id"] = session.id
+        return response
+    finally:
+        session.finish(status)
+        profile_store.add(session)
+        logger.info(
+            f"Profiled {request.method} {request.url.path} ({trigger}): "
+            f"{session.duration * 1000:.1f}ms, profile {session.id}"
+        )
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Count requests and observe latency per route template."""
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", "unmatched")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, method=request.method, route=route_path
+        )
+        HTTP_REQUESTS.inc(method=request.method, route=route_path, status=str(status))
+
+
+def collect_cache_metrics() -> None:
+    """Mirror cache counters of already-built services into the cache gauges."""
+    supabase_service = registry.peek("supabase")
+    if supabase_service is not None:
+        record_cache_stats("clients", supabase_service.cache_stats())
+        record_cache_stats("storage", supabase_service.storage_cache_stats())
+
 
+REGISTRY.add_collector(collect_cache_metrics)
 
-# Dependency to get services
+
+# Dependency to get services (constructed on first use, see services.registry)
 def get_supabase_service() -> SupabaseService:
     """Dependency for Supabase service."""
-    return supabase_service
+    try:
+        return registry.get_supabase_service()
+    except Exception as e:
+        logger.error(f"Supabase service unavailable: {e}")
+        raise HTTPException(status_code=500, detail=f"Supabase unavailable: {e}")
 
 
-def get_vector_store() -> Neo4jVectorStore:
+def get_vector_store() -> "Neo4jVectorStore":
     """Dependency for Neo4j vector store."""
-    return vector_store
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on application shutdown."""
-    vector_store.close()
-    logger.info("Application shutdown complete")
+    try:
+        return registry.get_vector_store()
+    except Exception as e:
+        logger.error(f"Neo4j vector store unavailable: {e}")
+        raise HTTPException(status_code=500, detail=f"Neo4j unavailable: {e}")
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -83,35 +269,59 @@ async def health_check():
         # Check Neo4j connection
         neo4j_available = False
         try:
-            with vector_store.driver.session() as session:
+            with registry.get_vector_store().driver.session() as session:
                 session.run("RETURN 1")
             neo4j_available = True
         except Exception:
             pass
 
+        vector_store = registry.peek("vector_store")
+
         # Check Supabase connection
         supabase_available = False
+        caches = None
         try:
-            supabase_service.list_all_clients()
-            supabase_available = True
+            supabase_service = registry.get_supabase_service()
+            supabase_available = supabase_service.ping()
+            caches = {
+                "clients": supabase_service.cache_stats(),
+                "storage": supabase_service.storage_cache_stats(),
+            }
         except Exception:
             pass
 
-        # Check Ollama (basic check)
-        ollama_available = True  # Will fail during actual use if not available
+        # Check Ollama: which models are loaded, plus cold-load stats
+        ollama_available = False
+        models = None
+        try:
+            model_residency = registry.get_model_residency()
+            await model_residency.refresh_residency()
+            ollama_available = True
+        except Exception:
+            model_residency = registry.peek("model_residency")
+        if model_residency is not None:
+            models = model_residency.report()
 
         return HealthResponse(
             status=(
-                "healthy" if (neo4j_available and supabase_available) else "degraded"
+                "healthy"
+                if (neo4j_available and supabase_available and ollama_available)
+                else "degraded"
             ),
             ollama_available=ollama_available,
             neo4j_available=neo4j_available,
             supabase_available=supabase_available,
             model_info={
                 "llm_model": settings.OLLAMA_MODEL,
-                "embedding_model": settings.OLLAMA_EMBEDDING_MODEL,
+                "embedding_model": (
+                    vector_store.active_version.model
+                    if vector_store is not None
+                    else settings.OLLAMA_EMBEDDING_MODEL
+                ),
                 "ollama_url": settings.OLLAMA_BASE_URL,
             },
+            caches=caches,
+            models=models,
         )
     except Exception as e:
         logger.error(f"Health check error: {e}")
@@ -124,6 +334,54 @@ async def health_check():
         )
 
 
+@app.get("/metrics")
+async def metrics():
+    """
+    Prometheus metrics in the text exposition format.
+
+    Covers request latency per route, ingest and query stage histograms,
+    LLM token counts, cache hit rates and ingest queue depths.
+    """
+    return Response(
+        content=REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/admin/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    """
+    List stored request profiles, newest first.
+
+    Returns:
+        Profile summaries (id, route, status, trigger, duration)
+    """
+    return profile_store.list()
+
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+async def get_profile(profile_id: str):
+    """
+    Get one request profile.
+
+    Args:
+        profile_id: Id from the ``X-Profile-Id`` response header
+
+    Returns:
+        Stage timeline, per-stage totals and the cProfile report
+    """
+    session = profile_store.get(profile_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Profile not found: {profile_id}")
+    return session.to_dict()
+
+
+@app.delete("/admin/profiles", dependencies=[Depends(require_admin)])
+async def clear_profiles():
+    """Drop all stored request profiles."""
+    profile_store.clear()
+    return {"status": "cleared"}
+
+
 @app.post("/clients/create", response_model=ClientResponse)
 async def create_client(
     client_data: ClientCreate, supabase: SupabaseService = Depends(get_supabase_service)
@@ -148,16 +406,40 @@ async def create_client(
 
 
 @app.get("/clients", response_model=List[ClientResponse])
-async def list_clients(supabase: SupabaseService = Depends(get_supabase_service)):
+async def list_clients(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    include_summary: bool = False,
+    supabase: SupabaseService = Depends(get_supabase_service),
+):
     """
-    List all clients.
+    List clients, newest first, one keyset-paginated page at a time.
+
+    The cursor for the next page is returned in the ``X-Next-Cursor`` header
+    (absent on the last page).
+
+    Args:
+        limit: Page size
+        cursor: Cursor from the previous page's ``X-Next-Cursor`` header
+        include_summary: Include the summary text of each client
 
     Returns:
-        List of all client records
+        List of client records for this page
     """
     try:
-        clients = supabase.list_all_clients()
+        try:
+            clients, next_cursor = supabase.list_clients_page(
+                limit=limit, cursor=cursor, include_summary=include_summary
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return [ClientResponse(**client) for client in clients]
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing clients: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -197,19 +479,20 @@ async def upload_documents(
     """
     Upload and process documents for a client.
 
-    Process:
+    Process (pipelined across files, see IngestPipeline):
     1. Upload files to Supabase Storage
     2. Parse and chunk documents
-    3. Generate embeddings and store in Neo4j
-    4. Generate summary using Ollama
-    5. Update client summary in Supabase
+    3. Generate embeddings
+    4. Store embeddings in Neo4j
+    5. Generate summary using Ollama
+    6. Update client summary in Supabase
 
     Args:
         doc_id: Client document ID
         files: List of uploaded files
 
     Returns:
-        Upload results and generated summary
+        Upload results, generated summary and per-stage pipeline stats
     """
     try:
         # Verify client exists
@@ -220,76 +503,40 @@ async def upload_documents(
         client_name = client["name"]
         client_doc_id = str(doc_id)
 
-        upload_results = []
-        all_chunks = []
-        all_chunk_texts = []
-
-        # Process each file
-        for file in files:
-            try:
+        async def iter_items():
+            for file in files:
                 # Validate file type
                 if not validate_file_type(file.filename):
-                    upload_results.append(
-                        FileUploadResponse(
-                            filename=file.filename,
-                            status="rejected",
-                            chunks_created=0,
-                            message=f"Unsupported file type: {file.filename}",
-                        )
-                    )
+                    yield {
+                        "filename": file.filename,
+                        "status": "rejected",
+                        "message": f"Unsupported file type: {file.filename}",
+                    }
                     continue
 
-                # Read file content
-                file_bytes = await file.read()
-                sanitized_filename = sanitize_filename(file.filename)
-
-                # Upload to Supabase Storage
-                storage_path = supabase.upload_file(
-                    file_bytes, client_doc_id, sanitized_filename
-                )
-
-                # Process document
-                chunks = document_processor.process_file_bytes(
-                    file_bytes, sanitized_filename, client_doc_id, client_name
-                )
-                logger.info(f"{chunks}")
-                all_chunks.extend(chunks)
-                all_chunk_texts.extend([chunk["text"] for chunk in chunks])
-
-                upload_results.append(
-                    FileUploadResponse(
-                        filename=sanitized_filename,
-                        status="processed",
-                        chunks_created=len(chunks),
-                        message=f"Successfully processed {len(chunks)} chunks",
-                    )
-                )
-
-                logger.info(f"Processed {sanitized_filename}: {len(chunks)} chunks")
-
-            except Exception as e:
-                logger.error(f"Error processing file {file.filename}: {e}")
-                upload_results.append(
-                    FileUploadResponse(
-                        filename=file.filename,
-                        status="error",
-                        chunks_created=0,
-                        message=f"Error: {str(e)}",
-                    )
-                )
-
-        # Add documents to Neo4j vector store
-        if all_chunks:
-            try:
-                vector_store.add_documents_for_client(
-                    all_chunks, client_doc_id, client_name
-                )
-                logger.info(f"Added {len(all_chunks)} chunks to Neo4j")
-            except Exception as e:
-                logger.error(f"Error adding chunks to Neo4j: {e}")
-                raise HTTPException(
-                    status_code=500, detail=f"Error storing embeddings: {str(e)}"
-                )
+                # Spool to disk only once the pipeline has room for the file,
+                # in fixed-size reads rather than one read of the whole upload
+                yield {
+                    "filename": sanitize_filename(file.filename),
+                    "local_path": await run_in_threadpool(
+                        spool_to_temp_file, file.file, file.filename
+                    ),
+                    "delete_local_path": True,
+                    "client_doc_id": client_doc_id,
+                    "client_name": client_name,
+                }
+
+        ingest = await registry.get_ingest_pipeline().run(iter_items())
+
+        upload_results = [
+            FileUploadResponse(
+                filename=item["filename"],
+                status=item["status"],
+                chunks_created=item["chunk_count"],
+                message=item["message"],
+            )
+            for item in ingest["items"]
+        ]
 
         # Generate summary
         summary = ""
@@ -304,7 +551,12 @@ async def upload_documents(
         #         logger.error(f"Error generating summary: {e}")
         #         summary = f"Summary generation encountered an error: {str(e)}"
 
-        return UploadResult(files=upload_results, summary=summary, client_doc_id=doc_id)
+        return UploadResult(
+            files=upload_results,
+            summary=summary,
+            client_doc_id=doc_id,
+            stats=ingest["stats"],
+        )
 
     except HTTPException:
         raise
@@ -313,6 +565,75 @@ async def upload_documents(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/clients/{doc_id}/upload_archive", response_model=UploadResult)
+async def upload_archive(
+    doc_id: UUID,
+    archive: UploadFile = File(...),
+    supabase: SupabaseService = Depends(get_supabase_service),
+):
+    """
+    Upload a zip archive of documents for a client.
+
+    Entries are read as streams straight out of the archive, unsupported types
+    are reported as rejected, and supported entries flow through the staged
+    ingestion pipeline while the rest of the archive is still decompressing.
+
+    Args:
+        doc_id: Client document ID
+        archive: Uploaded zip file
+
+    Returns:
+        Per-entry upload results and per-stage pipeline stats
+    """
+    try:
+        # Verify client exists
+        client = supabase.get_client_by_doc_id(str(doc_id))
+        if not client:
+            raise HTTPException(status_code=404, detail=f"Client not found: {doc_id}")
+
+        if not archive.filename or not archive.filename.lower().endswith(".zip"):
+            raise HTTPException(
+                status_code=400, detail=f"Expected a .zip archive: {archive.filename}"
+            )
+
+        # Starlette's SpooledTemporaryFile is not seekable enough for zipfile on
+        # Python < 3.11, so the archive is copied to a real file first
+        archive_path = await run_in_threadpool(
+            spool_to_temp_file, archive.file, archive.filename
+        )
+        try:
+            ingest = await registry.get_archive_ingestor().ingest_archive(
+                archive_path, str(doc_id), client["name"]
+            )
+        except zipfile.BadZipFile as e:
+            raise HTTPException(status_code=400, detail=f"Invalid zip archive: {e}")
+        finally:
+            os.unlink(archive_path)
+
+        upload_results = [
+            FileUploadResponse(
+                filename=item["filename"],
+                status=item["status"],
+                chunks_created=item["chunk_count"],
+                message=item["message"],
+            )
+            for item in ingest["items"]
+        ]
+
+        return UploadResult(
+            files=upload_results,
+            summary="",
+            client_doc_id=doc_id,
+            stats=ingest["stats"],
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error uploading archive: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/query", response_model=QueryResponse)
 async def query_documents(
     query_request: QueryRequest,
@@ -321,29 +642,52 @@ async def query_documents(
     """
     Query documents for a specific client with citation tracking.
 
+    With a session_id, the question is answered within that conversation
+    session (see POST /sessions) instead of by a new agent run.
+
     Args:
-        query_request: Query request with question and client_doc_id
+        query_request: Query request with question, client_doc_id and
+            optional session_id
 
     Returns:
         Answer with citations
     """
     try:
         client_doc_id = str(query_request.client_doc_id)
+        session = None
+        if query_request.session_id:
+            session = registry.get_session_store().get(query_request.session_id)
+            if session is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Session not found or expired: {query_request.session_id}",
+                )
+            if session.client_doc_id != client_doc_id:
+                raise HTTPException(
+                    status_code=400, detail="Session belongs to another client"
+                )
 
         # Verify client exists
-        client = supabase.get_client_by_doc_id(client_doc_id)
+        with timed(QUERY_STAGE_SECONDS, "client_lookup"):
+            client = supabase.get_client_by_doc_id(client_doc_id)
         if not client:
             raise HTTPException(
                 status_code=404, detail=f"Client not found: {client_doc_id}"
             )
 
         # Process query using RAG agent
-        result = rag_agent.query(query_request.question, client_doc_id)
+        agent = registry.get_rag_agent()
+        if session is not None:
+            result = agent.query_in_session(query_request.question, session)
+        else:
+            result = agent.query(query_request.question, client_doc_id)
 
         return QueryResponse(
             answer=result["answer"],
             citations=result["citations"],
             client_doc_id=query_request.client_doc_id,
+            context_tokens=result.get("context_tokens"),
+            session_id=session.id if session is not None else None,
         )
 
     except HTTPException:
@@ -353,18 +697,122 @@ async def query_documents(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/query/batch")
+async def query_documents_batch(
+    batch_request: BatchQueryRequest,
+    supabase: SupabaseService = Depends(get_supabase_service),
+):
+    """
+    Answer a list of questions for one client, streaming results as they finish.
+
+    All questions are embedded in one request and searched concurrently;
+    answers come from one LLM call per distinct question, with bounded
+    concurrency. The response is NDJSON, one BatchQueryResult per line in
+    completion order (``index`` gives the question's position).
+
+    Args:
+        batch_request: Questions and client_doc_id
+
+    Returns:
+        Streaming NDJSON response
+    """
+    client_doc_id = str(batch_request.client_doc_id)
+    if len(batch_request.questions) > settings.QUERY_BATCH_MAX_QUESTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.QUERY_BATCH_MAX_QUESTIONS} questions per batch",
+        )
+
+    with timed(QUERY_STAGE_SECONDS, "client_lookup"):
+        client = supabase.get_client_by_doc_id(client_doc_id)
+    if not client:
+        raise HTTPException(status_code=404, detail=f"Client not found: {client_doc_id}")
+
+    runner = registry.get_batch_query_runner()
+    try:
+        # Retrieval errors still get a proper status; generation errors are per line
+        plan = await run_in_threadpool(runner.retrieve, batch_request.questions, client_doc_id)
+    except Exception as e:
+        logger.error(f"Error retrieving batch query context: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    def lines():
+        for result in runner.generate(plan):
+            yield BatchQueryResult(**result).model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.post("/sessions", response_model=SessionResponse)
+async def create_session(
+    session_request: SessionCreate,
+    supabase: SupabaseService = Depends(get_supabase_service),
+):
+    """
+    Start a conversation session for a client.
+
+    Pass the returned session_id to /query. Follow-up questions then reuse
+    the passages and the prompt of earlier turns.
+
+    Args:
+        session_request: Client doc_id
+
+    Returns:
+        New session
+    """
+    client_doc_id = str(session_request.client_doc_id)
+    if not supabase.get_client_by_doc_id(client_doc_id):
+        raise HTTPException(status_code=404, detail=f"Client not found: {client_doc_id}")
+    store = registry.get_session_store()
+    return store.create(client_doc_id).to_dict(store.idle_seconds)
+
+
+@app.get("/sessions/{session_id}", response_model=SessionResponse)
+async def get_session(session_id: str):
+    """
+    Get a conversation session's state (also keeps it alive).
+
+    Args:
+        session_id: Session ID
+
+    Returns:
+        Session state
+    """
+    store = registry.get_session_store()
+    session = store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Session not found or expired: {session_id}")
+    return session.to_dict(store.idle_seconds)
+
+
+@app.delete("/sessions/{session_id}")
+async def delete_session(session_id: str):
+    """
+    End a conversation session and free its memory.
+
+    Args:
+        session_id: Session ID
+
+    Returns:
+        Status
+    """
+    if not registry.get_session_store().delete(session_id):
+        raise HTTPException(status_code=404, detail=f"Session not found or expired: {session_id}")
+    return {"status": "ended"}
+
+
 @app.get("/clients/{doc_id}/files", response_model=List[FileInfo])
 async def list_client_files(
     doc_id: UUID, supabase: SupabaseService = Depends(get_supabase_service)
 ):
     """
-    List all files for a client from Supabase Storage.
+    List all files for a client from the client_files manifest.
 
     Args:
         doc_id: Client document ID
 
     Returns:
-        List of file information
+        List of file information with ingest metadata
     """
     try:
         # Verify client exists
@@ -374,18 +822,22 @@ async def list_client_files(
 
         files = supabase.list_client_files(str(doc_id))
 
-        file_infos = []
-        for file in files:
-            file_infos.append(
-                FileInfo(
-                    filename=file.get("name", ""),
-                    path=f"{doc_id}/{file.get('name', '')}",
-                    size=file.get("metadata", {}).get("size"),
-                    created_at=datetime.now(),  
-                )
+        return [
+            FileInfo(
+                filename=file["filename"],
+                path=file["storage_path"],
+                size=file.get("size_bytes"),
+                created_at=file.get("created_at"),
+                updated_at=file.get("updated_at"),
+                file_hash=file.get("file_hash"),
+                page_count=file.get("page_count"),
+                chunk_count=file.get("chunk_count"),
+                parse_ms=file.get("parse_ms"),
+                embed_ms=file.get("embed_ms"),
+                status=file.get("status"),
             )
-
-        return file_infos
+            for file in files
+        ]
 
     except HTTPException:
         raise
@@ -394,6 +846,313 @@ async def list_client_files(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.delete(
+    "/clients/{doc_id}",
+    response_model=JobResponse,
+    status_code=202,
+    dependencies=[Depends(require_admin)],
+)
+async def delete_client(
+    doc_id: UUID, supabase: SupabaseService = Depends(get_supabase_service)
+):
+    """
+    Delete a client with all of its chunks, stored files and records.
+
+    Runs as a background job; poll ``GET /jobs/{job_id}`` for progress.
+    Repeating the request while the deletion runs returns the same job.
+
+    Args:
+        doc_id: Client document ID
+
+    Returns:
+        The deletion job
+    """
+    try:
+        client_doc_id = str(doc_id)
+        jobs = registry.get_job_manager()
+        job = jobs.active("delete_client", client_doc_id)
+        if job is None:
+            client = await run_in_threadpool(supabase.get_client_by_doc_id, client_doc_id)
+            if not client:
+                raise HTTPException(status_code=404, detail=f"Client not found: {doc_id}")
+            deleter = registry.get_client_deleter()
+            job = jobs.submit(
+                "delete_client",
+                client_doc_id,
+                lambda job: deleter.delete_client(client_doc_id, job.update),
+            )
+        return JobResponse(**job.to_dict())
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error starting client deletion: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.delete(
+    "/clients/{doc_id}/files/{filename}",
+    response_model=FileDeleteResponse,
+    dependencies=[Depends(require_admin)],
+)
+async def delete_client_file(doc_id: UUID, filename: str):
+    """
+    Delete one file of a client: its chunks, stored object, page sidecar and record.
+
+    Args:
+        doc_id: Client document ID
+        filename: Stored filename
+
+    Returns:
+        Counts of deleted chunks and storage objects
+    """
+    try:
+        deleted = await run_in_threadpool(
+            registry.get_client_deleter().delete_file, str(doc_id), filename
+        )
+        if deleted is None:
+            raise HTTPException(status_code=404, detail=f"File not found: {filename}")
+        return FileDeleteResponse(**deleted)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting file {filename}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """
+    Status and progress of a background job.
+
+    Args:
+        job_id: Job ID returned when the job was started
+
+    Returns:
+        Job status, progress counters, result or error
+    """
+    job = registry.get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return JobResponse(**job.to_dict())
+
+
+@app.post(
+    "/jobs/{job_id}/cancel",
+    response_model=JobResponse,
+    dependencies=[Depends(require_admin)],
+)
+async def cancel_job(job_id: str):
+    """
+    Ask a background job to stop.
+
+    Jobs stop at their next checkpoint; poll ``GET /jobs/{job_id}`` until the
+    status is "cancelled". Re-embed jobs resume where they stopped when
+    started again.
+
+    Args:
+        job_id: Job ID returned when the job was started
+
+    Returns:
+        The job
+    """
+    job = registry.get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    job.cancel()
+    return JobResponse(**job.to_dict())
+
+
+@app.get(
+    "/admin/embeddings",
+    response_model=List[EmbeddingVersionResponse],
+    dependencies=[Depends(require_admin)],
+)
+async def list_embedding_versions():
+    """
+    List embedding versions: the active one, any being built, and retired ones.
+
+    Returns:
+        Registered embedding versions
+    """
+    try:
+        versions = await run_in_threadpool(registry.get_vector_store().list_embedding_versions)
+        return [EmbeddingVersionResponse(**version.to_dict()) for version in versions]
+    except Exception as e:
+        logger.error(f"Error listing embedding versions: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post(
+    "/admin/embeddings/reembed",
+    response_model=JobResponse,
+    status_code=202,
+    dependencies=[Depends(require_admin)],
+)
+async def reembed(request: ReembedRequest):
+    """
+    Re-embed every chunk with another model, then switch queries to it.
+
+    Runs as a background job; queries keep using the current model until the
+    new vectors are complete. Only one re-embed job runs at a time.
+
+    Args:
+        request: Model to migrate to (defaults to OLLAMA_EMBEDDING_MODEL)
+
+    Returns:
+        The re-embed job
+    """
+    try:
+        model = request.model or settings.OLLAMA_EMBEDDING_MODEL
+        jobs = registry.get_job_manager()
+        running = [job for job in jobs.list("reembed") if job.active]
+        if running and running[0].key != model:
+            raise HTTPException(
+                status_code=409,
+                detail=f"A re-embed job for {running[0].key} is already running",
+            )
+        reembedder = registry.get_reembedder()
+        if not running:
+            reembedder.check_model(model)
+        job = jobs.submit("reembed", model, lambda job: reembedder.run(model, job))
+        return JobResponse(**job.to_dict())
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error starting re-embed job: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.delete(
+    "/admin/embeddings/{name}",
+    response_model=JobResponse,
+    status_code=202,
+    dependencies=[Depends(require_admin)],
+)
+async def drop_embedding_version(name: str):
+    """
+    Drop an inactive embedding version's index and vectors to reclaim space.
+
+    Retired versions make switching back to their model quick, so drop them
+    once the new model is settled.
+
+    Args:
+        name: Version name (see ``GET /admin/embeddings``)
+
+    Returns:
+        The drop job
+    """
+    try:
+        vector_store = registry.get_vector_store()
+        version = await run_in_threadpool(vector_store.get_embedding_version, name)
+        if version is None:
+            raise HTTPException(status_code=404, detail=f"Embedding version not found: {name}")
+        jobs = registry.get_job_manager()
+        if version.status == "active" or jobs.active("reembed", version.model):
+            raise HTTPException(
+                status_code=409, detail=f"Embedding version {name} is in use"
+            )
+        job = jobs.submit(
+            "drop_embedding_version",
+            name,
+            lambda job: vector_store.drop_embedding_version(
+                name, on_progress=lambda total: job.update(vectors_removed=total)
+            ),
+        )
+        return JobResponse(**job.to_dict())
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error dropping embedding version {name}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/clients/{doc_id}/files/{filename}/pages/{page}", response_model=PageResponse)
+async def get_file_page(
+    doc_id: UUID,
+    filename: str,
+    page: int,
+    format: str = Query("text", pattern="^(text|pdf)$"),
+    supabase: SupabaseService = Depends(get_supabase_service),
+):
+    """
+    Fetch a single page of a stored PDF, e.g. to preview a [file.pdf, p.37] citation.
+
+    Text is served from the page-offset index built at ingest with one
+    byte-range read, so the document is never re-parsed. ``format=pdf``
+    returns a single-page PDF cut from the (disk-cached) original.
+
+    Args:
+        doc_id: Client document ID
+        filename: Stored filename
+        page: 1-based page number
+        format: "text" (default) or "pdf"
+
+    Returns:
+        Page text, or a single-page PDF
+    """
+    try:
+        manifest = supabase.get_file_manifest(str(doc_id), filename)
+        if not manifest:
+            raise HTTPException(
+                status_code=404, detail=f"File not found: {filename}"
+            )
+
+        page_offsets = manifest.get("page_offsets")
+        if not page_offsets:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No page index for {filename} (only PDFs are paged)",
+            )
+        if not 1 <= page <= len(page_offsets):
+            raise HTTPException(
+                status_code=404,
+                detail=f"Page {page} out of range (1-{len(page_offsets)})",
+            )
+
+        if format == "pdf":
+            pdf_bytes = await run_in_threadpool(
+                supabase.download_file, manifest["storage_path"]
+            )
+            page_pdf = await run_in_threadpool(
+                registry.get_document_processor().extract_pdf_page, pdf_bytes, page
+            )
+            return Response(
+                content=page_pdf,
+                media_type="application/pdf",
+                headers={
+                    "Content-Disposition": f'inline; filename="{filename}.p{page}.pdf"'
+                },
+            )
+
+        start, end = page_offsets[page - 1]
+        text = ""
+        if end > start:
+            text = (
+                await run_in_threadpool(
+                    supabase.download_file_range,
+                    page_index_path(str(doc_id), filename),
+                    start,
+                    end - 1,
+                )
+            ).decode("utf-8", errors="replace")
+
+        return PageResponse(
+            filename=filename, page=page, page_count=len(page_offsets), text=text
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching page {page} of {filename}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -1,6 +1,6 @@
 """Pydantic schemas for API request/response models."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 from uuid import UUID
@@ -17,7 +17,7 @@ class ClientResponse(BaseModel):
 
     id: int
     name: str
-    summary: str
+    summary: Optional[str] = None  # Omitted from listings unless requested
     doc_id: UUID
     created_at: datetime
     updated_at: datetime
@@ -41,6 +41,7 @@ class UploadResult(BaseModel):
     files: List[FileUploadResponse]
     summary: str
     client_doc_id: UUID
+    stats: Optional[Dict[str, Any]] = None  # Per-stage ingestion pipeline stats
 
 
 class QueryRequest(BaseModel):
@@ -48,13 +49,16 @@ class QueryRequest(BaseModel):
 
     question: str = Field(..., description="Question to ask about the documents")
     client_doc_id: UUID = Field(..., description="Client document ID for scoping")
+    session_id: Optional[str] = Field(
+        None, description="Conversation session (from POST /sessions) to ask within"
+    )
 
 
 class Citation(BaseModel):
     """Schema for citation."""
 
     filename: str
-    location: str  # e.g., "p.5" or "para.3"
+    location: str  # e.g., "p.5", "para.3", "line.120" or "t.01:02:03"
 
 
 class QueryResponse(BaseModel):
@@ -63,6 +67,43 @@ class QueryResponse(BaseModel):
     answer: str
     citations: List[Citation]
     client_doc_id: UUID
+    context_tokens: Optional[int] = None  # retrieved passage tokens in the prompt
+    session_id: Optional[str] = None
+
+
+class BatchQueryRequest(BaseModel):
+    """Schema for batch query request."""
+
+    questions: List[str] = Field(..., min_length=1, description="Questions to answer")
+    client_doc_id: UUID = Field(..., description="Client document ID for scoping")
+
+
+class BatchQueryResult(BaseModel):
+    """Schema for one streamed batch query result (NDJSON line)."""
+
+    index: int  # Position of the question in the request
+    question: str
+    answer: Optional[str] = None
+    citations: List[Citation] = []
+    context_tokens: Optional[int] = None
+    error: Optional[str] = None
+
+
+class SessionCreate(BaseModel):
+    """Schema for starting a conversation session."""
+
+    client_doc_id: UUID = Field(..., description="Client document ID for scoping")
+
+
+class SessionResponse(BaseModel):
+    """Schema for a conversation session's state."""
+
+    session_id: str
+    client_doc_id: UUID
+    turns: int  # Questions answered and still in the conversation
+    passages: int  # Passages in the conversation
+    tokens: int  # Tokens of the conversation (system prompt excluded)
+    expires_in_seconds: int  # Until idle expiry
 
 
 class FileInfo(BaseModel):
@@ -72,6 +113,64 @@ class FileInfo(BaseModel):
     path: str
     size: Optional[int] = None
     created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    file_hash: Optional[str] = None
+    page_count: Optional[int] = None
+    chunk_count: Optional[int] = None
+    parse_ms: Optional[int] = None
+    embed_ms: Optional[int] = None
+    status: Optional[str] = None  # pending, processing, indexed or error
+
+
+class PageResponse(BaseModel):
+    """Schema for the text of a single cited page."""
+
+    filename: str
+    page: int
+    page_count: int
+    text: str
+
+
+class FileDeleteResponse(BaseModel):
+    """Schema for the result of deleting one client file."""
+
+    filename: str
+    chunks_deleted: int
+    storage_objects_deleted: int
+
+
+class JobResponse(BaseModel):
+    """Schema for a background job's status."""
+
+    job_id: str
+    kind: str  # e.g. "delete_client"
+    key: str  # What the job works on, e.g. the client doc_id
+    status: str  # queued, running, succeeded, failed or cancelled
+    progress: Dict[str, Any] = {}
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class EmbeddingVersionResponse(BaseModel):
+    """Schema for one embedding version."""
+
+    name: str
+    model: str
+    embedding_property: str
+    index_name: str
+    dimensions: Optional[int] = None
+    status: str  # active, building or retired
+    activated_at: Optional[float] = None
+
+
+class ReembedRequest(BaseModel):
+    """Schema for starting a re-embed job."""
+
+    # Embedding model to migrate to (defaults to OLLAMA_EMBEDDING_MODEL)
+    model: Optional[str] = None
 
 
 class HealthResponse(BaseModel):
@@ -82,3 +181,5 @@ class HealthResponse(BaseModel):
     neo4j_available: bool
     supabase_available: bool
     model_info: dict
+    caches: Optional[Dict[str, Any]] = None  # Cache hit-rate counters
+    models: Optional[Dict[str, Any]] = None  # Ollama model residency and load latency
@@ -0,0 +1,112 @@
+"""
+Migrate stored chunks to a partition scheme (hash buckets of client doc_ids).
+
+With N partitions, every chunk carries its client's partition label and each
+embedding version has one vector index per partition. Searches then walk
+only the client's partition index instead of one index over all clients.
+Queries keep working during the migration (see PartitionMigrator), and an
+interrupted run resumes when started again with the same arguments.
+
+Usage (from backend/):
+    python partition_chunks.py --status
+    python partition_chunks.py --partitions 16
+    python partition_chunks.py --partitions 0      # back to one shared index
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from collections import Counter
+
+from config import settings
+from services import registry
+from services.partitioning import PartitionMigrator
+
+logger = logging.getLogger("partition_chunks")
+
+
+def status() -> dict:
+    """Active scheme and how clients spread over its partitions."""
+    vector_store = registry.get_vector_store()
+    scheme = vector_store.partition_scheme
+    report = {"partitions": scheme.partitions}
+    if scheme.partitions:
+        clients = Counter(
+            scheme.partition_for(client_doc_id)
+            for client_doc_id in vector_store.list_chunk_clients()
+        )
+        report["clients_per_partition"] = [clients[p] for p in range(scheme.partitions)]
+    return report
+
+
+def migrate(args: argparse.Namespace) -> dict:
+    """Run the migration, printing progress lines to stderr."""
+    last_print = [0.0]
+
+    def on_progress(**fields) -> None:
+        now = time.monotonic()
+        if "stage" in fields or now - last_print[0] >= args.progress_interval:
+            last_print[0] = now
+            print(
+                " ".join(f"{key}={value}" for key, value in fields.items()),
+                file=sys.stderr,
+                flush=True,
+            )
+
+    migrator = PartitionMigrator(
+        registry.get_vector_store(),
+        batch_size=args.batch_size,
+        catch_up_delay=args.catch_up_delay,
+        index_timeout=args.index_timeout,
+    )
+    return migrator.run(args.partitions, args.drop_shared_indexes, on_progress)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--partitions", type=int,
+                        help="target partition count (0 = one shared index)")
+    action.add_argument("--status", action="store_true", help="show the active scheme")
+    parser.add_argument("--batch-size", type=int, default=settings.NEO4J_DELETE_BATCH_SIZE,
+                        help="chunks labelled per transaction")
+    parser.add_argument("--catch-up-delay", type=float,
+                        default=2 * settings.EMBEDDING_VERSION_REFRESH_SECONDS,
+                        help="seconds to wait after the switch for other processes")
+    parser.add_argument("--index-timeout", type=float, default=3600,
+                        help="seconds to wait for new vector indexes to populate")
+    parser.add_argument("--drop-shared-indexes", action="store_true",
+                        help="when partitioning, drop the now unused shared vector indexes")
+    parser.add_argument("--progress-interval", type=float, default=2.0,
+                        help="seconds between progress lines")
+    parser.add_argument("--verbose", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Show the partition status or run a migration."""
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    try:
+        report = status() if args.status else migrate(args)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        print("\nInterrupted; run the same command again to resume.", file=sys.stderr)
+        return 130
+    finally:
+        registry.close_all()
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
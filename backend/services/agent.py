@@ -1,19 +1,98 @@
 """RAG agent service with citation tracking."""
 
 import logging
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Optional
+from uuid import UUID
 from langchain_ollama import ChatOllama
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
 from langchain_core.tools import Tool
 from langchain_classic.agents import AgentExecutor, create_react_agent
 
 from langchain_core.prompts import PromptTemplate
 from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 from config import settings
+from services.context_packer import ContextPacker, count_tokens
 from services.neo4j_store import Neo4jVectorStore
+from services.passages import PassageRetriever
+from services.sessions import ConversationSession, SessionTurn, passage_key
 from models.schemas import Citation
+from utils.metrics import (
+    AGENT_ITERATIONS,
+    CONTEXT_TOKENS,
+    LLM_TOKENS,
+    QUERY_STAGE_SECONDS,
+    observe_stage,
+    timed,
+)
+from utils.profiling import profiled
 
 logger = logging.getLogger(__name__)
 
+# Single-shot prompt for questions whose passages were retrieved up front. The
+# instructions and passages come before the question, so questions sharing
+# their passages share a prompt prefix Ollama can reuse.
+CONTEXT_ANSWER_PROMPT = """You are a professional legal assistant helping lawyers query legal documents.
+
+RULES:
+1. Answer ONLY from the passages below; they are the client's documents (doc_id: {client_doc_id})
+2. MANDATORY citation format: [filename, location], copied from the passage headers
+3. NEVER fabricate information or citations
+4. If the passages do not contain the answer, clearly state that
+
+Passages:
+{context}
+
+Question: {question}
+Answer:"""
+
+# System message of a session; identical for every turn, so it stays in the cached prefix
+SESSION_SYSTEM_PROMPT = """You are a professional legal assistant helping lawyers review legal documents in a conversation.
+
+RULES:
+1. Answer ONLY from the passages given in this conversation; they are the client's documents (doc_id: {client_doc_id})
+2. MANDATORY citation format: [filename, location], copied from the passage headers
+3. NEVER fabricate information or citations
+4. If the passages do not contain the answer, clearly state that"""
+
+
+class QueryMetricsHandler(BaseCallbackHandler):
+    """Records LLM call latency and token usage for one agent run."""
+
+    def __init__(self, model: str):
+        """
+        Initialize handler.
+
+        Args:
+            model: Model name used as the token counter label
+        """
+        self.model = model
+        self.llm_calls = 0
+        self._started: Dict[UUID, float] = {}
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs) -> None:
+        """Remember when an LLM call started (chat models fall back to this hook)."""
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs) -> None:
+        """Record the call's latency and token counts."""
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            observe_stage(QUERY_STAGE_SECONDS, "llm_call", time.perf_counter() - started)
+        self.llm_calls += 1
+
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or {}
+                if usage:
+                    LLM_TOKENS.inc(usage.get("input_tokens", 0), model=self.model, kind="prompt")
+                    LLM_TOKENS.inc(
+                        usage.get("output_tokens", 0), model=self.model, kind="completion"
+                    )
+
 
 class LegalRAGAgent:
     """RAG agent for legal document queries with citation tracking."""
@@ -26,19 +105,24 @@ class LegalRAGAgent:
             vector_store: Neo4jVectorStore instance for document retrieval
         """
         self.vector_store = vector_store
+        self.retriever = PassageRetriever(vector_store)
+        self.packer = ContextPacker()
         self.llm = ChatOllama(
             model=settings.OLLAMA_MODEL,
             base_url=settings.OLLAMA_BASE_URL,
             temperature=0,
-            keep_alive="5m",
+            keep_alive=settings.OLLAMA_KEEP_ALIVE,
         )
 
-    def _create_retrieval_tool(self, client_doc_id: str) -> Tool:
+    def _create_retrieval_tool(
+        self, client_doc_id: str, context_tokens: Optional[List[int]] = None
+    ) -> Tool:
         """
         Create retrieval tool for client-specific document search.
 
         Args:
             client_doc_id: Client document ID for scoping
+            context_tokens: Optional list receiving the token count of each result
 
         Returns:
             LangChain Tool for document retrieval
@@ -47,17 +131,18 @@ class LegalRAGAgent:
         def retrieve_documents(query: str) -> str:
             """Retrieve relevant documents for the query."""
             try:
-                docs = self.vector_store.search_by_client(query, client_doc_id, k=4)
-
-                # Format documents with citations
-                formatted_docs = []
-                for doc in docs:
-                    source = doc.metadata.get("source", "Unknown")
-                    location = doc.metadata.get("location", "")
-                    citation = f"[{source}, {location}]"
-                    formatted_docs.append(f"{citation}\n{doc.page_content}")
-
-                return "\n\n---\n\n".join(formatted_docs)
+                docs = self.retriever.retrieve(query, client_doc_id)
+
+                # Format documents with citations, within the token budget
+                packed = self.packer.pack(docs)
+                if packed.truncated or packed.dropped:
+                    logger.debug(
+                        f"Context budget: {packed.truncated} passages truncated, "
+                        f"{packed.dropped} dropped"
+                    )
+                if context_tokens is not None:
+                    context_tokens.append(packed.tokens)
+                return packed.text
             except Exception as e:
                 logger.error(f"Error retrieving documents: {e}")
                 return f"Error retrieving documents: {str(e)}"
@@ -70,18 +155,21 @@ class LegalRAGAgent:
             func=retrieve_documents,
         )
 
-    def create_agent_for_client(self, client_doc_id: str) -> AgentExecutor:
+    def create_agent_for_client(
+        self, client_doc_id: str, context_tokens: Optional[List[int]] = None
+    ) -> AgentExecutor:
         """
         Build LangChain agent with retrieval tool for a specific client.
 
         Args:
             client_doc_id: Client document ID
+            context_tokens: Optional list receiving the token count of each retrieval
 
         Returns:
             Configured AgentExecutor
         """
         # Create retrieval tool
-        retrieval_tool = self._create_retrieval_tool(client_doc_id)
+        retrieval_tool = self._create_retrieval_tool(client_doc_id, context_tokens)
 
         # System prompt for the agent (ReAct format)
         system_prompt = PromptTemplate.from_template(
@@ -89,7 +177,7 @@ class LegalRAGAgent:
 
 CRITICAL RULES:
 1. ALWAYS use the document_retrieval tool FIRST before answering any question
-2. MANDATORY citation format: [filename, location] where location is "p.X" for pages or "para.X" for paragraphs
+2. MANDATORY citation format: [filename, location] where location is "p.X" for pages, "para.X" for paragraphs, "line.X" for transcript lines or "t.HH:MM:SS" for transcript timestamps
 3. Client-scoped access only - you can ONLY access documents for client doc_id: {client_doc_id}
 4. NEVER fabricate information or citations - only cite what you retrieve
 5. If information is not found in the documents, clearly state that
@@ -140,6 +228,7 @@ Thought: {agent_scratchpad}"""
 
         return agent_executor
 
+    @profiled("agent.query")
     def query(self, question: str, client_doc_id: str) -> Dict[str, Any]:
         """
         Process query and return answer with citations.
@@ -149,14 +238,22 @@ Thought: {agent_scratchpad}"""
             client_doc_id: Client document ID
 
         Returns:
-            Dictionary with answer and citations
+            Dictionary with answer, citations and retrieved context tokens
         """
         try:
             # Create agent for this client
-            agent = self.create_agent_for_client(client_doc_id)
+            context_tokens: List[int] = []
+            agent = self.create_agent_for_client(client_doc_id, context_tokens)
 
             # Execute query
-            result = agent.invoke({"input": question, "client_doc_id": client_doc_id})
+            metrics_handler = QueryMetricsHandler(settings.OLLAMA_MODEL)
+            with timed(QUERY_STAGE_SECONDS, "agent"):
+                result = agent.invoke(
+                    {"input": question, "client_doc_id": client_doc_id},
+                    config={"callbacks": [metrics_handler]},
+                )
+            AGENT_ITERATIONS.observe(metrics_handler.llm_calls)
+            CONTEXT_TOKENS.observe(sum(context_tokens))
 
             answer = result.get("output", "")
 
@@ -167,12 +264,98 @@ Thought: {agent_scratchpad}"""
                 "answer": answer,
                 "citations": citations,
                 "client_doc_id": client_doc_id,
+                "context_tokens": sum(context_tokens),
             }
 
         except Exception as e:
             logger.error(f"Error processing query: {e}")
             raise
 
+    def answer_from_context(
+        self, question: str, client_doc_id: str, context: str
+    ) -> Dict[str, Any]:
+        """
+        Answer a question from already retrieved passages with one LLM call.
+
+        Args:
+            question: User question
+            client_doc_id: Client document ID
+            context: Packed passages with citation headers
+
+        Returns:
+            Dictionary with answer and citations
+        """
+        prompt = CONTEXT_ANSWER_PROMPT.format(
+            client_doc_id=client_doc_id, context=context, question=question
+        )
+        metrics_handler = QueryMetricsHandler(settings.OLLAMA_MODEL)
+        message = self.llm.invoke(prompt, config={"callbacks": [metrics_handler]})
+        answer = str(message.content).strip()
+        return {
+            "answer": answer,
+            "citations": self._extract_citations(answer),
+            "client_doc_id": client_doc_id,
+        }
+
+    @profiled("agent.query_in_session")
+    def query_in_session(self, question: str, session: ConversationSession) -> Dict[str, Any]:
+        """
+        Answer a question within a conversation session.
+
+        Passages are retrieved as usual, but only those not already in the
+        conversation are added, within the context token budget. The prompt
+        is the conversation so far plus the new message, so Ollama reuses
+        the cached prefix and prefills only the new tokens.
+
+        Args:
+            question: User question
+            session: Session holding the conversation
+
+        Returns:
+            Dictionary with answer, citations and the tokens of new passages
+        """
+        with session.lock:
+            docs = session.new_passages(
+                self.retriever.retrieve(question, session.client_doc_id)
+            )
+            packed = self.packer.pack(docs)
+            if packed.passages:
+                content = f"Passages:\n{packed.text}\n\nQuestion: {question}"
+            else:
+                content = f"No new passages; use the passages above.\n\nQuestion: {question}"
+
+            messages: List[BaseMessage] = [
+                SystemMessage(SESSION_SYSTEM_PROMPT.format(client_doc_id=session.client_doc_id))
+            ]
+            for turn in session.turns:
+                messages.extend([HumanMessage(turn.content), AIMessage(turn.answer)])
+            messages.append(HumanMessage(content))
+
+            metrics_handler = QueryMetricsHandler(settings.OLLAMA_MODEL)
+            with timed(QUERY_STAGE_SECONDS, "agent"):
+                message = self.llm.invoke(messages, config={"callbacks": [metrics_handler]})
+            answer = str(message.content).strip()
+            CONTEXT_TOKENS.observe(packed.tokens)
+
+            dropped = session.add_turn(
+                SessionTurn(
+                    content=content,
+                    answer=answer,
+                    # Passages cut or left out by the budget are sent whole later
+                    passages=[passage_key(docs[position]) for position in packed.included],
+                    tokens=count_tokens(content) + count_tokens(answer),
+                )
+            )
+            if dropped:
+                logger.info(f"Session {session.id}: dropped {dropped} oldest turns")
+
+        return {
+            "answer": answer,
+            "citations": self._extract_citations(answer),
+            "client_doc_id": session.client_doc_id,
+            "context_tokens": packed.tokens,
+        }
+
     def _extract_citations(self, answer: str) -> List[Citation]:
         """
         Extract citations from answer text.
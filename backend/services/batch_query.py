@@ -0,0 +1,169 @@
+"""Batched answering of question lists for one client."""
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from config import settings
+from services.context_packer import PackedContext
+from utils.metrics import CONTEXT_TOKENS
+
+if TYPE_CHECKING:
+    from services.agent import LegalRAGAgent
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(question: str) -> str:
+    """Key under which repeated questions share one answer."""
+    return " ".join(question.lower().split())
+
+
+@dataclass
+class BatchPlan:
+    """Distinct questions of a batch with their packed passages."""
+
+    questions: List[str]
+    client_doc_id: str
+    # Request positions of each distinct question, by normalized text
+    positions: Dict[str, List[int]] = field(default_factory=dict)
+    contexts: List[Tuple[str, PackedContext]] = field(default_factory=list)
+    shared_contexts: int = 0
+
+
+class BatchQueryRunner:
+    """
+    Answers a list of questions about one client's documents.
+
+    Review questionnaires send the same 20-50 questions for every client.
+    Instead of one agent run per question, the runner embeds all distinct
+    questions in one request, runs the client-scoped searches concurrently
+    and answers each question with one LLM call over its packed passages.
+    Repeated questions are answered once, and questions that retrieve the
+    same passages share one packed context, so their prompts share a prefix
+    Ollama can reuse. At most ``generation_concurrency`` LLM calls run at
+    a time; results are yielded as they finish.
+    """
+
+    def __init__(
+        self,
+        agent: "LegalRAGAgent",
+        generation_concurrency: Optional[int] = None,
+        search_workers: Optional[int] = None,
+    ):
+        """
+        Initialize batch query runner.
+
+        Args:
+            agent: LegalRAGAgent providing the retriever, packer and LLM
+            generation_concurrency: Concurrent LLM calls (defaults to
+                QUERY_BATCH_GENERATION_CONCURRENCY)
+            search_workers: Concurrent vector searches (defaults to
+                QUERY_BATCH_SEARCH_WORKERS)
+        """
+        self.agent = agent
+        self.generation_concurrency = max(
+            1, generation_concurrency or settings.QUERY_BATCH_GENERATION_CONCURRENCY
+        )
+        self.search_workers = max(1, search_workers or settings.QUERY_BATCH_SEARCH_WORKERS)
+
+    def retrieve(self, questions: List[str], client_doc_id: str) -> BatchPlan:
+        """
+        Retrieve and pack the passages of every distinct question.
+
+        Args:
+            questions: Questions in request order
+            client_doc_id: Client document ID
+
+        Returns:
+            BatchPlan to pass to ``generate``
+        """
+        plan = BatchPlan(questions=list(questions), client_doc_id=client_doc_id)
+        for index, question in enumerate(questions):
+            plan.positions.setdefault(_normalize(question), []).append(index)
+        unique = [questions[indexes[0]] for indexes in plan.positions.values()]
+
+        embeddings = self.agent.vector_store.embed_queries(unique)
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.search_workers, len(unique))),
+            thread_name_prefix="batch-search",
+        ) as searcher:
+            results = list(
+                searcher.map(
+                    lambda pair: self.agent.retriever.retrieve(
+                        pair[0], client_doc_id, query_embedding=pair[1]
+                    ),
+                    zip(unique, embeddings),
+                )
+            )
+
+        # Questions retrieving the same passages share one packed context
+        packed: Dict[Tuple, PackedContext] = {}
+        for question, docs in zip(unique, results):
+            key = tuple(
+                (doc.metadata.get("chunk_id"), tuple(doc.metadata.get("chunk_ids", ())))
+                for doc in docs
+            )
+            if key not in packed:
+                packed[key] = self.agent.packer.pack(docs)
+            plan.contexts.append((question, packed[key]))
+        plan.shared_contexts = len(unique) - len(packed)
+        # Generate questions sharing a context back to back, while its prefix is cached
+        first_use = {id(context): order for order, context in enumerate(packed.values())}
+        plan.contexts.sort(key=lambda item: first_use[id(item[1])])
+        return plan
+
+    def generate(self, plan: BatchPlan) -> Iterator[Dict[str, Any]]:
+        """
+        Answer the planned questions, yielding results as they complete.
+
+        Args:
+            plan: Result of ``retrieve``
+
+        Yields:
+            Dictionaries with index, question, and answer, citations and
+            context_tokens, or error
+        """
+        started = time.monotonic()
+        generator = ThreadPoolExecutor(
+            max_workers=self.generation_concurrency, thread_name_prefix="batch-generate"
+        )
+        try:
+            pending: Dict[Future, Tuple[str, PackedContext]] = {
+                generator.submit(
+                    self.agent.answer_from_context, question, plan.client_doc_id, context.text
+                ): (question, context)
+                for question, context in plan.contexts
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    question, context = pending.pop(future)
+                    CONTEXT_TOKENS.observe(context.tokens)
+                    try:
+                        answer = future.result()
+                        result = {
+                            "answer": answer["answer"],
+                            "citations": answer["citations"],
+                            "context_tokens": context.tokens,
+                        }
+                    except Exception as e:
+                        logger.error(f"Error answering batch question: {e}")
+                        result = {"error": str(e)}
+                    for index in plan.positions[_normalize(question)]:
+                        yield {"index": index, "question": plan.questions[index], **result}
+        finally:
+            # Drops queued generations when the client goes away mid-stream
+            generator.shutdown(wait=False, cancel_futures=True)
+
+        logger.info(
+            f"Answered {len(plan.questions)} questions ({len(plan.contexts)} distinct, "
+            f"{plan.shared_contexts} sharing a context) for {plan.client_doc_id} "
+            f"in {time.monotonic() - started:.1f}s"
+        )
+
+    def run(self, questions: List[str], client_doc_id: str) -> Iterator[Dict[str, Any]]:
+        """Retrieve, then answer; see ``retrieve`` and ``generate``."""
+        return self.generate(self.retrieve(questions, client_doc_id))
@@ -0,0 +1,172 @@
+"""Token-budgeted packing of retrieved passages into the agent prompt."""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from langchain_core.documents import Document
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Separator between passages in the tool output
+PASSAGE_SEPARATOR = "\n\n---\n\n"
+
+# A truncated passage must keep at least this many tokens of text to be included
+MIN_PASSAGE_TOKENS = 24
+
+_SENTENCE_END = re.compile(r"(?<=[.!?;:])\s+")
+
+_counter: Optional[Callable[[str], int]] = None
+_counter_lock = threading.Lock()
+
+
+def _estimate_tokens(text: str) -> int:
+    """Approximate token count (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def _load_counter() -> Callable[[str], int]:
+    """tiktoken encoder for CONTEXT_TOKENIZER, or the estimate if unavailable."""
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding(settings.CONTEXT_TOKENIZER)
+        return lambda text: len(encoding.encode(text, disallowed_special=()))
+    except Exception as e:
+        # No package, or the encoding file cannot be downloaded (offline)
+        logger.warning(
+            f"tiktoken encoding {settings.CONTEXT_TOKENIZER} unavailable ({e}); "
+            "estimating tokens from text length"
+        )
+        return _estimate_tokens
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens in a text.
+
+    Uses the tiktoken encoding CONTEXT_TOKENIZER, loaded on first use. The
+    LLM's own tokenizer differs somewhat, so budgets should keep headroom.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Number of tokens
+    """
+    global _counter
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                _counter = _load_counter()
+    return _counter(text)
+
+
+@dataclass
+class PackedContext:
+    """Passages packed into a token budget."""
+
+    text: str
+    tokens: int
+    passages: int
+    truncated: int = 0
+    dropped: int = 0
+    # Positions (in the packed docs) of the passages included whole, and of
+    # those included cut at a sentence
+    included: List[int] = field(default_factory=list)
+    truncated_positions: List[int] = field(default_factory=list)
+
+
+class ContextPacker:
+    """
+    Fills a token budget with retrieved passages, best first.
+
+    Every passage is preceded by its ``[filename, location]`` citation
+    header. A passage that does not fit whole is cut after its last sentence
+    that fits, header kept; if not even that leaves MIN_PASSAGE_TOKENS of
+    text, it is dropped and the next (shorter) passages are tried.
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        counter: Optional[Callable[[str], int]] = None,
+    ):
+        """
+        Initialize context packer.
+
+        Args:
+            max_tokens: Token budget of one retrieval result, 0 for no limit
+                (defaults to CONTEXT_MAX_TOKENS)
+            counter: Token counting function (defaults to count_tokens)
+        """
+        self.max_tokens = settings.CONTEXT_MAX_TOKENS if max_tokens is None else max_tokens
+        self.count = counter or count_tokens
+
+    def pack(self, docs: List[Document]) -> PackedContext:
+        """
+        Pack passages into the budget.
+
+        Args:
+            docs: Passages, most valuable first
+
+        Returns:
+            PackedContext with the tool output text and its token count
+        """
+        blocks: List[str] = []
+        included: List[int] = []
+        truncated_positions: List[int] = []
+        used = dropped = 0
+        separator_tokens = self.count(PASSAGE_SEPARATOR)
+
+        for position, doc in enumerate(docs):
+            header = f"[{doc.metadata.get('source', 'Unknown')}, {doc.metadata.get('location', '')}]\n"
+            block = header + doc.page_content
+            cost = self.count(block) + (separator_tokens if blocks else 0)
+            remaining = self.max_tokens - used
+
+            if not self.max_tokens or cost <= remaining:
+                blocks.append(block)
+                included.append(position)
+                used += cost
+                continue
+
+            overhead = self.count(header) + (separator_tokens if blocks else 0)
+            text = self._truncate(doc.page_content, remaining - overhead)
+            if text is None:
+                dropped += 1
+                continue
+            blocks.append(header + text)
+            truncated_positions.append(position)
+            used += overhead + self.count(text)
+
+        return PackedContext(
+            text=PASSAGE_SEPARATOR.join(blocks),
+            tokens=used,
+            passages=len(blocks),
+            truncated=len(truncated_positions),
+            dropped=dropped,
+            included=included,
+            truncated_positions=truncated_positions,
+        )
+
+    def _truncate(self, text: str, budget: int) -> Optional[str]:
+        """Leading whole sentences of text within budget, None if too little fits."""
+        if budget < MIN_PASSAGE_TOKENS:
+            return None
+        ends = [match.start() for match in _SENTENCE_END.finditer(text)]
+        # Longest prefix ending at a sentence boundary that fits (binary search)
+        low, high, kept = 0, len(ends) - 1, None
+        while low <= high:
+            middle = (low + high) // 2
+            prefix = text[:ends[middle]]
+            if self.count(prefix) <= budget:
+                kept, low = prefix, middle + 1
+            else:
+                high = middle - 1
+        if kept is None or self.count(kept) < MIN_PASSAGE_TOKENS:
+            return None
+        return kept
@@ -0,0 +1,111 @@
+"""Deletion of clients and client files across Neo4j, Storage and Postgres."""
+
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+from services.supabase_service import page_index_path
+
+if TYPE_CHECKING:
+    from services.neo4j_store import Neo4jVectorStore
+    from services.supabase_service import SupabaseService
+
+logger = logging.getLogger(__name__)
+
+
+class ClientDeleter:
+    """
+    Removes a client's data from every backend.
+
+    Chunks go first, so the client's documents stop being retrievable right
+    away. Stored files and page sidecars go next, and the Postgres records
+    go last. A failed run leaves the client record in place, so the deletion
+    can be retried from the start; every step tolerates data that is already
+    gone.
+    """
+
+    def __init__(self, supabase_service: "SupabaseService", vector_store: "Neo4jVectorStore"):
+        """
+        Initialize client deleter.
+
+        Args:
+            supabase_service: SupabaseService for storage objects and records
+            vector_store: Neo4jVectorStore holding the client's chunks
+        """
+        self.supabase_service = supabase_service
+        self.vector_store = vector_store
+
+    def delete_client(
+        self, doc_id: str, on_progress: Optional[Callable[..., None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Delete a client's chunks, stored files and records.
+
+        Args:
+            doc_id: Client document ID
+            on_progress: Optional callback receiving progress fields as keyword
+                arguments (stage, chunks_deleted, storage_objects_deleted)
+
+        Returns:
+            Counts of deleted chunks and storage objects
+        """
+        progress = on_progress or (lambda **fields: None)
+
+        progress(stage="neo4j", chunks_deleted=0)
+        chunks_deleted = self.vector_store.delete_client_documents(
+            doc_id, on_progress=lambda total: progress(chunks_deleted=total)
+        )
+
+        progress(stage="storage", storage_objects_deleted=0)
+        # The manifest catches objects a storage listing might miss, and vice versa
+        paths = set(self.supabase_service.list_storage_paths(doc_id))
+        for record in self.supabase_service.list_client_files(doc_id):
+            paths.add(record["storage_path"])
+            if record.get("page_offsets"):
+                paths.add(page_index_path(doc_id, record["filename"]))
+        storage_objects_deleted = (
+            self.supabase_service.delete_files(sorted(paths)) if paths else 0
+        )
+        progress(storage_objects_deleted=storage_objects_deleted)
+
+        progress(stage="postgres")
+        self.supabase_service.delete_client(doc_id)
+        progress(stage="done")
+
+        logger.info(
+            f"Deleted client {doc_id}: {chunks_deleted} chunks, "
+            f"{storage_objects_deleted} storage objects"
+        )
+        return {
+            "client_doc_id": doc_id,
+            "chunks_deleted": chunks_deleted,
+            "storage_objects_deleted": storage_objects_deleted,
+        }
+
+    def delete_file(self, doc_id: str, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        Delete one file's chunks, stored object, page sidecar and manifest record.
+
+        Args:
+            doc_id: Client document ID
+            filename: Stored (sanitized) filename
+
+        Returns:
+            Counts of deleted chunks and storage objects, or None if the
+            client has no such file
+        """
+        record = self.supabase_service.get_file_manifest(doc_id, filename)
+        if not record:
+            return None
+
+        chunks_deleted = self.vector_store.delete_file_documents(doc_id, filename)
+        paths = [record["storage_path"]]
+        if record.get("page_offsets"):
+            paths.append(page_index_path(doc_id, filename))
+        storage_objects_deleted = self.supabase_service.delete_files(paths)
+        self.supabase_service.delete_file_manifest(doc_id, filename)
+
+        logger.info(f"Deleted {filename} of client {doc_id}: {chunks_deleted} chunks")
+        return {
+            "filename": filename,
+            "chunks_deleted": chunks_deleted,
+            "storage_objects_deleted": storage_objects_deleted,
+        }
@@ -1,15 +1,19 @@
-"""Document processing service for PDF and DOCX files."""
+"""Document processing service for PDF, DOCX and transcript files."""
 
+import io
 import logging
 import tempfile
+import time
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from pathlib import Path
 import PyPDF2
 from docx import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-import tiktoken
 from config import settings
+from utils.metrics import INGEST_STAGE_SECONDS, observe_stage
+from utils.profiling import profiled
+from services.transcript_reader import TranscriptReader, TRANSCRIPT_EXTENSIONS
 
 logger = logging.getLogger(__name__)
 
@@ -19,37 +23,45 @@ class DocumentProcessor:
 
     def __init__(self):
         """Initialize document processor with text splitter."""
-        # Initialize tokenizer for chunking
-        encoding = tiktoken.get_encoding("cl100k_base")
-
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=settings.CHUNK_SIZE,
             chunk_overlap=settings.CHUNK_OVERLAP,
             length_function=len,
             is_separator_regex=False,
         )
+        self.transcript_reader = TranscriptReader(max_chars=settings.CHUNK_SIZE)
 
-    def extract_text_from_pdf(self, file_path: str) -> List[Dict[str, Any]]:
+    def extract_text_from_pdf(
+        self, file_path: str, stats: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Extract text from PDF with page numbers.
 
         Args:
             file_path: Path to PDF file
+            stats: Optional dictionary that receives the total "page_count" and
+                the text of every page (blank pages included) as "pages"
 
         Returns:
             List of dictionaries with text and page number
         """
         chunks = []
+        pages = []
 
         try:
             with open(file_path, "rb") as file:
                 pdf_reader = PyPDF2.PdfReader(file)
 
                 for page_num, page in enumerate(pdf_reader.pages, start=1):
-                    text = page.extract_text()
+                    text = page.extract_text() or ""
+                    pages.append(text)
                     if text.strip():
                         chunks.append({"text": text, "page": page_num, "type": "pdf"})
 
+                if stats is not None:
+                    stats["page_count"] = len(pdf_reader.pages)
+                    stats["pages"] = pages
+
                 logger.info(f"Extracted {len(chunks)} pages from PDF: {file_path}")
                 return chunks
 
@@ -84,8 +96,45 @@ class DocumentProcessor:
             logger.error(f"Error extracting DOCX {file_path}: {e}")
             raise
 
+    def extract_text_from_transcript(self, file_path: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream text segments from a TXT/MD/VTT/SRT transcript.
+
+        The file is read line by line and segments are yielded as soon as a
+        speaker turn or timestamp boundary closes them, so memory use does not
+        grow with the size of the transcript.
+
+        Args:
+            file_path: Path to transcript file
+
+        Yields:
+            Dictionaries with text, starting line number and optional timestamp
+        """
+        file_ext = Path(file_path).suffix.lower()
+        segment_count = 0
+
+        try:
+            with open(file_path, "r", encoding="utf-8-sig", errors="replace") as file:
+                for segment in self.transcript_reader.iter_segments(file, file_ext):
+                    segment_count += 1
+                    yield segment
+
+            logger.info(
+                f"Extracted {segment_count} segments from transcript: {file_path}"
+            )
+
+        except Exception as e:
+            logger.error(f"Error extracting transcript {file_path}: {e}")
+            raise
+
+    @profiled("document_processor.process_document")
     def process_document(
-        self, file_path: str, source_filename: str, client_doc_id: str, client_name: str
+        self,
+        file_path: str,
+        source_filename: str,
+        client_doc_id: str,
+        client_name: str,
+        stats: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Process document and chunk with metadata.
@@ -95,29 +144,66 @@ class DocumentProcessor:
             source_filename: Original filename
             client_doc_id: Client document ID
             client_name: Client name
+            stats: Optional dictionary that receives document stats (page_count,
+                pages, chunk_seconds)
 
         Returns:
             List of chunk dictionaries with metadata
         """
+        processed_chunks = list(
+            self.iter_document_chunks(
+                file_path, source_filename, client_doc_id, client_name, stats
+            )
+        )
+
+        logger.info(f"Processed {len(processed_chunks)} chunks from {source_filename}")
+        return processed_chunks
+
+    def iter_document_chunks(
+        self,
+        file_path: str,
+        source_filename: str,
+        client_doc_id: str,
+        client_name: str,
+        stats: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily chunk a document with metadata.
+
+        Args:
+            file_path: Path to document file
+            source_filename: Original filename
+            client_doc_id: Client document ID
+            client_name: Client name
+            stats: Optional dictionary that receives document stats (page_count,
+                pages, chunk_seconds)
+
+        Yields:
+            Chunk dictionaries with metadata
+        """
         file_ext = Path(file_path).suffix.lower()
 
         # Extract text based on file type
         if file_ext == ".pdf":
-            raw_chunks = self.extract_text_from_pdf(file_path)
+            raw_chunks = self.extract_text_from_pdf(file_path, stats)
         elif file_ext in [".docx", ".doc"]:
             raw_chunks = self.extract_text_from_docx(file_path)
+        elif file_ext in TRANSCRIPT_EXTENSIONS:
+            raw_chunks = self.extract_text_from_transcript(file_path)
         else:
             raise ValueError(f"Unsupported file type: {file_ext}")
 
         # Process and chunk the extracted text
-        processed_chunks = []
         chunk_id_counter = 0
+        chunk_seconds = 0.0
 
         for raw_chunk in raw_chunks:
             text = raw_chunk["text"]
 
             # Split text into smaller chunks if needed
+            started = time.perf_counter()
             text_chunks = self.text_splitter.split_text(text)
+            chunk_seconds += time.perf_counter() - started
 
             for chunk_text in text_chunks:
                 chunk_id_counter += 1
@@ -126,25 +212,35 @@ class DocumentProcessor:
                 # Determine location metadata
                 if raw_chunk.get("type") == "pdf":
                     location = f"p.{raw_chunk['page']}"
+                elif raw_chunk.get("type") == "transcript":
+                    if raw_chunk.get("timestamp"):
+                        location = f"t.{raw_chunk['timestamp']}"
+                    else:
+                        location = f"line.{raw_chunk['line']}"
                 else:
                     location = f"para.{raw_chunk['paragraph']}"
 
-                processed_chunks.append(
-                    {
-                        "text": chunk_text,
-                        "source": source_filename,
-                        "location": location,
-                        "chunk_id": chunk_id,
-                        "client_doc_id": client_doc_id,
-                        "client_name": client_name,
-                    }
-                )
+                yield {
+                    "text": chunk_text,
+                    "source": source_filename,
+                    "location": location,
+                    "chunk_id": chunk_id,
+                    "client_doc_id": client_doc_id,
+                    "client_name": client_name,
+                }
 
-        logger.info(f"Processed {len(processed_chunks)} chunks from {source_filename}")
-        return processed_chunks
+        # Splitting is interleaved with extraction; report it as its own stage
+        observe_stage(INGEST_STAGE_SECONDS, "chunk", chunk_seconds)
+        if stats is not None:
+            stats["chunk_seconds"] = chunk_seconds
 
     def process_file_bytes(
-        self, file_bytes: bytes, filename: str, client_doc_id: str, client_name: str
+        self,
+        file_bytes: bytes,
+        filename: str,
+        client_doc_id: str,
+        client_name: str,
+        stats: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Process file from bytes (for uploaded files).
@@ -154,6 +250,8 @@ class DocumentProcessor:
             filename: Original filename
             client_doc_id: Client document ID
             client_name: Client name
+            stats: Optional dictionary that receives document stats (page_count,
+                pages, chunk_seconds)
 
         Returns:
             List of chunk dictionaries with metadata
@@ -167,10 +265,57 @@ class DocumentProcessor:
 
         try:
             chunks = self.process_document(
-                tmp_path, filename, client_doc_id, client_name
+                tmp_path, filename, client_doc_id, client_name, stats
             )
             return chunks
         finally:
             # Clean up temporary file
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
+
+    @staticmethod
+    def build_page_index(pages: List[str]) -> Tuple[bytes, List[List[int]]]:
+        """
+        Concatenate page texts into one blob with per-page byte offsets.
+
+        Page n (1-based) is ``blob[offsets[n - 1][0]:offsets[n - 1][1]]``, so a
+        single page can later be served with one byte-range read.
+
+        Args:
+            pages: Text of every page, in order
+
+        Returns:
+            Tuple of (UTF-8 blob, list of [start, end) byte offsets)
+        """
+        buffer = io.BytesIO()
+        offsets = []
+        for text in pages:
+            start = buffer.tell()
+            buffer.write(text.encode("utf-8"))
+            offsets.append([start, buffer.tell()])
+        return buffer.getvalue(), offsets
+
+    @staticmethod
+    def extract_pdf_page(pdf_bytes: bytes, page_number: int) -> bytes:
+        """
+        Build a single-page PDF from one page of a document.
+
+        Only the page tree and the requested page are touched; other pages'
+        content streams are not parsed.
+
+        Args:
+            pdf_bytes: Original PDF content
+            page_number: 1-based page number
+
+        Returns:
+            Single-page PDF as bytes
+        """
+        reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+        if not 1 <= page_number <= len(reader.pages):
+            raise ValueError(f"Page {page_number} out of range (1-{len(reader.pages)})")
+
+        writer = PyPDF2.PdfWriter()
+        writer.add_page(reader.pages[page_number - 1])
+        output = io.BytesIO()
+        writer.write(output)
+        return output.getvalue()
@@ -0,0 +1,158 @@
+"""Micro-batching of embedding requests from concurrent callers."""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Embedder = Callable[[List[str]], List[List[float]]]
+
+# Wakes the flush thread for shutdown
+_STOP = object()
+
+
+class EmbeddingBatcher:
+    """
+    Coalesce embedding requests from many threads into batched calls.
+
+    Callers submit lists of texts; a background thread gathers whatever
+    arrives within ``max_wait`` seconds (up to ``max_batch`` texts) and sends
+    it to the embedding backend as one request. Many small files or queries
+    then cost one round trip instead of one each. Requests larger than
+    ``max_batch`` are split across consecutive batches.
+    """
+
+    def __init__(self, embed: Embedder, max_batch: int = 256, max_wait: float = 0.02):
+        """
+        Initialize embedding batcher.
+
+        Args:
+            embed: Function embedding a list of texts (e.g. embed_documents)
+            max_batch: Most texts sent in one embedding request
+            max_wait: Seconds to wait for more texts after the first arrives
+        """
+        self.embed_fn = embed
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self.batches = 0
+        self.texts = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, texts: List[str]) -> "Future[List[List[float]]]":
+        """
+        Queue texts for embedding.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Future resolving to one vector per text, in order
+        """
+        future: "Future[List[List[float]]]" = Future()
+        if not texts:
+            future.set_result([])
+            return future
+        self._ensure_started()
+        self._queue.put((list(texts), future))
+        return future
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, blocking until their batch (or batches) complete."""
+        return self.submit(texts).result()
+
+    def close(self) -> None:
+        """Flush queued requests and stop the background thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Batches sent, texts embedded and mean texts per batch."""
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "mean_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+        }
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Collect requests into batches and embed them until stopped."""
+        # (texts, future, offset into texts) still to be embedded
+        carry: List[Tuple[List[str], Future, int]] = []
+        # Vectors gathered so far for requests split across batches
+        partial: Dict[Future, List[List[float]]] = {}
+        stopping = False
+
+        while not stopping or carry:
+            pending, carry = carry, []
+            size = sum(len(texts) - offset for texts, _, offset in pending)
+            # Carried-over texts have already waited; only take what is queued
+            deadline = time.monotonic() if pending else None
+
+            while size < self.max_batch and not stopping:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if request is _STOP:
+                    stopping = True
+                    break
+                texts, future = request
+                pending.append((texts, future, 0))
+                size += len(texts)
+                if deadline is None:
+                    deadline = time.monotonic() + self.max_wait
+
+            if not pending:
+                continue
+
+            # Take up to max_batch texts, carrying the rest of a split request over
+            batch: List[str] = []
+            members: List[Tuple[List[str], Future, int, int]] = []
+            for texts, future, offset in pending:
+                room = self.max_batch - len(batch)
+                if room <= 0:
+                    carry.append((texts, future, offset))
+                    continue
+                end = min(len(texts), offset + room)
+                batch.extend(texts[offset:end])
+                members.append((texts, future, offset, end))
+                if end < len(texts):
+                    carry.append((texts, future, end))
+
+            try:
+                vectors = self.embed_fn(batch)
+            except Exception as e:
+                logger.error(f"Batched embedding of {len(batch)} texts failed: {e}")
+                failed = {future for _, future, _, _ in members}
+                for future in failed:
+                    partial.pop(future, None)
+                    future.set_exception(e)
+                carry = [entry for entry in carry if entry[1] not in failed]
+                continue
+
+            self.batches += 1
+            self.texts += len(batch)
+            position = 0
+            for texts, future, offset, end in members:
+                gathered = partial.setdefault(future, [])
+                gathered.extend(vectors[position:position + end - offset])
+                position += end - offset
+                if end == len(texts):
+                    future.set_result(partial.pop(future))
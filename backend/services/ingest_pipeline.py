@@ -0,0 +1,492 @@
+"""Staged ingestion pipeline: storage upload, parse, embed and Neo4j write."""
+
+import asyncio
+import inspect
+import logging
+import os
+import time
+from concurrent.futures import Executor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from config import settings
+from utils.helpers import compute_file_hash
+from utils.metrics import (
+    INGEST_ITEMS,
+    INGEST_QUEUE_DEPTH,
+    INGEST_STAGE_SECONDS,
+    observe_stage,
+)
+
+if TYPE_CHECKING:
+    from services.document_processor import DocumentProcessor
+    from services.embedding_batcher import EmbeddingBatcher
+    from services.neo4j_store import Neo4jVectorStore
+    from services.supabase_service import SupabaseService
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("upload", "parse", "embed", "write")
+
+# Marks the end of a stage's input queue
+_END = object()
+
+# DocumentProcessor of a parse worker process (see parse_document_file)
+_worker_processor: Optional["DocumentProcessor"] = None
+
+
+def parse_document_file(
+    local_path: str, filename: str, client_doc_id: str, client_name: str
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Parse and chunk one file; runs inside a parse worker process.
+
+    Args:
+        local_path: Path of the file to parse
+        filename: Original filename
+        client_doc_id: Client document ID
+        client_name: Client name
+
+    Returns:
+        Tuple of (chunk dictionaries, document stats)
+    """
+    global _worker_processor
+    if _worker_processor is None:
+        from services.document_processor import DocumentProcessor
+
+        _worker_processor = DocumentProcessor()
+    doc_stats: Dict[str, Any] = {}
+    chunks = _worker_processor.process_document(
+        local_path, filename, client_doc_id, client_name, doc_stats
+    )
+    return chunks, doc_stats
+
+
+class StageStats:
+    """Per-stage counters used to report utilisation."""
+
+    def __init__(self, name: str, workers: int):
+        """
+        Initialize stage stats.
+
+        Args:
+            name: Stage name
+            workers: Number of concurrent workers in the stage
+        """
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+
+    def to_dict(self, wall_seconds: float) -> Dict[str, Any]:
+        """
+        Summarize stage stats.
+
+        Args:
+            wall_seconds: Wall-clock duration of the whole pipeline run
+
+        Returns:
+            Dictionary with counts, busy time and utilisation (0-1)
+        """
+        capacity = wall_seconds * self.workers
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 4),
+            "utilisation": round(self.busy_seconds / capacity, 4) if capacity else 0.0,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+class IngestPipeline:
+    """
+    Bounded-queue pipeline that overlaps the ingestion stages across files.
+
+    Each file is an item dictionary that flows through upload -> parse ->
+    embed -> write. Stages are connected by bounded queues, so a fast stage
+    blocks (backpressure) instead of buffering unbounded work, and file N+1
+    can be parsed while file N is being embedded. Blocking stage work runs in
+    worker threads.
+
+    Item dictionaries carry ``filename``, ``client_doc_id``, ``client_name``
+    and either ``file_bytes`` or ``local_path``. The pipeline fills in
+    ``status``, ``message``, ``chunk_count`` and per-stage ``timings``. Items
+    fed in with a status other than "pending" (e.g. "rejected") skip every
+    stage and are returned as-is.
+
+    Every stored file gets a ``client_files`` manifest record: "processing"
+    once uploaded, then "indexed" or "error" with hash, size, page/chunk
+    counts and parse/embed timings. A file whose content hash matches an
+    already indexed manifest record is reported as "skipped"; a changed file
+    replaces its previous chunks, which are deleted after the new ones are
+    written.
+
+    For bulk loads, parsing of local files can be moved to a process pool
+    (``parse_executor``) and embedding requests of concurrent files can be
+    coalesced by an ``EmbeddingBatcher``. Chunks are written to Neo4j in
+    batches of ``INGEST_WRITE_BATCH_SIZE``.
+    """
+
+    def __init__(
+        self,
+        supabase_service: "SupabaseService",
+        document_processor: "DocumentProcessor",
+        vector_store: "Neo4jVectorStore",
+        stage_workers: Optional[Dict[str, int]] = None,
+        queue_size: Optional[int] = None,
+        parse_executor: Optional[Executor] = None,
+        embed_batcher: Optional["EmbeddingBatcher"] = None,
+        write_batch_size: Optional[int] = None,
+    ):
+        """
+        Initialize ingestion pipeline.
+
+        Args:
+            supabase_service: SupabaseService for storage uploads
+            document_processor: DocumentProcessor for parsing and chunking
+            vector_store: Neo4jVectorStore for embedding and writing chunks
+            stage_workers: Optional per-stage worker counts overriding settings
+            queue_size: Optional bound for each inter-stage queue
+            parse_executor: Optional executor (e.g. a process pool) that parses
+                local files with parse_document_file
+            embed_batcher: Optional batcher shared by the embed workers
+            write_batch_size: Chunks per Neo4j write (defaults to
+                INGEST_WRITE_BATCH_SIZE)
+        """
+        self.supabase_service = supabase_service
+        self.document_processor = document_processor
+        self.vector_store = vector_store
+        self.stage_workers = {
+            "upload": settings.INGEST_UPLOAD_WORKERS,
+            "parse": settings.INGEST_PARSE_WORKERS,
+            "embed": settings.INGEST_EMBED_WORKERS,
+            "write": settings.INGEST_WRITE_WORKERS,
+        }
+        self.stage_workers.update(stage_workers or {})
+        self.queue_size = queue_size or settings.INGEST_QUEUE_SIZE
+        self.parse_executor = parse_executor
+        self.embed_batcher = embed_batcher
+        self.write_batch_size = write_batch_size or settings.INGEST_WRITE_BATCH_SIZE
+
+    # Stage work (blocking; runs in worker threads)
+
+    def _upload(self, item: Dict[str, Any]) -> None:
+        """Hash the item's file, skip it if unchanged, else upload it to Storage."""
+        data = item.get("local_path") or item.get("file_bytes")
+        item["file_hash"], item["size_bytes"] = compute_file_hash(data)
+
+        existing = self._get_manifest(item)
+        if existing:
+            if (
+                existing.get("file_hash") == item["file_hash"]
+                and existing.get("status") == "indexed"
+            ):
+                item["status"] = "skipped"
+                item["message"] = "Unchanged since last ingest; already indexed"
+                item["chunk_count"] = existing.get("chunk_count") or 0
+                return
+            item["replaces_existing"] = True
+
+        item["storage_path"] = self.supabase_service.upload_file(
+            data, item["client_doc_id"], item["filename"]
+        )
+        self._record_manifest(item, "processing")
+
+    def _parse(self, item: Dict[str, Any]) -> None:
+        """Parse and chunk the item's file."""
+        doc_stats: Dict[str, Any] = {}
+        if item.get("local_path") and self.parse_executor is not None:
+            # CPU-bound parsing runs in a worker process; this thread just waits
+            chunks, doc_stats = self.parse_executor.submit(
+                parse_document_file,
+                item["local_path"],
+                item["filename"],
+                item["client_doc_id"],
+                item["client_name"],
+            ).result()
+        elif item.get("local_path"):
+            chunks = self.document_processor.process_document(
+                item["local_path"],
+                item["filename"],
+                item["client_doc_id"],
+                item["client_name"],
+                doc_stats,
+            )
+        else:
+            chunks = self.document_processor.process_file_bytes(
+                item["file_bytes"],
+                item["filename"],
+                item["client_doc_id"],
+                item["client_name"],
+                doc_stats,
+            )
+        item["chunks"] = chunks
+        item["page_count"] = doc_stats.get("page_count")
+        item["chunk_seconds"] = doc_stats.get("chunk_seconds", 0.0)
+
+        if doc_stats.get("pages"):
+            # Page-offset index so cited pages can be served without re-parsing
+            blob, offsets = self.document_processor.build_page_index(doc_stats["pages"])
+            self.supabase_service.upload_page_index(
+                blob, item["client_doc_id"], item["filename"]
+            )
+            item["page_offsets"] = offsets
+        # Raw bytes are no longer needed once parsed
+        item.pop("file_bytes", None)
+
+    def _embed(self, item: Dict[str, Any]) -> None:
+        """Generate embeddings for the item's chunks."""
+        # The write re-embeds if the active embedding version changes meanwhile
+        item["embedding_version"] = self.vector_store.active_version.name
+        if not item["chunks"]:
+            item["embeddings"] = []
+        elif self.embed_batcher is not None:
+            item["embeddings"] = self.embed_batcher.embed(
+                [chunk["text"] for chunk in item["chunks"]]
+            )
+        else:
+            item["embeddings"] = self.vector_store.embed_chunks(item["chunks"])
+
+    def _write(self, item: Dict[str, Any]) -> None:
+        """Write the item's embedded chunks to Neo4j."""
+        written: List[str] = []
+        # Bounded write transactions for files with many chunks
+        for start in range(0, len(item["chunks"]), self.write_batch_size):
+            end = start + self.write_batch_size
+            written.extend(
+                self.vector_store.add_embedded_documents_for_client(
+                    item["chunks"][start:end],
+                    item["embeddings"][start:end],
+                    item["client_doc_id"],
+                    item["client_name"],
+                    embedding_version=item["embedding_version"],
+                )
+            )
+        if item.get("replaces_existing"):
+            # Changed file: drop the previous version's chunks only once the
+            # new ones are in, so a failed write leaves the file searchable
+            # (its manifest then records an error and the next run retries)
+            self.vector_store.delete_stale_file_documents(
+                item["client_doc_id"], item["filename"], written
+            )
+        item.pop("embeddings", None)
+        item["chunk_count"] = len(item["chunks"])
+        item["status"] = "processed"
+        item["message"] = f"Successfully processed {len(item['chunks'])} chunks"
+
+    # Manifest bookkeeping (failures are logged, never fatal to ingestion)
+
+    def _get_manifest(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Fetch the item's existing manifest record, if any."""
+        try:
+            return self.supabase_service.get_file_manifest(
+                item["client_doc_id"], item["filename"]
+            )
+        except Exception as e:
+            logger.warning(f"Could not read manifest for {item['filename']}: {e}")
+            return None
+
+    def _record_manifest(self, item: Dict[str, Any], status: str) -> None:
+        """Write the item's manifest record with the given status."""
+        record = {
+            "client_doc_id": item["client_doc_id"],
+            "filename": item["filename"],
+            "storage_path": item.get("storage_path")
+            or f"{item['client_doc_id']}/{item['filename']}",
+            "file_hash": item.get("file_hash"),
+            "size_bytes": item.get("size_bytes"),
+            "status": status,
+        }
+        if status != "processing":
+            timings = item.get("timings", {})
+            record.update(
+                {
+                    "chunk_count": item.get("chunk_count", 0),
+                    "page_count": item.get("page_count"),
+                    "parse_ms": int(timings["parse"] * 1000)
+                    if "parse" in timings
+                    else None,
+                    "embed_ms": int(timings["embed"] * 1000)
+                    if "embed" in timings
+                    else None,
+                    "page_offsets": item.get("page_offsets"),
+                    "error": item.get("message") if status == "error" else None,
+                }
+            )
+
+        try:
+            self.supabase_service.upsert_file_manifest(record)
+        except Exception as e:
+            logger.warning(f"Could not write manifest for {item['filename']}: {e}")
+
+    # Orchestration
+
+    async def run(
+        self,
+        items: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        on_item_done: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        retain_chunks: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Run items through all stages concurrently.
+
+        Args:
+            items: Item dictionaries to ingest; a lazy (async) iterable is only
+                advanced when the first queue has room
+            on_item_done: Optional callback (sync or async) invoked with each
+                item when it leaves the pipeline, successful or not
+            retain_chunks: Keep chunk dictionaries on completed items
+
+        Returns:
+            Dictionary with ``items`` in input order and per-stage ``stats``
+        """
+        stage_funcs = {
+            "upload": self._upload,
+            "parse": self._parse,
+            "embed": self._embed,
+            "write": self._write,
+        }
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in STAGES]
+        done_queue: asyncio.Queue = asyncio.Queue()
+        stats = {
+            name: StageStats(name, max(1, self.stage_workers[name])) for name in STAGES
+        }
+        completed: List[Dict[str, Any]] = []
+        started = time.perf_counter()
+
+        async def stage_worker(index: int) -> None:
+            name = STAGES[index]
+            in_queue = queues[index]
+            out_queue = queues[index + 1] if index + 1 < len(STAGES) else done_queue
+            stage_stats = stats[name]
+            func = stage_funcs[name]
+
+            while True:
+                stage_stats.max_queue_depth = max(
+                    stage_stats.max_queue_depth, in_queue.qsize()
+                )
+                INGEST_QUEUE_DEPTH.set(in_queue.qsize(), stage=name)
+                item = await in_queue.get()
+                if item is _END:
+                    break
+
+                if item["status"] == "pending":
+                    t0 = time.perf_counter()
+                    try:
+                        await asyncio.to_thread(func, item)
+                    except Exception as e:
+                        logger.error(
+                            f"Ingest stage '{name}' failed for {item['filename']}: {e}"
+                        )
+                        item["status"] = "error"
+                        item["message"] = f"Error during {name}: {str(e)}"
+                        item["chunks"] = []
+                        stage_stats.errors += 1
+                    elapsed = time.perf_counter() - t0
+                    stage_stats.busy_seconds += elapsed
+                    stage_stats.items += 1
+                    item["timings"][name] = round(elapsed, 4)
+                    if name == "parse":
+                        # Chunking inside parse is reported as its own stage
+                        elapsed = max(0.0, elapsed - item.get("chunk_seconds", 0.0))
+                    observe_stage(INGEST_STAGE_SECONDS, name, elapsed)
+                    INGEST_ITEMS.inc(
+                        stage=name,
+                        outcome="error" if item["status"] == "error" else "ok",
+                    )
+
+                await out_queue.put(item)
+
+        async def run_stage(index: int) -> None:
+            workers = stats[STAGES[index]].workers
+            await asyncio.gather(*(stage_worker(index) for _ in range(workers)))
+            # All workers saw _END; propagate shutdown downstream
+            if index + 1 < len(STAGES):
+                for _ in range(stats[STAGES[index + 1]].workers):
+                    await queues[index + 1].put(_END)
+            else:
+                await done_queue.put(_END)
+
+        async def feed() -> None:
+            position = 0
+
+            async def put(item: Dict[str, Any]) -> None:
+                nonlocal position
+                item.setdefault("status", "pending")
+                item.setdefault("message", "")
+                item.setdefault("chunks", [])
+                item.setdefault("chunk_count", 0)
+                item.setdefault("timings", {})
+                item["position"] = position
+                position += 1
+                await queues[0].put(item)
+
+            try:
+                if hasattr(items, "__aiter__"):
+                    async for item in items:
+                        await put(item)
+                else:
+                    for item in items:
+                        await put(item)
+            finally:
+                # Always release the workers, even if the source failed
+                for _ in range(stats[STAGES[0]].workers):
+                    await queues[0].put(_END)
+
+        async def drain() -> None:
+            while True:
+                item = await done_queue.get()
+                if item is _END:
+                    break
+                self._cleanup(item)
+                if item.get("storage_path") and item["status"] in ("processed", "error"):
+                    await asyncio.to_thread(
+                        self._record_manifest,
+                        item,
+                        "indexed" if item["status"] == "processed" else "error",
+                    )
+                if not retain_chunks:
+                    item.pop("chunks", None)
+                completed.append(item)
+                if on_item_done:
+                    result = on_item_done(item)
+                    if inspect.isawaitable(result):
+                        await result
+
+        await asyncio.gather(
+            feed(), drain(), *(run_stage(i) for i in range(len(STAGES)))
+        )
+
+        completed.sort(key=lambda item: item["position"])
+        wall_seconds = time.perf_counter() - started
+        stage_stats = {name: stats[name].to_dict(wall_seconds) for name in STAGES}
+        logger.info(
+            f"Ingested {len(completed)} files in {wall_seconds:.2f}s; "
+            + ", ".join(
+                f"{name}={s['utilisation']:.0%}" for name, s in stage_stats.items()
+            )
+        )
+
+        return {
+            "items": completed,
+            "stats": {"wall_seconds": round(wall_seconds, 4), "stages": stage_stats},
+        }
+
+    @staticmethod
+    def _cleanup(item: Dict[str, Any]) -> None:
+        """Remove a spooled local file if the pipeline owns it."""
+        local_path = item.get("local_path")
+        if item.get("delete_local_path") and local_path and os.path.exists(local_path):
+            os.unlink(local_path)
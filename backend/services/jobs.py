@@ -0,0 +1,186 @@
+"""In-process background jobs with pollable status and progress."""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class JobCancelled(Exception):
+    """Raised by a job function that stops early because cancellation was requested."""
+
+
+class Job:
+    """One background job: status, progress counters and outcome."""
+
+    def __init__(self, kind: str, key: str):
+        """
+        Initialize job.
+
+        Args:
+            kind: Job type (e.g. "delete_client")
+            key: What the job works on (e.g. a client doc_id); one active job per kind and key
+        """
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.key = key
+        self.status = "queued"
+        self.progress: Dict[str, Any] = {}
+        self.result: Optional[Any] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    def update(self, **progress: Any) -> None:
+        """Merge progress fields (called from the job's worker thread)."""
+        with self._lock:
+            self.progress.update(progress)
+
+    def cancel(self) -> None:
+        """Ask the job to stop; job functions honour it at their next check."""
+        self._cancel.set()
+
+    @property
+    def cancel_requested(self) -> bool:
+        """Whether cancel() has been called."""
+        return self._cancel.is_set()
+
+    def check_cancelled(self) -> None:
+        """Raise JobCancelled if cancellation was requested."""
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    @property
+    def active(self) -> bool:
+        """Whether the job is still queued or running."""
+        return self.status in ACTIVE_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Job state for API responses."""
+
+        def timestamp(value: Optional[float]) -> Optional[str]:
+            return datetime.fromtimestamp(value).isoformat() if value else None
+
+        with self._lock:
+            progress = dict(self.progress)
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "key": self.key,
+            "status": self.status,
+            "progress": progress,
+            "result": self.result,
+            "error": self.error,
+            "created_at": timestamp(self.created_at),
+            "started_at": timestamp(self.started_at),
+            "finished_at": timestamp(self.finished_at),
+        }
+
+
+class JobManager:
+    """
+    Runs blocking job functions in worker threads and keeps their state.
+
+    State lives in memory, so jobs do not survive a restart; job functions
+    are written to be safe to run again from the start. Finished jobs are
+    kept until ``max_finished`` newer ones have finished.
+    """
+
+    def __init__(self, max_finished: int = 100):
+        """
+        Initialize job manager.
+
+        Args:
+            max_finished: Number of finished jobs kept for status queries
+        """
+        self.max_finished = max_finished
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks: set = set()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, key: str, func: Callable[[Job], Any]) -> Job:
+        """
+        Start a job on the running event loop, unless one is already active.
+
+        Args:
+            kind: Job type
+            key: What the job works on
+            func: Blocking function called with the Job; its return value
+                becomes the job result
+
+        Returns:
+            The new job, or the active job of the same kind and key
+        """
+        with self._lock:
+            existing = self._find_active(kind, key)
+            if existing is not None:
+                return existing
+            job = Job(kind, key)
+            self._jobs[job.id] = job
+
+        task = asyncio.get_running_loop().create_task(self._run(job, func))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def _run(self, job: Job, func: Callable[[Job], Any]) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        logger.info(f"Job {job.id} ({job.kind} {job.key}) started")
+        try:
+            job.result = await asyncio.to_thread(func, job)
+            job.status = "succeeded"
+        except JobCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            logger.error(f"Job {job.id} ({job.kind} {job.key}) failed: {e}")
+            job.error = str(e)
+            job.status = "failed"
+        job.finished_at = time.time()
+        logger.info(
+            f"Job {job.id} {job.status} in {job.finished_at - job.started_at:.1f}s"
+        )
+        self._prune()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by id, if still kept."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, kind: Optional[str] = None) -> List[Job]:
+        """Kept jobs, newest first, optionally of one kind."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job for job in reversed(jobs) if kind is None or job.kind == kind]
+
+    def active(self, kind: str, key: str) -> Optional[Job]:
+        """The queued or running job of a kind and key, if any."""
+        with self._lock:
+            return self._find_active(kind, key)
+
+    def _find_active(self, kind: str, key: str) -> Optional[Job]:
+        for job in self._jobs.values():
+            if job.kind == kind and job.key == key and job.active:
+                return job
+        return None
+
+    def _prune(self) -> None:
+        """Drop the earliest finished jobs beyond max_finished."""
+        with self._lock:
+            finished = sorted(
+                (job for job in self._jobs.values() if not job.active),
+                key=lambda job: job.finished_at,
+            )
+            for job in finished[: max(0, len(finished) - self.max_finished)]:
+                del self._jobs[job.id]
@@ -0,0 +1,355 @@
+"""Ollama model warm-up and keep-alive manager."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, time as dt_time
+from typing import Any, Deque, Dict, List, Optional
+from zoneinfo import ZoneInfo
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+# Load latencies kept per model for reporting
+LOAD_HISTORY_SIZE = 50
+
+
+@dataclass
+class ResidencyPolicy:
+    """Keep models resident with ``keep_alive`` on the given days and hours."""
+
+    days: frozenset
+    start: dt_time
+    end: dt_time
+    keep_alive: str
+
+    def matches(self, now: datetime) -> bool:
+        """Whether the policy applies at the given local time."""
+        if now.weekday() not in self.days:
+            return False
+        current = now.time()
+        if self.start <= self.end:
+            return self.start <= current < self.end
+        # Window wraps past midnight (e.g. 22:00-06:00)
+        return current >= self.start or current < self.end
+
+
+def parse_policies(spec: str) -> List[ResidencyPolicy]:
+    """
+    Parse residency policies.
+
+    The format is ``"<days> <HH:MM-HH:MM>=<keep_alive>"`` rules separated by
+    ``;``. Days are ``*``, a range (``mon-fri``) or a list (``sat,sun``); the
+    hours may be omitted for the whole day. Example::
+
+        mon-fri 08:00-19:00=15m; sat 09:00-13:00=10m
+
+    Args:
+        spec: Policy string
+
+    Returns:
+        List of policies in the order given (first match wins)
+    """
+    policies = []
+    for rule in spec.split(";"):
+        rule = rule.strip()
+        if not rule:
+            continue
+        try:
+            window, keep_alive = rule.rsplit("=", 1)
+            parts = window.split()
+            days = _parse_days(parts[0])
+            if len(parts) > 1:
+                start_text, end_text = parts[1].split("-")
+                start = dt_time.fromisoformat(start_text)
+                end = dt_time.fromisoformat(end_text)
+            else:
+                start = end = dt_time(0, 0)
+        except (ValueError, IndexError) as e:
+            raise ValueError(f"Invalid residency policy {rule!r}: {e}")
+        if start == end:
+            # Whole day
+            start, end = dt_time(0, 0), dt_time.max
+        policies.append(ResidencyPolicy(days, start, end, keep_alive.strip()))
+    return policies
+
+
+def _parse_days(text: str) -> frozenset:
+    """Parse ``*``, ``mon-fri`` or ``sat,sun`` into weekday numbers."""
+    if text == "*":
+        return frozenset(range(7))
+    days = set()
+    for part in text.lower().split(","):
+        if "-" in part:
+            first, last = (DAY_NAMES.index(day) for day in part.split("-"))
+            days.update(
+                range(first, last + 1)
+                if first <= last
+                else list(range(first, 7)) + list(range(0, last + 1))
+            )
+        else:
+            days.add(DAY_NAMES.index(part))
+    return frozenset(days)
+
+
+class ModelStats:
+    """Load and residency counters for one model."""
+
+    def __init__(self, name: str, kind: str):
+        """
+        Initialize model stats.
+
+        Args:
+            name: Ollama model name
+            kind: "generate" for chat models, "embed" for embedding models
+        """
+        self.name = name
+        self.kind = kind
+        self.warm_requests = 0
+        self.cold_loads = 0
+        self.unexpected_cold_loads = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.last_load_seconds: Optional[float] = None
+        self.last_cold_load_at: Optional[float] = None
+        self.last_warm_at: Optional[float] = None
+        self.resident: Optional[bool] = None
+        self.load_history: Deque[float] = deque(maxlen=LOAD_HISTORY_SIZE)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summarize model stats."""
+        loads = sorted(self.load_history)
+        return {
+            "kind": self.kind,
+            "resident": self.resident,
+            "warm_requests": self.warm_requests,
+            "cold_loads": self.cold_loads,
+            "unexpected_cold_loads": self.unexpected_cold_loads,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "last_load_seconds": self.last_load_seconds,
+            "median_load_seconds": loads[len(loads) // 2] if loads else None,
+            "max_load_seconds": loads[-1] if loads else None,
+            "last_cold_load_at": _isoformat(self.last_cold_load_at),
+            "last_warm_at": _isoformat(self.last_warm_at),
+        }
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    """Format an epoch timestamp, passing None through."""
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+
+class ModelResidencyManager:
+    """
+    Preloads Ollama models and keeps them resident according to policies.
+
+    Ollama unloads a model once its ``keep_alive`` expires, and every request
+    resets that timer to the request's own value. While a policy matches, the
+    manager re-sends an empty request with the policy's ``keep_alive`` every
+    ``interval`` seconds, so neither an idle period nor a short keep-alive on
+    a user request lets the model unload. Outside policy windows it stays
+    quiet and models expire normally.
+
+    Every warm request reports Ollama's ``load_duration``; one above
+    ``cold_load_threshold`` is counted as a cold load (and as unexpected when
+    a policy was supposed to be keeping the model resident).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        models: Dict[str, str],
+        policies: List[ResidencyPolicy],
+        default_keep_alive: str = "5m",
+        interval: float = 60.0,
+        cold_load_threshold: float = 0.5,
+        timezone: Optional[str] = None,
+        timeout: float = 300.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize residency manager.
+
+        Args:
+            base_url: Ollama base URL
+            models: Model name -> "generate" (chat model) or "embed" (embedding model)
+            policies: Residency policies, first match wins
+            default_keep_alive: keep_alive used for the startup preload outside policies
+            interval: Seconds between keep-alive checks
+            cold_load_threshold: Load duration in seconds counted as a cold load
+            timezone: IANA timezone for policy windows (None = server local time)
+            timeout: Per-request timeout in seconds (loading an 8B model is slow)
+            transport: Optional httpx transport (used by tests)
+        """
+        self.base_url = base_url.rstrip("/")
+        self.policies = policies
+        self.default_keep_alive = default_keep_alive
+        self.interval = interval
+        self.cold_load_threshold = cold_load_threshold
+        self.timeout = timeout
+        self.transport = transport
+        self.stats: Dict[str, ModelStats] = {
+            name: ModelStats(name, kind) for name, kind in models.items()
+        }
+        self._tz = ZoneInfo(timezone) if timezone else None
+        self._task: Optional[asyncio.Task] = None
+        self.ollama_reachable: Optional[bool] = None
+
+    def active_policy(self, now: Optional[datetime] = None) -> Optional[ResidencyPolicy]:
+        """
+        Return the policy in force, if any.
+
+        Args:
+            now: Time to evaluate (defaults to the current time)
+
+        Returns:
+            First matching policy, or None outside all windows
+        """
+        now = now or datetime.now(self._tz)
+        for policy in self.policies:
+            if policy.matches(now):
+                return policy
+        return None
+
+    async def warm_model(self, name: str, keep_alive: str, pinned: bool = False) -> float:
+        """
+        Send an empty request that loads a model (if needed) and sets its keep_alive.
+
+        Args:
+            name: Model name
+            keep_alive: Ollama keep_alive value (e.g. "15m", "-1")
+            pinned: Whether a policy is keeping this model resident
+
+        Returns:
+            Load duration in seconds reported by Ollama
+        """
+        model = self.stats[name]
+        if model.kind == "embed":
+            path, payload = "/api/embed", {"model": name, "input": "", "keep_alive": keep_alive}
+        else:
+            path, payload = "/api/generate", {"model": name, "keep_alive": keep_alive}
+
+        started = time.perf_counter()
+        try:
+            async with httpx.AsyncClient(
+                timeout=self.timeout, transport=self.transport
+            ) as http:
+                response = await http.post(f"{self.base_url}{path}", json=payload)
+                response.raise_for_status()
+                body = response.json()
+        except Exception as e:
+            model.errors += 1
+            model.last_error = str(e) or e.__class__.__name__
+            self.ollama_reachable = not isinstance(e, httpx.TransportError)
+            raise
+
+        self.ollama_reachable = True
+        elapsed = time.perf_counter() - started
+        load_seconds = body.get("load_duration", 0) / 1e9
+        model.warm_requests += 1
+        model.last_warm_at = time.time()
+        model.resident = True
+        model.last_error = None
+
+        if load_seconds >= self.cold_load_threshold:
+            model.cold_loads += 1
+            model.last_cold_load_at = model.last_warm_at
+            model.last_load_seconds = round(load_seconds, 3)
+            model.load_history.append(model.last_load_seconds)
+            if pinned and model.warm_requests > 1:
+                model.unexpected_cold_loads += 1
+            logger.info(
+                f"Cold load of {name}: {load_seconds:.2f}s "
+                f"(request {elapsed:.2f}s, keep_alive={keep_alive})"
+            )
+        return load_seconds
+
+    async def preload(self) -> None:
+        """Load every managed model, logging (not raising) failures."""
+        policy = self.active_policy()
+        keep_alive = policy.keep_alive if policy else self.default_keep_alive
+        results = await asyncio.gather(
+            *(
+                self.warm_model(name, keep_alive, pinned=policy is not None)
+                for name in self.stats
+            ),
+            return_exceptions=True,
+        )
+        for name, result in zip(self.stats, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Preloading {name} failed: {result}")
+            else:
+                logger.info(f"Preloaded {name} (load {result:.2f}s)")
+
+    async def tick(self, now: Optional[datetime] = None) -> None:
+        """Refresh keep_alive for every model if a policy is in force."""
+        policy = self.active_policy(now)
+        if policy is None:
+            return
+        for name in self.stats:
+            try:
+                await self.warm_model(name, policy.keep_alive, pinned=True)
+            except Exception as e:
+                logger.warning(f"Keep-alive for {name} failed: {e}")
+
+    async def refresh_residency(self) -> Dict[str, bool]:
+        """
+        Ask Ollama which models are loaded (``/api/ps``).
+
+        Returns:
+            Model name -> whether it is currently loaded
+        """
+        async with httpx.AsyncClient(timeout=5.0, transport=self.transport) as http:
+            response = await http.get(f"{self.base_url}/api/ps")
+            response.raise_for_status()
+            entries = response.json().get("models", [])
+        loaded = {entry.get("name") for entry in entries} | {
+            entry.get("model") for entry in entries
+        }
+        self.ollama_reachable = True
+        for name, model in self.stats.items():
+            model.resident = name in loaded
+        return {name: model.resident for name, model in self.stats.items()}
+
+    def start(self) -> None:
+        """Preload models and start the keep-alive loop in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the keep-alive loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Preload, then refresh keep_alive every interval."""
+        await self.preload()
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.tick()
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Report residency state for /health.
+
+        Returns:
+            Dictionary with the active policy and per-model load stats
+        """
+        policy = self.active_policy()
+        return {
+            "active_policy": (
+                {"keep_alive": policy.keep_alive} if policy else None
+            ),
+            "interval_seconds": self.interval,
+            "models": {name: model.to_dict() for name, model in self.stats.items()},
+        }
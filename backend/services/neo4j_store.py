@@ -1,15 +1,174 @@
 """Neo4j vector store service for document embeddings."""
 
 import logging
-from typing import List, Dict, Any, Optional
+import re
+import time
+import zlib
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 from neo4j import GraphDatabase
 from langchain_ollama import OllamaEmbeddings
 from langchain_community.vectorstores import Neo4jVector
 from langchain_core.documents import Document
 from config import settings
+from utils.metrics import QUERY_STAGE_SECONDS, timed
+from utils.profiling import profiled
 
 logger = logging.getLogger(__name__)
 
+# Ways search_by_client can scope a search to one client
+SEARCH_STRATEGIES = ("overfetch", "filtered")
+
+NODE_LABEL = "DocumentChunk"
+# Vector index and property of chunks embedded before versioning existed
+DEFAULT_INDEX_NAME = "legal_documents"
+DEFAULT_EMBEDDING_PROPERTY = "embedding"
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Metadata key carrying a result's vector (see search_by_client with_embeddings)
+EMBEDDING_METADATA_KEY = "_embedding_"
+
+
+def retrieval_query(embedding_property: str) -> str:
+    """
+    Cypher returning search results with explicit metadata fields.
+
+    Listing the fields keeps the vectors of other embedding versions out of
+    the results; the version's own vector is returned for re-ranking.
+    """
+    return (
+        "RETURN node.text AS text, score, {source: node.source, location: node.location, "
+        "chunk_id: node.chunk_id, client_doc_id: node.client_doc_id, "
+        f"client_name: node.client_name, {EMBEDDING_METADATA_KEY}: "
+        f"node.`{_identifier(embedding_property)}`}} AS metadata"
+    )
+
+
+def version_name(model: str) -> str:
+    """
+    Derive an embedding version name from a model name.
+
+    Args:
+        model: Ollama embedding model (e.g. "embeddinggemma:latest")
+
+    Returns:
+        Lower-case identifier-safe name (e.g. "embeddinggemma_latest")
+    """
+    name = re.sub(r"[^a-z0-9]+", "_", model.lower()).strip("_")
+    if not name:
+        raise ValueError(f"Cannot derive an embedding version from model {model!r}")
+    return name
+
+
+def _identifier(value: str) -> str:
+    """Check a property or index name before it is interpolated into Cypher."""
+    if not _IDENTIFIER.match(value):
+        raise ValueError(f"Invalid Neo4j identifier: {value!r}")
+    return value
+
+
+@dataclass
+class EmbeddingVersion:
+    """
+    The vectors of one embedding model: the chunk property and vector index holding them.
+
+    Versions are stored as ``EmbeddingVersion`` nodes in Neo4j. Exactly one is
+    "active" (used for queries and new writes); a "building" version is being
+    filled by a re-embed job; "retired" versions keep their vectors until dropped.
+    """
+
+    name: str
+    model: str
+    embedding_property: str
+    index_name: str
+    dimensions: Optional[int] = None
+    status: str = "building"
+    activated_at: Optional[float] = None
+
+    @classmethod
+    def for_model(cls, model: str) -> "EmbeddingVersion":
+        """New version with its own property and index, named after the model."""
+        name = version_name(model)
+        return cls(
+            name=name,
+            model=model,
+            embedding_property=f"{DEFAULT_EMBEDDING_PROPERTY}_{name}",
+            index_name=f"{DEFAULT_INDEX_NAME}_{name}",
+        )
+
+    @classmethod
+    def default(cls, model: str) -> "EmbeddingVersion":
+        """The pre-versioning index and property, registered under the given model."""
+        return cls(
+            name=version_name(model),
+            model=model,
+            embedding_property=DEFAULT_EMBEDDING_PROPERTY,
+            index_name=DEFAULT_INDEX_NAME,
+            status="active",
+        )
+
+    @classmethod
+    def from_properties(cls, properties: Dict[str, Any]) -> "EmbeddingVersion":
+        """Build a version from its Neo4j node properties."""
+        version = cls(**{field.name: properties.get(field.name) for field in fields(cls)})
+        _identifier(version.embedding_property)
+        _identifier(version.index_name)
+        return version
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Version fields for API responses and node properties."""
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class PartitionScheme:
+    """
+    How chunks are spread over vector indexes.
+
+    With ``partitions`` > 0, every chunk also carries the label of its
+    client's partition, a hash bucket of the client doc_id. Each embedding
+    version then has one vector index per partition, so a search walks an
+    index holding roughly 1/partitions of the corpus instead of all of it.
+    0 means one shared index per version. The active scheme is stored as a
+    ``PartitionScheme`` node in Neo4j, so every process routes the same way.
+    """
+
+    partitions: int = 0
+
+    def partition_for(self, client_doc_id: str) -> int:
+        """Partition a client's chunks belong to."""
+        return zlib.crc32(client_doc_id.encode("utf-8")) % self.partitions
+
+    def label(self, partition: int) -> str:
+        """Node label of a partition."""
+        return f"{NODE_LABEL}_p{self.partitions}_{partition}"
+
+    def index_name(self, version: EmbeddingVersion, partition: int) -> str:
+        """Vector index of a partition for an embedding version."""
+        return f"{version.index_name}_p{self.partitions}_{partition}"
+
+    def label_for(self, client_doc_id: str) -> Optional[str]:
+        """Partition label for a client's chunks (None when unpartitioned)."""
+        if not self.partitions:
+            return None
+        return self.label(self.partition_for(client_doc_id))
+
+    def index_for(self, version: EmbeddingVersion, client_doc_id: str) -> Optional[str]:
+        """Vector index to search for a client (None: the version's shared index)."""
+        if not self.partitions:
+            return None
+        return self.index_name(version, self.partition_for(client_doc_id))
+
+
+class ActiveIndex(NamedTuple):
+    """What queries and writes currently use; swapped as one value."""
+
+    version: EmbeddingVersion
+    embeddings: Any
+    vector_store: Any
+    partitions: PartitionScheme = PartitionScheme()
+
 
 class Neo4jVectorStore:
     """Service for managing vector embeddings in Neo4j."""
@@ -22,52 +181,404 @@ class Neo4jVectorStore:
             database=settings.NEO4J_DATABASE,  
         )
 
-        # Initialize embeddings
-        self.embeddings = OllamaEmbeddings(
-            model=settings.OLLAMA_EMBEDDING_MODEL, base_url=settings.OLLAMA_BASE_URL
+        # Queries and writes use the active embedding version and partition
+        # scheme, which are read from Neo4j so every API process agrees on them
+        version = self._load_active_version()
+        if version.model != settings.OLLAMA_EMBEDDING_MODEL:
+            logger.warning(
+                f"Active embedding version uses {version.model}, not "
+                f"OLLAMA_EMBEDDING_MODEL={settings.OLLAMA_EMBEDDING_MODEL}; start a "
+                f"re-embed job (POST /admin/embeddings/reembed) to switch models"
+            )
+        partitions = self._load_partition_scheme()
+        embeddings = self.embeddings_for(version.model)
+        self._set_active(
+            version,
+            embeddings,
+            self.initialize_vector_index(version, embeddings, partitions),
+            partitions,
         )
 
-        self.index_name = "legal_documents"
-        self.vector_store: Optional[Neo4jVector] = None
+        try:
+            self.ensure_property_indexes()
+        except Exception as e:
+            logger.warning(f"Could not create chunk property indexes: {e}")
+
+    # The active version, its embeddings client, its index and the partition
+    # scheme are swapped together as one value, so a search never mixes them
+
+    @property
+    def active_version(self) -> EmbeddingVersion:
+        """The embedding version used for queries and new writes."""
+        return self._active.version
 
-        # Initialize vector index
-        self.initialize_vector_index()
+    @property
+    def embeddings(self) -> OllamaEmbeddings:
+        """Embeddings client for the active version's model."""
+        return self._active.embeddings
+
+    @property
+    def vector_store(self) -> Optional[Neo4jVector]:
+        """Vector store over the active version's indexes."""
+        return self._active.vector_store
+
+    @property
+    def partition_scheme(self) -> PartitionScheme:
+        """How chunks are currently spread over vector indexes."""
+        return self._active.partitions
+
+    @property
+    def index_name(self) -> str:
+        """Name of the active shared vector index."""
+        return self.active_version.index_name
+
+    def _set_active(
+        self,
+        version: EmbeddingVersion,
+        embeddings,
+        vector_store,
+        partitions: PartitionScheme = PartitionScheme(),
+    ) -> None:
+        self._active = ActiveIndex(version, embeddings, vector_store, partitions)
+        self._version_checked_at = time.monotonic()
+
+    @staticmethod
+    def embeddings_for(model: str) -> OllamaEmbeddings:
+        """Embeddings client for a model."""
+        return OllamaEmbeddings(model=model, base_url=settings.OLLAMA_BASE_URL)
+
+    def initialize_vector_index(
+        self,
+        version: EmbeddingVersion,
+        embeddings: OllamaEmbeddings,
+        partitions: PartitionScheme = PartitionScheme(),
+    ) -> Neo4jVector:
+        """
+        Create or connect to the Neo4j vector index of an embedding version.
 
-    def initialize_vector_index(self) -> None:
-        """Create or connect to Neo4j vector index."""
+        Args:
+            version: Embedding version whose index to open
+            embeddings: Embeddings client for the version's model
+            partitions: Active partition scheme; when partitioned, searches name
+                the partition index per query and the shared index is not needed
+
+        Returns:
+            Vector store over the version's index and property
+        """
+        options = dict(
+            embedding=embeddings,
+            url=settings.NEO4J_URL,
+            username=settings.NEO4J_USER,
+            password=settings.NEO4J_PASSWORD,
+            database=settings.NEO4J_DATABASE,
+            index_name=version.index_name,
+            node_label=NODE_LABEL,
+            embedding_node_property=version.embedding_property,
+            text_node_property="text",
+            retrieval_query=retrieval_query(version.embedding_property),
+        )
+        if partitions.partitions:
+            return Neo4jVector(**options)
         try:
             # Create vector store with index
-            self.vector_store = Neo4jVector.from_existing_index(
-                embedding=self.embeddings,
-                url=settings.NEO4J_URL,
-                username=settings.NEO4J_USER,
-                password=settings.NEO4J_PASSWORD,
-                index_name=self.index_name,
-                node_label="DocumentChunk",
-                embedding_node_property="embedding",
-                text_node_property="text",
-            )
-            logger.info(f"Connected to existing Neo4j vector index: {self.index_name}")
+            vector_store = Neo4jVector.from_existing_index(**options)
+            logger.info(f"Connected to existing Neo4j vector index: {version.index_name}")
+            return vector_store
         except Exception as e:
             # Index doesn't exist, create it
             logger.info(f"Index not found, creating new index: {e}")
             try:
-                self.vector_store = Neo4jVector.from_documents(
-                    documents=[],
-                    embedding=self.embeddings,
-                    url=settings.NEO4J_URL,
-                    username=settings.NEO4J_USER,
-                    password=settings.NEO4J_PASSWORD,
-                    index_name=self.index_name,
-                    node_label="DocumentChunk",
-                    embedding_node_property="embedding",
-                    text_node_property="text",
-                )
-                logger.info(f"Created new Neo4j vector index: {self.index_name}")
+                vector_store = Neo4jVector.from_documents(documents=[], **options)
+                logger.info(f"Created new Neo4j vector index: {version.index_name}")
+                return vector_store
             except Exception as create_error:
                 logger.error(f"Error creating vector index: {create_error}")
                 raise
 
+    # Embedding versions
+
+    def _read_active_version(self) -> Optional[EmbeddingVersion]:
+        with self.driver.session() as session:
+            record = session.run(
+                "MATCH (v:EmbeddingVersion {status: 'active'}) "
+                "RETURN properties(v) AS version ORDER BY v.activated_at DESC LIMIT 1"
+            ).single()
+        return EmbeddingVersion.from_properties(record["version"]) if record else None
+
+    def _save_version(self, version: EmbeddingVersion) -> None:
+        with self.driver.session() as session:
+            session.run(
+                "MERGE (v:EmbeddingVersion {name: $name}) SET v += $properties",
+                name=version.name,
+                properties=version.to_dict(),
+            )
+
+    def _load_active_version(self) -> EmbeddingVersion:
+        """Read the active version, registering the default index on first start."""
+        try:
+            version = self._read_active_version()
+            if version is None:
+                # Chunks written before versioning: assume the configured model built them
+                version = EmbeddingVersion.default(settings.OLLAMA_EMBEDDING_MODEL)
+                version.activated_at = time.time()
+                self._save_version(version)
+            return version
+        except Exception as e:
+            logger.warning(f"Could not read the active embedding version, using the default: {e}")
+            return EmbeddingVersion.default(settings.OLLAMA_EMBEDDING_MODEL)
+
+    def refresh_active_version(self, force: bool = False) -> bool:
+        """
+        Switch to the active version and partition scheme recorded in Neo4j
+        if another process changed them.
+
+        Checks at most every EMBEDDING_VERSION_REFRESH_SECONDS unless forced.
+
+        Args:
+            force: Check now regardless of the interval
+
+        Returns:
+            True if the active version or partition scheme changed
+        """
+        if self.driver is None:
+            return False
+        now = time.monotonic()
+        if not force and now - self._version_checked_at < settings.EMBEDDING_VERSION_REFRESH_SECONDS:
+            return False
+        self._version_checked_at = now
+
+        try:
+            version = self._read_active_version() or self.active_version
+            partitions = self._read_partition_scheme()
+        except Exception as e:
+            logger.warning(f"Could not check the active embedding version: {e}")
+            return False
+        current = self._active
+        if version.name == current.version.name and partitions == current.partitions:
+            return False
+
+        embeddings = (
+            current.embeddings
+            if version.name == current.version.name
+            else self.embeddings_for(version.model)
+        )
+        self._set_active(
+            version,
+            embeddings,
+            self.initialize_vector_index(version, embeddings, partitions),
+            partitions,
+        )
+        logger.info(
+            f"Switched to embedding version {version.name} ({version.model}), "
+            f"{partitions.partitions or 'no'} partitions"
+        )
+        return True
+
+    def list_embedding_versions(self) -> List[EmbeddingVersion]:
+        """All registered embedding versions, by name."""
+        with self.driver.session() as session:
+            records = session.run(
+                "MATCH (v:EmbeddingVersion) RETURN properties(v) AS version ORDER BY v.name"
+            )
+            return [EmbeddingVersion.from_properties(record["version"]) for record in records]
+
+    def get_embedding_version(self, name: str) -> Optional[EmbeddingVersion]:
+        """A registered embedding version by name."""
+        for version in self.list_embedding_versions():
+            if version.name == name:
+                return version
+        return None
+
+    def prepare_embedding_version(self, model: str, dimensions: int) -> EmbeddingVersion:
+        """
+        Register a version for a model as "building" and create its vector index.
+
+        A retired version of the same model is reused, so its existing vectors
+        only need topping up.
+
+        Args:
+            model: Embedding model
+            dimensions: Vector size the model produces
+
+        Returns:
+            The building version
+        """
+        version = self.get_embedding_version(version_name(model)) or EmbeddingVersion.for_model(model)
+        if version.status == "active":
+            raise ValueError(f"Embedding version {version.name} is already active")
+        if version.dimensions and version.dimensions != dimensions:
+            raise ValueError(
+                f"Embedding version {version.name} holds {version.dimensions}-dimensional "
+                f"vectors but {model} now produces {dimensions}; drop the version first"
+            )
+        version.model = model
+        version.dimensions = dimensions
+        version.status = "building"
+        self._save_version(version)
+        self.create_version_indexes(version, self.partition_scheme)
+        return version
+
+    def _create_vector_index(self, name: str, label: str, prop: str, dimensions: int) -> None:
+        with self.driver.session() as session:
+            session.run(
+                f"CREATE VECTOR INDEX `{_identifier(name)}` IF NOT EXISTS "
+                f"FOR (n:`{_identifier(label)}`) ON (n.`{_identifier(prop)}`) "
+                "OPTIONS {indexConfig: {`vector.dimensions`: $dimensions, "
+                "`vector.similarity_function`: 'cosine'}}",
+                dimensions=dimensions,
+            )
+
+    def create_version_indexes(
+        self, version: EmbeddingVersion, partitions: PartitionScheme
+    ) -> None:
+        """
+        Create an embedding version's vector indexes for a partition scheme.
+
+        Args:
+            version: Embedding version (with dimensions)
+            partitions: Scheme whose indexes to create; unpartitioned creates
+                the version's shared index
+        """
+        if not partitions.partitions:
+            self._create_vector_index(
+                version.index_name, NODE_LABEL, version.embedding_property, version.dimensions
+            )
+        for partition in range(partitions.partitions):
+            self._create_vector_index(
+                partitions.index_name(version, partition),
+                partitions.label(partition),
+                version.embedding_property,
+                version.dimensions,
+            )
+
+    def version_coverage(self, version: EmbeddingVersion) -> Dict[str, int]:
+        """Chunks with text, and how many of them have the version's vector."""
+        prop = _identifier(version.embedding_property)
+        with self.driver.session() as session:
+            record = session.run(
+                f"MATCH (n:{NODE_LABEL}) WHERE n.text IS NOT NULL "
+                f"RETURN count(n) AS total, count(n.`{prop}`) AS embedded"
+            ).single()
+        return {"total": record["total"], "embedded": record["embedded"]}
+
+    def scan_chunks(
+        self, version: EmbeddingVersion, after: str, limit: int
+    ) -> List[Tuple[str, Optional[str], bool]]:
+        """
+        Page through chunks in ``id`` order, noting which lack the version's vector.
+
+        Keyset paging over the ``id`` index keeps every page cheap no matter
+        how far into the label the scan is.
+
+        Args:
+            version: Embedding version being filled
+            after: Last chunk id of the previous page ("" to start)
+            limit: Chunks per page
+
+        Returns:
+            (chunk id, text, missing) per chunk, in id order
+        """
+        prop = _identifier(version.embedding_property)
+        with self.driver.session() as session:
+            records = session.run(
+                f"MATCH (n:{NODE_LABEL}) WHERE n.id > $after "
+                "WITH n ORDER BY n.id LIMIT $limit "
+                f"RETURN n.id AS id, n.text AS text, n.`{prop}` IS NULL AS missing",
+                after=after,
+                limit=limit,
+            )
+            return [(record["id"], record["text"], record["missing"]) for record in records]
+
+    def write_version_embeddings(
+        self, version: EmbeddingVersion, ids: List[str], embeddings: List[List[float]]
+    ) -> None:
+        """
+        Store vectors in a version's property, in one write transaction.
+
+        Args:
+            version: Embedding version being filled
+            ids: Chunk ids
+            embeddings: Vectors aligned with ids
+        """
+        rows = [{"id": chunk_id, "embedding": vector} for chunk_id, vector in zip(ids, embeddings)]
+
+        def write(tx) -> None:
+            tx.run(
+                f"UNWIND $rows AS row MATCH (n:{NODE_LABEL} {{id: row.id}}) "
+                "CALL db.create.setNodeVectorProperty(n, $property, row.embedding)",
+                rows=rows,
+                property=version.embedding_property,
+            )
+
+        with self.driver.session() as session:
+            session.execute_write(write)
+
+    def activate_embedding_version(self, name: str) -> None:
+        """
+        Make a version the active one and switch this process to it.
+
+        The previous active version is retired in the same transaction, so
+        there is never zero or two active versions. Other processes pick the
+        change up within EMBEDDING_VERSION_REFRESH_SECONDS.
+
+        Args:
+            name: Version name
+        """
+
+        def switch(tx) -> int:
+            return tx.run(
+                "MATCH (v:EmbeddingVersion {name: $name}) "
+                "OPTIONAL MATCH (old:EmbeddingVersion {status: 'active'}) WHERE old <> v "
+                "SET old.status = 'retired', v.status = 'active', v.activated_at = $now "
+                "RETURN count(v) AS found",
+                name=name,
+                now=time.time(),
+            ).single()["found"]
+
+        with self.driver.session() as session:
+            if not session.execute_write(switch):
+                raise ValueError(f"Unknown embedding version: {name}")
+        self.refresh_active_version(force=True)
+
+    def drop_embedding_version(
+        self,
+        name: str,
+        batch_size: Optional[int] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Remove a non-active version's vector index, vectors and record.
+
+        Args:
+            name: Version name
+            batch_size: Chunks per transaction (defaults to NEO4J_DELETE_BATCH_SIZE)
+            on_progress: Optional callback receiving the running total
+
+        Returns:
+            Number of chunks whose vector was removed
+        """
+        version = self.get_embedding_version(name)
+        if version is None:
+            raise ValueError(f"Unknown embedding version: {name}")
+        if version.status == "active":
+            raise ValueError(f"Embedding version {name} is active and cannot be dropped")
+
+        prop = _identifier(version.embedding_property)
+        self.drop_vector_indexes(version, PartitionScheme())
+        self.drop_vector_indexes(version, self.partition_scheme)
+        removed = self._write_in_batches(
+            f"MATCH (n:{NODE_LABEL}) WHERE n.`{prop}` IS NOT NULL",
+            f"REMOVE n.`{prop}`",
+            {},
+            batch_size,
+            on_progress,
+        )
+        with self.driver.session() as session:
+            session.run("MATCH (v:EmbeddingVersion {name: $name}) DELETE v", name=name)
+        logger.info(f"Dropped embedding version {name}: {removed} vectors removed")
+        return removed
+
+    @profiled("neo4j.add_documents_for_client")
     def add_documents_for_client(
         self, chunks: List[Dict[str, Any]], client_doc_id: str, client_name: str
     ) -> None:
@@ -79,98 +590,469 @@ class Neo4jVectorStore:
             client_doc_id: Client document ID
             client_name: Client name
         """
-        if not self.vector_store:
+        embeddings = self.embed_chunks(chunks)
+        self.add_embedded_documents_for_client(
+            chunks, embeddings, client_doc_id, client_name
+        )
+
+    @profiled("neo4j.embed_chunks")
+    def embed_chunks(self, chunks: List[Dict[str, Any]]) -> List[List[float]]:
+        """
+        Generate embeddings for chunk texts without writing them.
+
+        Args:
+            chunks: List of chunk dictionaries with a "text" key
+
+        Returns:
+            One embedding vector per chunk
+        """
+        try:
+            return self.embeddings.embed_documents([chunk["text"] for chunk in chunks])
+        except Exception as e:
+            logger.error(f"Error generating embeddings: {e}")
+            raise
+
+    @profiled("neo4j.add_embedded_documents_for_client")
+    def add_embedded_documents_for_client(
+        self,
+        chunks: List[Dict[str, Any]],
+        embeddings: List[List[float]],
+        client_doc_id: str,
+        client_name: str,
+        embedding_version: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Write pre-embedded chunks with client metadata to Neo4j.
+
+        Args:
+            chunks: List of chunk dictionaries with metadata
+            embeddings: Embedding vectors aligned with chunks
+            client_doc_id: Client document ID
+            client_name: Client name
+            embedding_version: Version active when the embeddings were computed;
+                if another version has become active since, the chunks are
+                embedded again with its model
+
+        Returns:
+            Node ids of the written chunks
+        """
+        self.refresh_active_version()
+        version, _, vector_store, partitions = self._active
+        if not vector_store:
             raise Exception("Vector store not initialized")
+        if embedding_version and embedding_version != version.name:
+            logger.info(
+                f"Embedding version changed to {version.name} during ingestion; "
+                f"re-embedding {len(chunks)} chunks"
+            )
+            embeddings = self.embed_chunks(chunks)
+
+        metadatas = [
+            {
+                "source": chunk["source"],
+                "location": chunk["location"],
+                "chunk_id": chunk["chunk_id"],
+                "client_doc_id": client_doc_id,
+                "client_name": client_name,
+            }
+            for chunk in chunks
+        ]
 
-        # Convert chunks to LangChain Documents
-        documents = []
-        for chunk in chunks:
-            doc = Document(
-                page_content=chunk["text"],
-                metadata={
-                    "source": chunk["source"],
-                    "location": chunk["location"],
-                    "chunk_id": chunk["chunk_id"],
-                    "client_doc_id": client_doc_id,
-                    "client_name": client_name,
-                },
-            )
-            documents.append(doc)
-
-        # Add documents to vector store
         try:
-            self.vector_store.add_documents(documents)
+            ids = vector_store.add_embeddings(
+                texts=[chunk["text"] for chunk in chunks],
+                embeddings=embeddings,
+                metadatas=metadatas,
+            )
+            label = partitions.label_for(client_doc_id)
+            if label:
+                self._label_chunks(ids, label)
             logger.info(
-                f"Added {len(documents)} chunks to Neo4j for client: {client_doc_id}"
+                f"Added {len(chunks)} chunks to Neo4j for client: {client_doc_id}"
             )
+            return ids
         except Exception as e:
             logger.error(f"Error adding documents to Neo4j: {e}")
             raise
 
+    def embed_query(self, query: str) -> List[float]:
+        """Embed a query with the active version's model (for search_by_client)."""
+        with timed(QUERY_STAGE_SECONDS, "embedding"):
+            return self.embeddings.embed_query(query)
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed several queries in one request (Ollama embeds queries like documents)."""
+        with timed(QUERY_STAGE_SECONDS, "embedding"):
+            return self.embeddings.embed_documents(queries)
+
+    @profiled("neo4j.search_by_client")
     def search_by_client(
-        self, query: str, client_doc_id: str, k: int = 4
+        self,
+        query: str,
+        client_doc_id: str,
+        k: Optional[int] = None,
+        strategy: Optional[str] = None,
+        overfetch: Optional[int] = None,
+        query_embedding: Optional[List[float]] = None,
+        with_embeddings: bool = False,
     ) -> List[Document]:
         """
-        Client-scoped similarity search with metadata filter.
+        Client-scoped similarity search.
 
         Args:
             query: Search query text
             client_doc_id: Client document ID for filtering
-            k: Number of results to return
+            k: Number of results to return (defaults to RETRIEVAL_K)
+            strategy: One of SEARCH_STRATEGIES (defaults to RETRIEVAL_STRATEGY)
+            overfetch: Candidates per result for "overfetch" (defaults to RETRIEVAL_OVERFETCH)
+            query_embedding: Query vector already computed with ``embed_query``
+            with_embeddings: Keep each result's vector in its metadata under
+                EMBEDDING_METADATA_KEY
 
         Returns:
             List of relevant Document objects with metadata
         """
-        if not self.vector_store:
+        self.refresh_active_version()
+        version, embeddings, vector_store, partitions = self._active
+        if not vector_store:
             raise Exception("Vector store not initialized")
 
+        k = k or settings.RETRIEVAL_K
+        strategy = strategy or settings.RETRIEVAL_STRATEGY
+        if strategy not in SEARCH_STRATEGIES:
+            raise ValueError(
+                f"Unknown retrieval strategy {strategy!r}; expected one of {SEARCH_STRATEGIES}"
+            )
+
         try:
-            # Perform similarity search with metadata filter
-            # Note: Neo4jVector doesn't directly support metadata filtering in search
-            # We'll need to filter results after retrieval or use Cypher query
-
-            # Get more results than needed, then filter
-            results = self.vector_store.similarity_search(query, k=k * 2)
-            
-            # Filter by client_doc_id
+            if query_embedding is None:
+                with timed(QUERY_STAGE_SECONDS, "embedding"):
+                    query_embedding = embeddings.embed_query(query)
+
+            with timed(QUERY_STAGE_SECONDS, "vector_search"):
+                if strategy == "filtered":
+                    # Metadata filter inside the query: exact search over the client's chunks
+                    results = vector_store.similarity_search_by_vector(
+                        query_embedding,
+                        k=k,
+                        filter={"client_doc_id": client_doc_id},
+                        query=query,
+                    )
+                else:
+                    # Search the shared index (or the client's partition index), then
+                    # keep the client's chunks; clients with few chunks can get fewer
+                    # than k results
+                    index = partitions.index_for(version, client_doc_id)
+                    results = vector_store.similarity_search_by_vector(
+                        query_embedding,
+                        k=k * (overfetch or settings.RETRIEVAL_OVERFETCH),
+                        params={"index": index} if index else {},
+                        query=query,
+                    )
+
             filtered_results = [
                 doc
                 for doc in results
                 if doc.metadata.get("client_doc_id") == client_doc_id
-            ]
-
-            # Return top k results
-            return filtered_results[:k]
+            ][:k]
+            if not with_embeddings:
+                for doc in filtered_results:
+                    doc.metadata.pop(EMBEDDING_METADATA_KEY, None)
+            return filtered_results
 
         except Exception as e:
             logger.error(f"Error searching Neo4j: {e}")
             raise
 
-    def delete_client_documents(self, client_doc_id: str) -> None:
+    def _label_chunks(self, ids: List[str], label: str) -> None:
+        """Add a partition label to written chunks."""
+
+        def write(tx) -> None:
+            tx.run(
+                f"UNWIND $ids AS id MATCH (n:{NODE_LABEL} {{id: id}}) "
+                f"SET n:`{_identifier(label)}`",
+                ids=ids,
+            )
+
+        with self.driver.session() as session:
+            session.execute_write(write)
+
+    # Partitioning
+
+    def _read_partition_scheme(self) -> PartitionScheme:
+        with self.driver.session() as session:
+            record = session.run(
+                "MATCH (p:PartitionScheme {name: 'active'}) RETURN p.partitions AS partitions"
+            ).single()
+        return PartitionScheme(record["partitions"] if record else 0)
+
+    def _load_partition_scheme(self) -> PartitionScheme:
+        try:
+            return self._read_partition_scheme()
+        except Exception as e:
+            logger.warning(f"Could not read the partition scheme, using one shared index: {e}")
+            return PartitionScheme()
+
+    def activate_partition_scheme(self, partitions: PartitionScheme) -> None:
         """
-        Delete all documents for a client from Neo4j.
+        Make a partition scheme the active one and switch this process to it.
+
+        Other processes pick the change up within EMBEDDING_VERSION_REFRESH_SECONDS.
 
         Args:
+            partitions: Scheme whose labels and indexes are in place
+        """
+        with self.driver.session() as session:
+            # The previous scheme is kept as "retiring" until its labels are removed
+            session.run(
+                "MERGE (p:PartitionScheme {name: 'active'}) "
+                "SET p.retiring = coalesce(p.partitions, 0), "
+                "p.partitions = $partitions, p.activated_at = $now",
+                partitions=partitions.partitions,
+                now=time.time(),
+            )
+        self.refresh_active_version(force=True)
+
+    def retiring_partition_scheme(self) -> Optional[PartitionScheme]:
+        """The scheme replaced by the active one, until its cleanup has finished."""
+        with self.driver.session() as session:
+            record = session.run(
+                "MATCH (p:PartitionScheme {name: 'active'}) RETURN p.retiring AS retiring"
+            ).single()
+        if not record or record["retiring"] is None:
+            return None
+        return PartitionScheme(record["retiring"])
+
+    def finish_partition_migration(self) -> None:
+        """Record that the retiring scheme's labels and indexes are gone."""
+        with self.driver.session() as session:
+            session.run("MATCH (p:PartitionScheme {name: 'active'}) REMOVE p.retiring")
+
+    def list_chunk_clients(self) -> List[str]:
+        """Distinct client doc_ids that have chunks."""
+        with self.driver.session() as session:
+            records = session.run(
+                f"MATCH (n:{NODE_LABEL}) WHERE n.client_doc_id IS NOT NULL "
+                "RETURN DISTINCT n.client_doc_id AS client_doc_id"
+            )
+            return [record["client_doc_id"] for record in records]
+
+    def label_client_chunks(
+        self, partitions: PartitionScheme, client_doc_id: str, batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Add a client's partition label to its chunks that lack it, in bounded batches.
+
+        Args:
+            partitions: Scheme being migrated to
             client_doc_id: Client document ID
+            batch_size: Chunks per transaction (defaults to NEO4J_DELETE_BATCH_SIZE)
+
+        Returns:
+            Number of chunks labelled
+        """
+        label = _identifier(partitions.label_for(client_doc_id))
+        return self._write_in_batches(
+            f"MATCH (n:{NODE_LABEL} {{client_doc_id: $client_doc_id}}) WHERE NOT n:`{label}`",
+            f"SET n:`{label}`",
+            {"client_doc_id": client_doc_id},
+            batch_size,
+        )
+
+    def remove_partition_labels(
+        self, partitions: PartitionScheme, partition: int, batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Remove one partition label of a no longer active scheme, in bounded batches.
+
+        Args:
+            partitions: Retired scheme
+            partition: Partition whose label to remove
+            batch_size: Chunks per transaction (defaults to NEO4J_DELETE_BATCH_SIZE)
+
+        Returns:
+            Number of chunks unlabelled
+        """
+        label = _identifier(partitions.label(partition))
+        return self._write_in_batches(
+            f"MATCH (n:`{label}`)", f"REMOVE n:`{label}`", {}, batch_size
+        )
+
+    def drop_vector_indexes(self, version: EmbeddingVersion, partitions: PartitionScheme) -> None:
+        """Drop an embedding version's vector indexes of a partition scheme."""
+        names = (
+            [partitions.index_name(version, partition) for partition in range(partitions.partitions)]
+            if partitions.partitions
+            else [version.index_name]
+        )
+        with self.driver.session() as session:
+            for name in names:
+                session.run(f"DROP INDEX `{_identifier(name)}` IF EXISTS")
+
+    def await_indexes(self, timeout: float) -> None:
+        """Wait until every index is online (vector indexes populate in the background)."""
+        with self.driver.session() as session:
+            session.run("CALL db.awaitIndexes($timeout)", timeout=int(timeout))
+
+    def ensure_property_indexes(self) -> None:
+        """Create the indexes that chunk writes, client- and file-scoped lookups and deletes use."""
+        with self.driver.session() as session:
+            # Chunk writes MERGE on id, and re-embedding pages through chunks by id
+            session.run(
+                "CREATE INDEX document_chunk_id IF NOT EXISTS FOR (n:DocumentChunk) ON (n.id)"
+            )
+            session.run(
+                "CREATE INDEX document_chunk_client IF NOT EXISTS "
+                "FOR (n:DocumentChunk) ON (n.client_doc_id)"
+            )
+            session.run(
+                "CREATE INDEX document_chunk_client_source IF NOT EXISTS "
+                "FOR (n:DocumentChunk) ON (n.client_doc_id, n.source)"
+            )
+
+    def _write_in_batches(
+        self,
+        match: str,
+        action: str,
+        params: Dict[str, Any],
+        batch_size: Optional[int] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Apply an update to the matched chunks, at most ``batch_size`` per transaction.
+
+        Each batch is its own write transaction (retried by the driver on
+        transient errors), so transaction memory stays bounded and locks are
+        released between batches.
+
+        Args:
+            match: MATCH clause binding the chunks as ``n``; the action must make
+                a chunk stop matching, or the loop would not end
+            action: Clause applied to each chunk (e.g. "DETACH DELETE n")
+            params: Query parameters
+            batch_size: Chunks per transaction (defaults to NEO4J_DELETE_BATCH_SIZE)
+            on_progress: Optional callback receiving the running total
+
+        Returns:
+            Number of chunks updated
+        """
+        batch_size = batch_size or settings.NEO4J_DELETE_BATCH_SIZE
+        query = f"{match} WITH n LIMIT $batch_size {action} RETURN count(*) AS updated"
+
+        def update_batch(tx) -> int:
+            return tx.run(query, batch_size=batch_size, **params).single()["updated"]
+
+        total = 0
+        with self.driver.session() as session:
+            while True:
+                updated = session.execute_write(update_batch)
+                total += updated
+                if on_progress:
+                    on_progress(total)
+                if updated < batch_size:
+                    return total
+
+    @profiled("neo4j.delete_client_documents")
+    def delete_client_documents(
+        self,
+        client_doc_id: str,
+        batch_size: Optional[int] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Delete all documents for a client from Neo4j in bounded batches.
+
+        Args:
+            client_doc_id: Client document ID
+            batch_size: Chunks per transaction (defaults to NEO4J_DELETE_BATCH_SIZE)
+            on_progress: Optional callback receiving the running total
+
+        Returns:
+            Number of chunks deleted
         """
         try:
-            with self.driver.session() as session:
-                result = session.run(
-                    """
-                    MATCH (n:DocumentChunk {client_doc_id: $client_doc_id})
-                    DETACH DELETE n
-                    RETURN count(n) as deleted
-                    """,
-                    client_doc_id=client_doc_id,
-                )
-                deleted_count = result.single()["deleted"]
-                logger.info(
-                    f"Deleted {deleted_count} chunks for client: {client_doc_id}"
-                )
+            deleted_count = self._write_in_batches(
+                "MATCH (n:DocumentChunk {client_doc_id: $client_doc_id})",
+                "DETACH DELETE n",
+                {"client_doc_id": client_doc_id},
+                batch_size,
+                on_progress,
+            )
+            logger.info(f"Deleted {deleted_count} chunks for client: {client_doc_id}")
+            return deleted_count
         except Exception as e:
             logger.error(f"Error deleting client documents: {e}")
             raise
 
+    @profiled("neo4j.delete_file_documents")
+    def delete_file_documents(
+        self, client_doc_id: str, source: str, batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Delete the chunks of one file for a client from Neo4j in bounded batches.
+
+        Args:
+            client_doc_id: Client document ID
+            source: Source filename the chunks were created from
+            batch_size: Chunks per transaction (defaults to NEO4J_DELETE_BATCH_SIZE)
+
+        Returns:
+            Number of chunks deleted
+        """
+        try:
+            deleted_count = self._write_in_batches(
+                "MATCH (n:DocumentChunk {client_doc_id: $client_doc_id, source: $source})",
+                "DETACH DELETE n",
+                {"client_doc_id": client_doc_id, "source": source},
+                batch_size,
+            )
+            logger.info(
+                f"Deleted {deleted_count} chunks of {source} for client: {client_doc_id}"
+            )
+            return deleted_count
+        except Exception as e:
+            logger.error(f"Error deleting file documents: {e}")
+            raise
+
+    @profiled("neo4j.delete_stale_file_documents")
+    def delete_stale_file_documents(
+        self,
+        client_doc_id: str,
+        source: str,
+        keep_ids: List[str],
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """
+        Delete a file's chunks left over from its previous version.
+
+        Called after the new version's chunks are written, so the file stays
+        searchable throughout a re-ingest.
+
+        Args:
+            client_doc_id: Client document ID
+            source: Source filename the chunks were created from
+            keep_ids: Node ids of the chunks just written
+            batch_size: Chunks per transaction (defaults to NEO4J_DELETE_BATCH_SIZE)
+
+        Returns:
+            Number of chunks deleted
+        """
+        try:
+            deleted_count = self._write_in_batches(
+                "MATCH (n:DocumentChunk {client_doc_id: $client_doc_id, source: $source}) "
+                "WHERE NOT n.id IN $keep_ids",
+                "DETACH DELETE n",
+                {"client_doc_id": client_doc_id, "source": source, "keep_ids": keep_ids},
+                batch_size,
+            )
+            logger.info(
+                f"Deleted {deleted_count} stale chunks of {source} for client: {client_doc_id}"
+            )
+            return deleted_count
+        except Exception as e:
+            logger.error(f"Error deleting stale file documents: {e}")
+            raise
+
     def close(self) -> None:
         """Close Neo4j driver connection."""
         if self.driver:
@@ -0,0 +1,148 @@
+"""Migration of stored chunks between partition schemes."""
+
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+from config import settings
+from services.neo4j_store import PartitionScheme
+
+if TYPE_CHECKING:
+    from services.neo4j_store import Neo4jVectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionMigrator:
+    """
+    Moves chunks to a new partition scheme while queries keep working.
+
+    The new scheme's vector indexes are created first. The new partition
+    labels are then added next to the old ones, client by client. Chunks
+    keep their old labels, so the old indexes stay complete and searches
+    keep using them. Once every chunk is labelled and the indexes are
+    online, the new scheme is activated. After the other processes have
+    switched, a catch-up pass labels chunks they wrote meanwhile. Only then
+    are the old labels and indexes removed. Each step skips work that is
+    already done, and the replaced scheme is recorded until its cleanup
+    finishes, so an interrupted migration is resumed by running it again.
+    """
+
+    def __init__(
+        self,
+        vector_store: "Neo4jVectorStore",
+        batch_size: Optional[int] = None,
+        catch_up_delay: Optional[float] = None,
+        index_timeout: float = 3600,
+    ):
+        """
+        Initialize partition migrator.
+
+        Args:
+            vector_store: Neo4jVectorStore holding the chunks
+            batch_size: Chunks per transaction (defaults to NEO4J_DELETE_BATCH_SIZE)
+            catch_up_delay: Seconds between the switch and the catch-up pass
+                (defaults to twice EMBEDDING_VERSION_REFRESH_SECONDS)
+            index_timeout: Seconds to wait for new indexes to come online
+        """
+        self.vector_store = vector_store
+        self.batch_size = batch_size or settings.NEO4J_DELETE_BATCH_SIZE
+        self.catch_up_delay = (
+            2 * settings.EMBEDDING_VERSION_REFRESH_SECONDS
+            if catch_up_delay is None
+            else catch_up_delay
+        )
+        self.index_timeout = index_timeout
+
+    def run(
+        self,
+        partitions: int,
+        drop_shared_indexes: bool = False,
+        on_progress: Optional[Callable[..., None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Migrate to ``partitions`` partitions (0 for one shared index).
+
+        Args:
+            partitions: Target partition count
+            drop_shared_indexes: When leaving the unpartitioned layout, also
+                drop the shared vector indexes (they are rebuilt if the layout
+                is ever switched back)
+            on_progress: Optional callback receiving progress fields as keyword
+                arguments (stage, clients_done, clients, chunks_labelled)
+
+        Returns:
+            Counts of labelled and unlabelled chunks and elapsed seconds
+        """
+        if partitions < 0 or partitions == 1:
+            raise ValueError("Partition count must be 0 (no partitioning) or at least 2")
+        progress = on_progress or (lambda **fields: None)
+        started = time.monotonic()
+        store = self.vector_store
+        target = PartitionScheme(partitions)
+        previous = store.partition_scheme
+        # Versions queries may use now or after a running re-embed job switches
+        versions = [
+            version
+            for version in store.list_embedding_versions()
+            if version.status in ("active", "building")
+        ]
+
+        labelled = 0
+        if target == previous:
+            # Already switched: resume an interrupted cleanup, if any
+            previous = store.retiring_partition_scheme()
+            if previous is None:
+                raise ValueError(f"{partitions} partitions is already the active scheme")
+        else:
+            progress(stage="indexes")
+            for version in versions:
+                if not version.dimensions:
+                    embeddings = store.embeddings_for(version.model)
+                    version.dimensions = len(embeddings.embed_query("dimension probe"))
+                store.create_version_indexes(version, target)
+
+            labelled += self._label_all(target, progress)
+            progress(stage="await_indexes")
+            store.await_indexes(self.index_timeout)
+
+            progress(stage="switching")
+            store.activate_partition_scheme(target)
+            logger.info(f"Partition scheme with {partitions} partitions is now active")
+
+            # Other processes may write with the old labels until they notice the switch
+            progress(stage="catch_up")
+            time.sleep(self.catch_up_delay)
+
+        labelled += self._label_all(target, progress)
+
+        progress(stage="cleanup")
+        unlabelled = 0
+        for partition in range(previous.partitions):
+            unlabelled += store.remove_partition_labels(previous, partition, self.batch_size)
+        if previous.partitions or drop_shared_indexes:
+            for version in versions:
+                store.drop_vector_indexes(version, previous)
+        store.finish_partition_migration()
+
+        progress(stage="done")
+        return {
+            "partitions": partitions,
+            "previous_partitions": previous.partitions,
+            "chunks_labelled": labelled,
+            "chunks_unlabelled": unlabelled,
+            "seconds": round(time.monotonic() - started, 1),
+        }
+
+    def _label_all(self, target: PartitionScheme, progress: Callable[..., None]) -> int:
+        """Label every client's chunks for the target scheme; returns chunks labelled."""
+        if not target.partitions:
+            return 0
+        clients = self.vector_store.list_chunk_clients()
+        labelled = 0
+        progress(stage="labels", clients=len(clients), clients_done=0, chunks_labelled=0)
+        for done, client_doc_id in enumerate(clients, start=1):
+            labelled += self.vector_store.label_client_chunks(
+                target, client_doc_id, self.batch_size
+            )
+            progress(clients_done=done, chunks_labelled=labelled)
+        return labelled
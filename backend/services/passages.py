@@ -0,0 +1,301 @@
+"""Post-retrieval passage selection: MMR re-ranking and merging of adjacent chunks."""
+
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from config import settings
+from services.neo4j_store import EMBEDDING_METADATA_KEY
+from services.query_expansion import QueryExpander, rrf_fuse
+from utils.metrics import QUERY_STAGE_SECONDS, timed
+
+if TYPE_CHECKING:
+    from services.neo4j_store import Neo4jVectorStore
+
+logger = logging.getLogger(__name__)
+
+# Trailing counter of a chunk_id ("{source_filename}_{counter}")
+_CHUNK_NUMBER = re.compile(r"_(\d+)$")
+
+# Shortest suffix/prefix match treated as splitter overlap rather than coincidence
+MIN_OVERLAP_CHARS = 8
+
+
+def mmr_select(
+    query_embedding: Sequence[float],
+    embeddings: Sequence[Sequence[float]],
+    k: int,
+    lambda_mult: float = 0.7,
+) -> List[int]:
+    """
+    Pick k candidates by Maximal Marginal Relevance.
+
+    Each step takes the candidate maximising
+    ``lambda_mult * sim(query, c) - (1 - lambda_mult) * max sim(c, selected)``.
+    Similarities are cosine, computed once as matrix products; the running
+    maximum similarity to the selection is updated with one row per step.
+
+    Args:
+        query_embedding: Query vector
+        embeddings: Candidate vectors, best search result first
+        k: Number of candidates to select
+        lambda_mult: 1 ranks by relevance only, 0 by diversity only
+
+    Returns:
+        Indexes into ``embeddings`` in selection order
+    """
+    if not len(embeddings) or k <= 0:
+        return []
+    candidates = np.asarray(embeddings, dtype=np.float32)
+    candidates /= np.maximum(np.linalg.norm(candidates, axis=1, keepdims=True), 1e-12)
+    query = np.asarray(query_embedding, dtype=np.float32)
+    query /= max(float(np.linalg.norm(query)), 1e-12)
+
+    relevance = candidates @ query
+    similarity = candidates @ candidates.T
+    redundancy = np.full(len(candidates), -np.inf, dtype=np.float32)
+    available = np.ones(len(candidates), dtype=bool)
+    selected: List[int] = []
+
+    for _ in range(min(k, len(candidates))):
+        # No redundancy yet for the first pick: pure relevance
+        penalty = np.where(np.isfinite(redundancy), redundancy, 0.0)
+        scores = lambda_mult * relevance - (1 - lambda_mult) * penalty
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, similarity[best], out=redundancy)
+    return selected
+
+
+def _chunk_number(doc: Document) -> Optional[int]:
+    """Sequence number from the chunk_id, None if it has none."""
+    match = _CHUNK_NUMBER.search(str(doc.metadata.get("chunk_id", "")))
+    return int(match.group(1)) if match else None
+
+
+def _join(first: str, second: str) -> str:
+    """Concatenate consecutive chunks, dropping the text the splitter repeated."""
+    for size in range(min(len(first), len(second)), MIN_OVERLAP_CHARS - 1, -1):
+        if first.endswith(second[:size]):
+            return first + second[size:]
+    return f"{first}\n{second}"
+
+
+def merge_passages(docs: List[Document]) -> List[Document]:
+    """
+    Merge consecutive chunks of the same source and location into one passage.
+
+    Chunks of one page (paragraph, line, timestamp) are numbered in order,
+    and neighbours share CHUNK_OVERLAP characters. Runs of consecutive
+    chunk numbers are joined with the repeated text removed, and the merged
+    passage lists its chunks under ``chunk_ids``. A merged passage takes
+    the rank of its best-ranked chunk; other documents are kept as they are.
+
+    Args:
+        docs: Retrieved documents, best first
+
+    Returns:
+        Passages, best first
+    """
+    groups: Dict[Tuple[str, str], List[Tuple[int, int, Document]]] = {}
+    passages: List[Tuple[int, Document]] = []
+    for rank, doc in enumerate(docs):
+        number = _chunk_number(doc)
+        if number is None:
+            passages.append((rank, doc))
+            continue
+        key = (doc.metadata.get("source", ""), doc.metadata.get("location", ""))
+        groups.setdefault(key, []).append((number, rank, doc))
+
+    for members in groups.values():
+        members.sort(key=lambda member: member[0])
+        run = [members[0]]
+        for member in members[1:] + [None]:
+            if member is not None and member[0] - run[-1][0] <= 1:
+                if member[0] != run[-1][0]:
+                    run.append(member)
+                continue
+            passages.append(_merge_run(run))
+            if member is not None:
+                run = [member]
+
+    passages.sort(key=lambda passage: passage[0])
+    return [doc for _, doc in passages]
+
+
+def _merge_run(run: List[Tuple[int, int, Document]]) -> Tuple[int, Document]:
+    """One passage (with the best rank) from chunks with consecutive numbers."""
+    best_rank = min(rank for _, rank, _ in run)
+    if len(run) == 1:
+        return best_rank, run[0][2]
+    text = run[0][2].page_content
+    for _, _, doc in run[1:]:
+        text = _join(text, doc.page_content)
+    metadata = dict(run[0][2].metadata)
+    metadata["chunk_ids"] = [doc.metadata.get("chunk_id") for _, _, doc in run]
+    return best_rank, Document(page_content=text, metadata=metadata)
+
+
+class PassageRetriever:
+    """
+    Client-scoped retrieval returning distinct passages for the prompt.
+
+    Consecutive chunks of a page overlap, and a plain top-k search often
+    returns several of them. The retriever fetches a larger candidate set
+    with its vectors, picks k by Maximal Marginal Relevance and merges the
+    consecutive chunks that remain, so the prompt carries more distinct
+    evidence per token.
+
+    With query expansion on, the question is also rewritten into several
+    search queries. They are embedded in one request and searched
+    concurrently, and their results are fused by rank into the candidate
+    set, so one retrieval covers wordings the agent would otherwise try in
+    further LLM iterations.
+    """
+
+    def __init__(
+        self,
+        vector_store: "Neo4jVectorStore",
+        mmr: Optional[bool] = None,
+        lambda_mult: Optional[float] = None,
+        candidates: Optional[int] = None,
+        merge_adjacent: Optional[bool] = None,
+        expander: Optional[QueryExpander] = None,
+    ):
+        """
+        Initialize passage retriever.
+
+        Args:
+            vector_store: Neo4jVectorStore to search
+            mmr: Re-rank candidates by MMR (defaults to RETRIEVAL_MMR)
+            lambda_mult: MMR relevance weight (defaults to RETRIEVAL_MMR_LAMBDA)
+            candidates: Candidates fetched per returned passage (defaults to
+                RETRIEVAL_MMR_CANDIDATES)
+            merge_adjacent: Merge consecutive chunks (defaults to RETRIEVAL_MERGE_ADJACENT)
+            expander: Query expander (defaults to one configured by RETRIEVAL_EXPANSION)
+        """
+        self.vector_store = vector_store
+        self.mmr = settings.RETRIEVAL_MMR if mmr is None else mmr
+        self.lambda_mult = (
+            settings.RETRIEVAL_MMR_LAMBDA if lambda_mult is None else lambda_mult
+        )
+        self.candidates = candidates or settings.RETRIEVAL_MMR_CANDIDATES
+        self.merge_adjacent = (
+            settings.RETRIEVAL_MERGE_ADJACENT if merge_adjacent is None else merge_adjacent
+        )
+        self.expander = expander or QueryExpander()
+        # Threads for the searches of one expanded question
+        self._search_pool = (
+            ThreadPoolExecutor(
+                max_workers=self.expander.max_queries, thread_name_prefix="expanded-search"
+            )
+            if self.expander.enabled
+            else None
+        )
+
+    def retrieve(
+        self,
+        query: str,
+        client_doc_id: str,
+        k: Optional[int] = None,
+        query_embedding: Optional[List[float]] = None,
+    ) -> List[Document]:
+        """
+        Retrieve passages for a query.
+
+        Args:
+            query: Search query text
+            client_doc_id: Client document ID for filtering
+            k: Number of chunks to select (defaults to RETRIEVAL_K); merging
+                can return fewer passages
+            query_embedding: Query vector already computed by the vector store
+
+        Returns:
+            List of passage Documents with metadata, best first
+        """
+        k = k or settings.RETRIEVAL_K
+        use_mmr = self.mmr and self.candidates > 1
+        queries = self.expander.expand(query)
+        if len(queries) > 1:
+            docs = self._search_expanded(queries, client_doc_id, k, use_mmr, query_embedding)
+        elif use_mmr:
+            docs = self._search_mmr(query, client_doc_id, k, query_embedding)
+        else:
+            docs = self.vector_store.search_by_client(
+                query, client_doc_id, k=k, query_embedding=query_embedding
+            )
+        return merge_passages(docs) if self.merge_adjacent else docs
+
+    def _search_mmr(
+        self,
+        query: str,
+        client_doc_id: str,
+        k: int,
+        query_embedding: Optional[List[float]] = None,
+    ) -> List[Document]:
+        """Fetch candidates with their vectors and keep k by MMR."""
+        if query_embedding is None:
+            query_embedding = self.vector_store.embed_query(query)
+        docs = self.vector_store.search_by_client(
+            query,
+            client_doc_id,
+            k=k * self.candidates,
+            query_embedding=query_embedding,
+            with_embeddings=True,
+        )
+        return self._select(docs, query_embedding, k)
+
+    def _search_expanded(
+        self,
+        queries: List[str],
+        client_doc_id: str,
+        k: int,
+        use_mmr: bool,
+        query_embedding: Optional[List[float]] = None,
+    ) -> List[Document]:
+        """Embed the queries in one request, search them concurrently and fuse by rank."""
+        if query_embedding is None:
+            embeddings = self.vector_store.embed_queries(queries)
+        else:
+            embeddings = [query_embedding] + self.vector_store.embed_queries(queries[1:])
+        fetch = k * self.candidates if use_mmr else k
+
+        results = list(
+            self._search_pool.map(
+                lambda pair: self.vector_store.search_by_client(
+                    pair[0],
+                    client_doc_id,
+                    k=fetch,
+                    query_embedding=pair[1],
+                    with_embeddings=use_mmr,
+                ),
+                zip(queries, embeddings),
+            )
+        )
+        docs = rrf_fuse(results)[:fetch]
+        if not use_mmr:
+            return docs
+        # Relevance for MMR: the centroid of all queries, not just the question
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return self._select(docs, vectors.mean(axis=0).tolist(), k)
+
+    def _select(
+        self, docs: List[Document], query_embedding: List[float], k: int
+    ) -> List[Document]:
+        """Keep k of the candidates by MMR, removing their vectors from the metadata."""
+        vectors = [doc.metadata.pop(EMBEDDING_METADATA_KEY, None) for doc in docs]
+        if len(docs) <= k:
+            return docs
+        if any(vector is None for vector in vectors):
+            logger.warning("Search results without vectors; skipping MMR re-ranking")
+            return docs[:k]
+
+        with timed(QUERY_STAGE_SECONDS, "rerank"):
+            selected = mmr_select(query_embedding, vectors, k, self.lambda_mult)
+        return [docs[index] for index in selected]
@@ -0,0 +1,175 @@
+"""Expansion of a question into several search queries, and rank fusion of their results."""
+
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from langchain_core.documents import Document
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+EXPANSION_MODES = ("off", "rules", "llm")
+
+# Reciprocal rank fusion constant; larger values flatten the weight of top ranks
+RRF_K = 60
+
+_WORD = re.compile(r"[A-Za-z0-9][A-Za-z0-9'.-]*")
+# Clause boundaries: ";", "?" or "and" before another question word
+_CLAUSES = re.compile(
+    r"\s*(?:;|\?|,?\s+\band\s+(?=(?:what|who|when|where|why|how|is|are|was|were|did|does|do)\b))\s*",
+    re.I,
+)
+_THINK = re.compile(r"<think>.*?</think>", re.S)
+
+_STOPWORDS = frozenset(
+    """a an and any are as at be been being by can could did do does for from had has
+    have how i if in into is it its me my of on or our please say says said should
+    tell that the their them there these they this those to under was we were what
+    when where which who whom why will with would you your""".split()
+)
+
+# Legal terms and the wording documents tend to use for them instead
+LEGAL_SYNONYMS: Dict[str, str] = {
+    "alibi": "whereabouts at the time witness",
+    "parole": "parole board release hearing",
+    "innocence": "wrongful conviction exculpatory evidence",
+    "indemnity": "indemnify hold harmless liability",
+    "termination": "terminate notice period expiry",
+    "payment": "fees invoice payment terms",
+    "confidentiality": "confidential information non-disclosure",
+    "liability": "liable damages limitation of liability",
+    "breach": "breach default failure to perform",
+    "warranty": "warrants represents representations",
+    "sentence": "sentencing term of imprisonment",
+    "evidence": "exhibit testimony evidence",
+}
+
+LLM_EXPANSION_PROMPT = """Rewrite the question below as {count} short, different search queries for finding the relevant passages in legal documents. Use the wording the documents themselves would likely use. Write one query per line, with no numbering or other text.
+
+Question: {question}
+Queries:"""
+
+
+def rrf_fuse(
+    result_lists: Sequence[List[Document]],
+    key: Callable[[Document], Any] = lambda doc: doc.metadata.get("chunk_id"),
+    k: int = RRF_K,
+) -> List[Document]:
+    """
+    Fuse ranked result lists by Reciprocal Rank Fusion.
+
+    A document scores ``sum(1 / (k + rank))`` over the lists containing it.
+
+    Args:
+        result_lists: Ranked results of each query
+        key: Identity of a document across lists
+        k: Fusion constant
+
+    Returns:
+        Distinct documents by fused score, best first (first instance kept)
+    """
+    scores: Dict[Any, float] = {}
+    first: Dict[Any, Document] = {}
+    for results in result_lists:
+        for rank, doc in enumerate(results, start=1):
+            doc_key = key(doc)
+            scores[doc_key] = scores.get(doc_key, 0.0) + 1.0 / (k + rank)
+            first.setdefault(doc_key, doc)
+    return [first[doc_key] for doc_key in sorted(scores, key=scores.get, reverse=True)]
+
+
+class QueryExpander:
+    """
+    Turns one question into several search queries.
+
+    ``rules`` mode is free: the question's clauses become separate queries,
+    and a keyword query adds the document wording of known legal terms.
+    ``llm`` mode asks the chat model for rewrites (one short call) and falls
+    back to the rules when the call fails. The original question is always
+    the first query.
+    """
+
+    def __init__(self, mode: Optional[str] = None, max_queries: Optional[int] = None, llm=None):
+        """
+        Initialize query expander.
+
+        Args:
+            mode: One of EXPANSION_MODES (defaults to RETRIEVAL_EXPANSION)
+            max_queries: Most queries, original included (defaults to
+                RETRIEVAL_EXPANSION_QUERIES)
+            llm: Chat model for ``llm`` mode (a ChatOllama is built on first use)
+        """
+        self.mode = mode or settings.RETRIEVAL_EXPANSION
+        if self.mode not in EXPANSION_MODES:
+            raise ValueError(
+                f"Unknown expansion mode {self.mode!r}; expected one of {EXPANSION_MODES}"
+            )
+        self.max_queries = max(1, max_queries or settings.RETRIEVAL_EXPANSION_QUERIES)
+        self._llm = llm
+
+    @property
+    def enabled(self) -> bool:
+        """Whether questions are expanded at all."""
+        return self.mode != "off" and self.max_queries > 1
+
+    def expand(self, question: str) -> List[str]:
+        """
+        Search queries for a question.
+
+        Args:
+            question: User question (or the agent's search input)
+
+        Returns:
+            Distinct queries, the question first, at most max_queries
+        """
+        if not self.enabled:
+            return [question]
+        extra: List[str] = []
+        if self.mode == "llm":
+            try:
+                extra = self._llm_queries(question)
+            except Exception as e:
+                logger.warning(f"LLM query expansion failed, using rules: {e}")
+        if not extra:
+            extra = self._rule_queries(question)
+
+        queries, seen = [question], {question.strip().lower()}
+        for query in extra:
+            normalized = query.strip().lower()
+            if normalized and normalized not in seen:
+                seen.add(normalized)
+                queries.append(query.strip())
+        return queries[: self.max_queries]
+
+    def _rule_queries(self, question: str) -> List[str]:
+        """Clause split and keyword/synonym queries."""
+        clauses = [clause for clause in _CLAUSES.split(question) if len(_WORD.findall(clause)) > 1]
+        queries = clauses if len(clauses) > 1 else []
+
+        keywords = [
+            word for word in _WORD.findall(question.lower()) if word not in _STOPWORDS
+        ]
+        if keywords:
+            queries.append(" ".join(keywords))
+            synonyms = [LEGAL_SYNONYMS[word] for word in keywords if word in LEGAL_SYNONYMS]
+            if synonyms:
+                queries.append(" ".join(keywords + synonyms))
+        return queries
+
+    def _llm_queries(self, question: str) -> List[str]:
+        """Rewrites from the chat model, one per line."""
+        if self._llm is None:
+            from langchain_ollama import ChatOllama
+
+            self._llm = ChatOllama(
+                model=settings.RETRIEVAL_EXPANSION_MODEL or settings.OLLAMA_MODEL,
+                base_url=settings.OLLAMA_BASE_URL,
+                temperature=0,
+                num_predict=128,
+                keep_alive=settings.OLLAMA_KEEP_ALIVE,
+            )
+        prompt = LLM_EXPANSION_PROMPT.format(count=self.max_queries - 1, question=question)
+        reply = _THINK.sub("", str(self._llm.invoke(prompt).content))
+        lines = [re.sub(r"^\s*(?:[-*]|\d+[.)])\s*", "", line) for line in reply.splitlines()]
+        return [line for line in lines if len(_WORD.findall(line)) > 1]
@@ -0,0 +1,173 @@
+"""Background re-embedding of stored chunks when the embedding model changes."""
+
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+from config import settings
+from services.jobs import Job
+from services.neo4j_store import version_name
+
+if TYPE_CHECKING:
+    from services.neo4j_store import EmbeddingVersion, Neo4jVectorStore
+
+logger = logging.getLogger(__name__)
+
+# Chunks read per keyset page while looking for missing vectors
+SCAN_PAGE_SIZE = 1000
+
+# Passes before the switch; each one picks up chunks ingested during the last
+MAX_FILL_PASSES = 3
+
+
+class Reembedder:
+    """
+    Fills a new embedding version from stored chunk texts, then switches to it.
+
+    Queries keep using the active version while the new one is built. The
+    job pages through chunks by id and only embeds those still missing the
+    new vector, so a cancelled or failed run resumes where it stopped when
+    started again. Once every chunk has a vector the new version is
+    activated in one transaction. Other API processes switch at their next
+    version check, and writes they make until then go to the old property,
+    so a final catch-up pass runs after that delay.
+    """
+
+    def __init__(
+        self,
+        vector_store: "Neo4jVectorStore",
+        batch_size: Optional[int] = None,
+        max_texts_per_second: Optional[float] = None,
+        catch_up_delay: Optional[float] = None,
+    ):
+        """
+        Initialize re-embedder.
+
+        Args:
+            vector_store: Neo4jVectorStore holding the chunks
+            batch_size: Texts per embedding request and write (defaults to REEMBED_BATCH_SIZE)
+            max_texts_per_second: Throughput cap, 0 for none (defaults to
+                REEMBED_MAX_TEXTS_PER_SECOND)
+            catch_up_delay: Seconds between the switch and the catch-up pass
+                (defaults to twice EMBEDDING_VERSION_REFRESH_SECONDS)
+        """
+        self.vector_store = vector_store
+        self.batch_size = batch_size or settings.REEMBED_BATCH_SIZE
+        self.max_texts_per_second = (
+            settings.REEMBED_MAX_TEXTS_PER_SECOND
+            if max_texts_per_second is None
+            else max_texts_per_second
+        )
+        self.catch_up_delay = (
+            2 * settings.EMBEDDING_VERSION_REFRESH_SECONDS
+            if catch_up_delay is None
+            else catch_up_delay
+        )
+
+    def check_model(self, model: str) -> None:
+        """
+        Reject a migration to the model already in use.
+
+        Args:
+            model: Embedding model to migrate to
+
+        Raises:
+            ValueError: If the model's version is the active one
+        """
+        if version_name(model) == self.vector_store.active_version.name:
+            raise ValueError(f"{model} is already the active embedding model")
+
+    def run(self, model: str, job: Job) -> Dict[str, Any]:
+        """
+        Build the embedding version for a model and make it active.
+
+        Args:
+            model: Embedding model to migrate to
+            job: Job receiving progress and honouring cancellation
+
+        Returns:
+            Version name, chunks embedded and elapsed seconds
+        """
+        started = time.monotonic()
+        embeddings = self.vector_store.embeddings_for(model)
+        dimensions = len(embeddings.embed_query("dimension probe"))
+        version = self.vector_store.prepare_embedding_version(model, dimensions)
+        logger.info(f"Re-embedding chunks into version {version.name} ({dimensions} dims)")
+
+        coverage = self.vector_store.version_coverage(version)
+        job.update(stage="embedding", version=version.name, **coverage)
+
+        embedded = 0
+        for _ in range(MAX_FILL_PASSES):
+            written = self._fill(version, embeddings, job, coverage)
+            embedded += written
+            if not written:
+                break
+
+        job.check_cancelled()
+        job.update(stage="switching")
+        self.vector_store.activate_embedding_version(version.name)
+        logger.info(f"Embedding version {version.name} is now active")
+
+        # Other processes may write to the old property until they notice the switch
+        job.update(stage="catch_up")
+        deadline = time.monotonic() + self.catch_up_delay
+        while time.monotonic() < deadline:
+            job.check_cancelled()
+            time.sleep(min(1.0, max(0.0, deadline - time.monotonic())))
+        embedded += self._fill(version, embeddings, job, coverage)
+
+        job.update(stage="done")
+        return {
+            "version": version.name,
+            "model": model,
+            "chunks_embedded": embedded,
+            "seconds": round(time.monotonic() - started, 1),
+        }
+
+    def _fill(
+        self, version: "EmbeddingVersion", embeddings, job: Job, coverage: Dict[str, int]
+    ) -> int:
+        """
+        One pass over all chunks, embedding those without the version's vector.
+
+        Returns:
+            Number of chunks embedded
+        """
+        after, written = "", 0
+        pass_started = time.monotonic()
+        while True:
+            job.check_cancelled()
+            page = self.vector_store.scan_chunks(version, after, SCAN_PAGE_SIZE)
+            if not page:
+                return written
+            after = page[-1][0]
+            missing = [(chunk_id, text) for chunk_id, text, absent in page if absent and text]
+
+            for start in range(0, len(missing), self.batch_size):
+                batch = missing[start:start + self.batch_size]
+                batch_started = time.monotonic()
+                vectors = embeddings.embed_documents([text for _, text in batch])
+                self.vector_store.write_version_embeddings(
+                    version, [chunk_id for chunk_id, _ in batch], vectors
+                )
+                written += len(batch)
+                coverage["embedded"] = min(coverage["total"], coverage["embedded"] + len(batch))
+
+                rate = written / max(time.monotonic() - pass_started, 1e-9)
+                remaining = coverage["total"] - coverage["embedded"]
+                job.update(
+                    embedded=coverage["embedded"],
+                    texts_per_second=round(rate, 1),
+                    eta_seconds=round(remaining / rate) if rate else None,
+                )
+                self._throttle(len(batch), batch_started)
+                job.check_cancelled()
+
+    def _throttle(self, texts: int, batch_started: float) -> None:
+        """Sleep so that throughput stays under max_texts_per_second."""
+        if self.max_texts_per_second <= 0:
+            return
+        minimum = texts / self.max_texts_per_second
+        elapsed = time.monotonic() - batch_started
+        if elapsed < minimum:
+            time.sleep(minimum - elapsed)
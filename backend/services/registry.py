@@ -0,0 +1,249 @@
+"""Lazily constructed service singletons shared by the API and CLI tools."""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional
+from config import settings
+
+if TYPE_CHECKING:
+    from services.agent import LegalRAGAgent
+    from services.archive_ingest import ArchiveIngestor
+    from services.batch_query import BatchQueryRunner
+    from services.deletion import ClientDeleter
+    from services.document_processor import DocumentProcessor
+    from services.ingest_pipeline import IngestPipeline
+    from services.jobs import JobManager
+    from services.model_residency import ModelResidencyManager
+    from services.neo4j_store import Neo4jVectorStore
+    from services.reembedding import Reembedder
+    from services.sessions import SessionStore
+    from services.summarization import DocumentSummarizer
+    from services.supabase_service import SupabaseService
+
+logger = logging.getLogger(__name__)
+
+_instances: Dict[str, Any] = {}
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _get_or_create(name: str, factory: Callable[[], Any]) -> Any:
+    """
+    Return the named singleton, constructing it on first use.
+
+    Construction is serialized per service, so concurrent first requests build
+    it once while different services can still be built in parallel. A failed
+    construction is not cached; the next call retries.
+    """
+    instance = _instances.get(name)
+    if instance is not None:
+        return instance
+
+    with _locks_guard:
+        lock = _locks.setdefault(name, threading.Lock())
+
+    with lock:
+        instance = _instances.get(name)
+        if instance is None:
+            started = time.perf_counter()
+            instance = factory()
+            _instances[name] = instance
+            logger.info(
+                f"Initialized {name} in {time.perf_counter() - started:.3f}s"
+            )
+    return instance
+
+
+def get_supabase_service() -> "SupabaseService":
+    """Return the shared SupabaseService."""
+    from services.supabase_service import SupabaseService
+
+    return _get_or_create("supabase", SupabaseService)
+
+
+def get_document_processor() -> "DocumentProcessor":
+    """Return the shared DocumentProcessor."""
+    from services.document_processor import DocumentProcessor
+
+    return _get_or_create("document_processor", DocumentProcessor)
+
+
+def get_vector_store() -> "Neo4jVectorStore":
+    """Return the shared Neo4jVectorStore."""
+    from services.neo4j_store import Neo4jVectorStore
+
+    return _get_or_create("vector_store", Neo4jVectorStore)
+
+
+def get_summarizer() -> "DocumentSummarizer":
+    """Return the shared DocumentSummarizer."""
+    from services.summarization import DocumentSummarizer
+
+    return _get_or_create("summarizer", DocumentSummarizer)
+
+
+def get_rag_agent() -> "LegalRAGAgent":
+    """Return the shared LegalRAGAgent."""
+    from services.agent import LegalRAGAgent
+
+    return _get_or_create("rag_agent", lambda: LegalRAGAgent(get_vector_store()))
+
+
+def get_batch_query_runner() -> "BatchQueryRunner":
+    """Return the shared BatchQueryRunner."""
+    from services.batch_query import BatchQueryRunner
+
+    return _get_or_create("batch_query", lambda: BatchQueryRunner(get_rag_agent()))
+
+
+def get_session_store() -> "SessionStore":
+    """Return the shared SessionStore."""
+    from services.sessions import SessionStore
+
+    return _get_or_create("sessions", SessionStore)
+
+
+def get_ingest_pipeline() -> "IngestPipeline":
+    """Return the shared IngestPipeline."""
+    from services.ingest_pipeline import IngestPipeline
+
+    return _get_or_create(
+        "ingest_pipeline",
+        lambda: IngestPipeline(
+            get_supabase_service(), get_document_processor(), get_vector_store()
+        ),
+    )
+
+
+def get_archive_ingestor() -> "ArchiveIngestor":
+    """Return the shared ArchiveIngestor."""
+    from services.archive_ingest import ArchiveIngestor
+
+    return _get_or_create("archive_ingestor", lambda: ArchiveIngestor(get_ingest_pipeline()))
+
+
+def get_client_deleter() -> "ClientDeleter":
+    """Return the shared ClientDeleter."""
+    from services.deletion import ClientDeleter
+
+    return _get_or_create(
+        "client_deleter", lambda: ClientDeleter(get_supabase_service(), get_vector_store())
+    )
+
+
+def get_reembedder() -> "Reembedder":
+    """Return the shared Reembedder."""
+    from services.reembedding import Reembedder
+
+    return _get_or_create("reembedder", lambda: Reembedder(get_vector_store()))
+
+
+def get_job_manager() -> "JobManager":
+    """Return the shared background JobManager."""
+    from services.jobs import JobManager
+
+    return _get_or_create("jobs", lambda: JobManager(settings.JOBS_MAX_FINISHED))
+
+
+def get_model_residency() -> "ModelResidencyManager":
+    """Return the shared ModelResidencyManager for the chat and embedding models."""
+    from services.model_residency import ModelResidencyManager, parse_policies
+
+    return _get_or_create(
+        "model_residency",
+        lambda: ModelResidencyManager(
+            base_url=settings.OLLAMA_BASE_URL,
+            models={
+                settings.OLLAMA_MODEL: "generate",
+                settings.OLLAMA_EMBEDDING_MODEL: "embed",
+            },
+            policies=parse_policies(settings.MODEL_RESIDENCY_POLICIES),
+            default_keep_alive=settings.OLLAMA_KEEP_ALIVE,
+            interval=settings.MODEL_KEEPALIVE_INTERVAL,
+            cold_load_threshold=settings.MODEL_COLD_LOAD_THRESHOLD,
+            timezone=settings.MODEL_RESIDENCY_TIMEZONE,
+        ),
+    )
+
+
+def peek(name: str) -> Optional[Any]:
+    """
+    Return a service only if it has already been constructed.
+
+    Args:
+        name: Service name (e.g. "supabase", "vector_store")
+
+    Returns:
+        The instance, or None if it has not been built yet
+    """
+    return _instances.get(name)
+
+
+def set_instance(name: str, instance: Any) -> None:
+    """
+    Install a ready-made service (used by benchmarks and tests to swap backends).
+
+    Args:
+        name: Service name (e.g. "supabase", "vector_store")
+        instance: Service instance returned by the matching getter from now on
+    """
+    _instances[name] = instance
+
+
+# Services built during warm-up, by name
+WARMUP_GETTERS: Dict[str, Callable[[], Any]] = {
+    "supabase": get_supabase_service,
+    "document_processor": get_document_processor,
+    "vector_store": get_vector_store,
+    "summarizer": get_summarizer,
+    "rag_agent": get_rag_agent,
+}
+
+
+async def warm_up(names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Construct services in parallel worker threads.
+
+    A service that fails to start is logged and reported, not raised, so the
+    application still boots and retries construction on first use.
+
+    Args:
+        names: Service names from WARMUP_GETTERS
+
+    Returns:
+        Dictionary of service name -> {"seconds", "ok", "error"}
+    """
+
+    async def build(name: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(WARMUP_GETTERS[name])
+            error = None
+        except Exception as e:
+            logger.warning(f"Warm-up of {name} failed: {e}")
+            error = str(e)
+        return {
+            "seconds": round(time.perf_counter() - started, 3),
+            "ok": error is None,
+            "error": error,
+        }
+
+    names = [name for name in names if name in WARMUP_GETTERS]
+    results = await asyncio.gather(*(build(name) for name in names))
+    return dict(zip(names, results))
+
+
+def close_all() -> None:
+    """Release resources held by constructed services."""
+    for name in ("vector_store", "supabase"):
+        # Test stand-ins registered with set_instance may have nothing to close
+        close = getattr(_instances.get(name), "close", None)
+        if close is None:
+            continue
+        try:
+            close()
+        except Exception as e:
+            logger.warning(f"Error closing {name}: {e}")
+    _instances.clear()
@@ -0,0 +1,214 @@
+"""Resumable chunked uploads to Supabase Storage using the TUS protocol."""
+
+import base64
+import logging
+import os
+import time
+from typing import Dict, Optional, Union
+import httpx
+
+logger = logging.getLogger(__name__)
+
+TUS_VERSION = "1.0.0"
+
+# Status codes after which a part is retried (conflict/locked mean the
+# server's offset moved; 5xx and 429 are transient)
+RETRYABLE_STATUS_CODES = {409, 423, 429, 500, 502, 503, 504}
+
+
+class ResumableUploadError(Exception):
+    """Raised when a resumable upload cannot be completed."""
+
+
+class ResumableUploader:
+    """
+    TUS client that uploads a file in fixed-size parts with per-part retry.
+
+    After a failed part the server is asked for its current offset (HEAD) and
+    the upload resumes from there, so a network blip costs one part rather
+    than the whole file. Parts are read from disk at their offset, so memory
+    use is bounded by the part size.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        headers: Dict[str, str],
+        chunk_size: int,
+        max_retries: int = 5,
+        retry_backoff: float = 0.5,
+        timeout: float = 120.0,
+    ):
+        """
+        Initialize resumable uploader.
+
+        Args:
+            endpoint: TUS creation endpoint (e.g. {SUPABASE_URL}/storage/v1/upload/resumable)
+            headers: Auth headers sent with every request
+            chunk_size: Bytes per PATCH request
+            max_retries: Attempts per part before giving up
+            retry_backoff: Base delay in seconds, doubled after each failed attempt
+            timeout: Per-request timeout in seconds
+        """
+        self.endpoint = endpoint
+        self.headers = {**headers, "Tus-Resumable": TUS_VERSION}
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.timeout = timeout
+
+    def upload(
+        self,
+        data: Union[bytes, str],
+        bucket: str,
+        object_name: str,
+        content_type: str = "application/octet-stream",
+        upsert: bool = True,
+    ) -> str:
+        """
+        Upload bytes or a local file as a storage object.
+
+        Args:
+            data: File content as bytes, or a local file path
+            bucket: Storage bucket name
+            object_name: Object path inside the bucket
+            content_type: MIME type stored with the object
+            upsert: Overwrite an existing object with the same path
+
+        Returns:
+            Object path of the uploaded file
+        """
+        size = len(data) if isinstance(data, bytes) else os.path.getsize(data)
+
+        with httpx.Client(timeout=self.timeout) as http:
+            upload_url = self._create(http, size, bucket, object_name, content_type, upsert)
+            offset = 0
+            parts = 0
+
+            file = None if isinstance(data, bytes) else open(data, "rb")
+            try:
+                while offset < size:
+                    offset = self._send_part(http, upload_url, data, file, offset)
+                    parts += 1
+            finally:
+                if file:
+                    file.close()
+
+        logger.info(
+            f"Resumable upload complete: {object_name} ({size} bytes, {parts} parts)"
+        )
+        return object_name
+
+    def _create(
+        self,
+        http: httpx.Client,
+        size: int,
+        bucket: str,
+        object_name: str,
+        content_type: str,
+        upsert: bool,
+    ) -> str:
+        """Create the upload on the server and return its URL."""
+        metadata = {
+            "bucketName": bucket,
+            "objectName": object_name,
+            "contentType": content_type,
+            "cacheControl": "3600",
+        }
+        encoded = ",".join(
+            f"{key} {base64.b64encode(value.encode()).decode()}"
+            for key, value in metadata.items()
+        )
+        headers = {
+            **self.headers,
+            "Upload-Length": str(size),
+            "Upload-Metadata": encoded,
+            "x-upsert": "true" if upsert else "false",
+        }
+
+        response = self._request_with_retry(http, "POST", self.endpoint, headers=headers)
+        if response.status_code != 201 or "location" not in response.headers:
+            raise ResumableUploadError(
+                f"Failed to create upload for {object_name}: "
+                f"{response.status_code} {response.text}"
+            )
+        return str(httpx.URL(self.endpoint).join(response.headers["location"]))
+
+    def _send_part(
+        self,
+        http: httpx.Client,
+        upload_url: str,
+        data: Union[bytes, str],
+        file,
+        offset: int,
+    ) -> int:
+        """Send one part starting at offset, retrying and resyncing on failure."""
+        for attempt in range(self.max_retries + 1):
+            if file:
+                file.seek(offset)
+                chunk = file.read(self.chunk_size)
+            else:
+                chunk = data[offset : offset + self.chunk_size]
+
+            headers = {
+                **self.headers,
+                "Upload-Offset": str(offset),
+                "Content-Type": "application/offset+octet-stream",
+            }
+            try:
+                response = http.patch(upload_url, headers=headers, content=chunk)
+                if response.status_code == 204:
+                    return int(response.headers["upload-offset"])
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    raise ResumableUploadError(
+                        f"Upload part at offset {offset} rejected: "
+                        f"{response.status_code} {response.text}"
+                    )
+                error = f"HTTP {response.status_code}"
+            except httpx.TransportError as e:
+                error = str(e) or e.__class__.__name__
+
+            if attempt == self.max_retries:
+                break
+
+            logger.warning(
+                f"Upload part at offset {offset} failed ({error}); "
+                f"retry {attempt + 1}/{self.max_retries}"
+            )
+            time.sleep(self.retry_backoff * (2**attempt))
+
+            # The server may have stored part of the chunk; resume from its offset
+            server_offset = self._get_offset(http, upload_url)
+            if server_offset is not None and server_offset != offset:
+                return server_offset
+
+        raise ResumableUploadError(
+            f"Upload part at offset {offset} failed after {self.max_retries} retries"
+        )
+
+    def _get_offset(self, http: httpx.Client, upload_url: str) -> Optional[int]:
+        """Ask the server how many bytes of the upload it has."""
+        try:
+            response = http.head(upload_url, headers=self.headers)
+            if response.status_code in (200, 204):
+                return int(response.headers["upload-offset"])
+        except (httpx.TransportError, KeyError, ValueError) as e:
+            logger.warning(f"Could not fetch upload offset: {e}")
+        return None
+
+    def _request_with_retry(
+        self, http: httpx.Client, method: str, url: str, **kwargs
+    ) -> httpx.Response:
+        """Send a request, retrying transient failures with backoff."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = http.request(method, url, **kwargs)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    return response
+                error = f"HTTP {response.status_code}"
+            except httpx.TransportError as e:
+                error = str(e) or e.__class__.__name__
+            if attempt == self.max_retries:
+                raise ResumableUploadError(f"{method} {url} failed: {error}")
+            time.sleep(self.retry_backoff * (2**attempt))
+        raise ResumableUploadError(f"{method} {url} failed")
@@ -0,0 +1,176 @@
+"""Conversational query sessions with an append-only prompt and per-session passages."""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from langchain_core.documents import Document
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def passage_key(doc: Document) -> Tuple:
+    """Identity of a passage (merged passages by their chunks)."""
+    return (
+        doc.metadata.get("source"),
+        doc.metadata.get("chunk_id"),
+        tuple(doc.metadata.get("chunk_ids", ())),
+    )
+
+
+@dataclass
+class SessionTurn:
+    """One question and answer, with the passages first sent with it."""
+
+    content: str  # User message: new passages and the question
+    answer: str
+    passages: List[Tuple] = field(default_factory=list)
+    tokens: int = 0
+
+
+class ConversationSession:
+    """
+    One client's conversation: its turns and the passages already in the prompt.
+
+    The prompt of a turn is the system message followed by every earlier
+    turn verbatim and the new user message, so each prompt extends the
+    previous one and Ollama can reuse its cached prefix. A turn's user
+    message carries only the retrieved passages not sent before. Turns of a
+    session run one at a time (``lock``).
+    """
+
+    def __init__(self, client_doc_id: str, max_tokens: int):
+        """
+        Initialize session.
+
+        Args:
+            client_doc_id: Client whose documents the session queries
+            max_tokens: Most tokens kept in the conversation
+        """
+        self.id = uuid.uuid4().hex
+        self.client_doc_id = client_doc_id
+        self.max_tokens = max_tokens
+        self.turns: List[SessionTurn] = []
+        self.sent: Set[Tuple] = set()
+        self.tokens = 0
+        self.created_at = time.time()
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+
+    def new_passages(self, docs: List[Document]) -> List[Document]:
+        """Retrieved passages not yet in the conversation."""
+        return [doc for doc in docs if passage_key(doc) not in self.sent]
+
+    def add_turn(self, turn: SessionTurn) -> int:
+        """
+        Append a turn, dropping the oldest ones beyond max_tokens.
+
+        Passages of dropped turns leave the conversation and are sent again
+        when retrieved later. Dropping changes the prompt prefix, so the
+        next turn is prefilled in full once.
+
+        Returns:
+            Number of turns dropped
+        """
+        self.last_used = time.monotonic()
+        self.turns.append(turn)
+        self.sent.update(turn.passages)
+        self.tokens += turn.tokens
+        dropped = 0
+        while self.tokens > self.max_tokens and len(self.turns) > 1:
+            oldest = self.turns.pop(0)
+            self.sent.difference_update(oldest.passages)
+            self.tokens -= oldest.tokens
+            dropped += 1
+        return dropped
+
+    def to_dict(self, idle_seconds: float) -> Dict[str, Any]:
+        """Session state for API responses."""
+        return {
+            "session_id": self.id,
+            "client_doc_id": self.client_doc_id,
+            "turns": len(self.turns),
+            "passages": len(self.sent),
+            "tokens": self.tokens,
+            "expires_in_seconds": round(
+                max(0.0, idle_seconds - (time.monotonic() - self.last_used))
+            ),
+        }
+
+
+class SessionStore:
+    """
+    In-memory sessions with idle expiry and a cap on their number.
+
+    Sessions idle for ``idle_seconds`` expire; beyond ``max_sessions`` the
+    least recently used one is evicted. With the per-session token cap this
+    bounds the memory sessions use. State is per process and does not
+    survive a restart.
+    """
+
+    def __init__(
+        self,
+        idle_seconds: Optional[float] = None,
+        max_sessions: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ):
+        """
+        Initialize session store.
+
+        Args:
+            idle_seconds: Idle time before a session expires (defaults to SESSION_IDLE_SECONDS)
+            max_sessions: Most sessions kept (defaults to SESSION_MAX_SESSIONS)
+            max_tokens: Token cap per session (defaults to SESSION_MAX_TOKENS)
+        """
+        self.idle_seconds = idle_seconds or settings.SESSION_IDLE_SECONDS
+        self.max_sessions = max(1, max_sessions or settings.SESSION_MAX_SESSIONS)
+        self.max_tokens = max_tokens or settings.SESSION_MAX_TOKENS
+        self._sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, client_doc_id: str) -> ConversationSession:
+        """Start a session for a client."""
+        session = ConversationSession(client_doc_id, self.max_tokens)
+        with self._lock:
+            self._expire()
+            self._sessions[session.id] = session
+            while len(self._sessions) > self.max_sessions:
+                evicted, _ = self._sessions.popitem(last=False)
+                logger.info(f"Evicted least recently used session {evicted}")
+        return session
+
+    def get(self, session_id: str) -> Optional[ConversationSession]:
+        """Return a live session and mark it used, or None if unknown or expired."""
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_used = time.monotonic()
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        """End a session; returns whether it existed."""
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def stats(self) -> Dict[str, int]:
+        """Live sessions and the tokens they hold."""
+        with self._lock:
+            self._expire()
+            sessions = list(self._sessions.values())
+        return {"sessions": len(sessions), "tokens": sum(s.tokens for s in sessions)}
+
+    def _expire(self) -> None:
+        """Drop idle sessions (sessions are kept in least recently used order)."""
+        deadline = time.monotonic() - self.idle_seconds
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_used > deadline:
+                break
+            del self._sessions[session_id]
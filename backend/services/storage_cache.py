@@ -0,0 +1,360 @@
+"""Content-addressed local disk cache for Supabase Storage downloads."""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (content, etag) returned by a full download
+FetchResult = Tuple[bytes, Optional[str]]
+
+# Blob file names are SHA-256 hex digests
+BLOB_NAME_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+class StorageCache:
+    """
+    LRU disk cache keyed by storage path, storing blobs by content hash.
+
+    - Blobs live at ``<root>/objects/<sha256>``; identical files stored under
+      different paths share one blob.
+    - The index (path -> hash, etag, size) is kept in LRU order, with a running
+      byte total and per-blob reference counts; least recently used paths are
+      evicted once the total size exceeds ``max_bytes``.
+    - The index is persisted to ``<root>/index.json`` at most once every
+      ``save_interval`` seconds, and on ``close``. Blobs the saved index does
+      not know about are removed on startup.
+    - Hits can be revalidated against the object's current ETag, and blobs
+      are checked against their hash when read in full.
+    - Concurrent misses for the same path are single-flighted: one caller
+      downloads, the others wait for its result.
+    """
+
+    def __init__(self, root: str, max_bytes: int, save_interval: float = 5.0):
+        """
+        Initialize storage cache.
+
+        Args:
+            root: Cache directory
+            max_bytes: Maximum total size of cached blobs (0 disables caching)
+            save_interval: Minimum seconds between index writes (0 writes on
+                every change)
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.save_interval = save_interval
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, "index.json")
+        self._index: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Distinct blob bytes, and index entries pointing at each blob
+        self._bytes = 0
+        self._refcounts: Dict[str, int] = {}
+        self._dirty = False
+        self._last_save = 0.0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+        self.hits = 0
+        self.misses = 0
+        self.revalidation_misses = 0
+        self.evictions = 0
+
+        if self.enabled:
+            os.makedirs(self.objects_dir, exist_ok=True)
+            self._load_index()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether caching is turned on."""
+        return self.max_bytes > 0
+
+    def get(
+        self,
+        path: str,
+        fetch: Callable[[], FetchResult],
+        current_etag: Optional[Callable[[], Optional[str]]] = None,
+    ) -> bytes:
+        """
+        Return an object's content, downloading it only on a miss.
+
+        Args:
+            path: Storage path of the object
+            fetch: Downloads the object, returning (content, etag)
+            current_etag: Optional callable returning the object's current ETag;
+                a cached entry with a different ETag is refetched
+
+        Returns:
+            Object content as bytes
+        """
+        if not self.enabled:
+            return fetch()[0]
+
+        while True:
+            content = self._read_valid(path, current_etag)
+            if content is not None:
+                return content
+
+            with self._lock:
+                event = self._inflight.get(path)
+                leader = event is None
+                if leader:
+                    event = threading.Event()
+                    self._inflight[path] = event
+
+            if not leader:
+                # Another caller is downloading this path; wait and re-check
+                event.wait()
+                current_etag = None
+                continue
+
+            try:
+                with self._lock:
+                    self.misses += 1
+                content, etag = fetch()
+                self._store(path, content, etag)
+                return content
+            finally:
+                with self._lock:
+                    self._inflight.pop(path, None)
+                event.set()
+
+    def read_range(
+        self,
+        path: str,
+        start: int,
+        end: Optional[int],
+        current_etag: Optional[Callable[[], Optional[str]]] = None,
+    ) -> Optional[bytes]:
+        """
+        Read a byte range of a cached object without loading the rest.
+
+        Args:
+            path: Storage path of the object
+            start: First byte offset (inclusive)
+            end: Last byte offset (inclusive), or None for end of object
+            current_etag: Optional callable returning the object's current ETag;
+                a cached entry with a different ETag is dropped
+
+        Returns:
+            The requested bytes, or None if the object is not cached (or stale)
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._index.get(path)
+        if entry is None or self._is_stale(path, entry, current_etag):
+            return None
+        self._touch(path)
+
+        try:
+            with open(self._blob_path(entry["hash"]), "rb") as blob:
+                blob.seek(start)
+                length = None if end is None else max(0, end - start + 1)
+                data = blob.read() if length is None else blob.read(length)
+        except FileNotFoundError:
+            self.invalidate(path)
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def invalidate(self, path: str) -> None:
+        """
+        Drop a path from the cache (its blob is removed if no longer shared).
+
+        Args:
+            path: Storage path of the object
+        """
+        with self._lock:
+            if self._pop_entry(path):
+                self._mark_dirty()
+
+    def close(self) -> None:
+        """Write any index changes not yet persisted."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report cache counters.
+
+        Returns:
+            Dictionary with entry count, size and hit/miss counts
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidation_misses": self.revalidation_misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _read_valid(
+        self, path: str, current_etag: Optional[Callable[[], Optional[str]]]
+    ) -> Optional[bytes]:
+        """Return cached content if present, fresh and intact; else None."""
+        with self._lock:
+            entry = self._index.get(path)
+        if entry is None or self._is_stale(path, entry, current_etag):
+            return None
+
+        try:
+            with open(self._blob_path(entry["hash"]), "rb") as blob:
+                content = blob.read()
+        except FileNotFoundError:
+            self.invalidate(path)
+            return None
+
+        if hashlib.sha256(content).hexdigest() != entry["hash"]:
+            logger.warning(f"Cached blob for {path} failed hash check; refetching")
+            self.invalidate(path)
+            return None
+
+        self._touch(path)
+        with self._lock:
+            self.hits += 1
+        return content
+
+    def _is_stale(
+        self,
+        path: str,
+        entry: Dict[str, Any],
+        current_etag: Optional[Callable[[], Optional[str]]],
+    ) -> bool:
+        """Whether the object changed since it was cached; a stale entry is dropped."""
+        if current_etag is None or not entry.get("etag"):
+            return False
+        try:
+            remote_etag = current_etag()
+        except Exception as e:
+            # Storage unreachable: serve what we have
+            logger.warning(f"Could not revalidate {path}: {e}")
+            return False
+        if not remote_etag or remote_etag == entry["etag"]:
+            return False
+        with self._lock:
+            self.revalidation_misses += 1
+        self.invalidate(path)
+        return True
+
+    def _store(self, path: str, content: bytes, etag: Optional[str]) -> None:
+        """Write a blob, index it under path and evict down to the size cap."""
+        if len(content) > self.max_bytes:
+            return
+
+        digest = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            # Write to a temp file first so readers never see a partial blob
+            fd, tmp_path = tempfile.mkstemp(dir=self.objects_dir)
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(content)
+            os.replace(tmp_path, blob_path)
+
+        with self._lock:
+            # Index the new entry before dropping the old one, so a blob both
+            # share is never deleted in between
+            previous = self._index.pop(path, None)
+            self._add_entry(path, {"hash": digest, "etag": etag, "size": len(content)})
+            if previous:
+                self._release_blob(previous["hash"], previous["size"])
+            self._evict()
+            self._mark_dirty()
+
+    def _touch(self, path: str) -> None:
+        """Mark a path as most recently used."""
+        with self._lock:
+            if path in self._index:
+                self._index.move_to_end(path)
+                self._mark_dirty()
+
+    def _evict(self) -> None:
+        """Evict least recently used paths until under the size cap (lock held)."""
+        while self._index and self._bytes > self.max_bytes:
+            path = next(iter(self._index))
+            self._pop_entry(path)
+            self.evictions += 1
+            logger.info(f"Evicted {path} from storage cache")
+
+    def _add_entry(self, path: str, entry: Dict[str, Any]) -> None:
+        """Index a path as most recently used and count its blob (lock held)."""
+        self._index[path] = entry
+        digest = entry["hash"]
+        if digest not in self._refcounts:
+            self._refcounts[digest] = 0
+            self._bytes += entry["size"]
+        self._refcounts[digest] += 1
+
+    def _pop_entry(self, path: str) -> Optional[Dict[str, Any]]:
+        """Remove a path from the index and release its blob (lock held)."""
+        entry = self._index.pop(path, None)
+        if entry:
+            self._release_blob(entry["hash"], entry["size"])
+        return entry
+
+    def _release_blob(self, digest: str, size: int) -> None:
+        """Drop one reference to a blob, deleting it with the last one (lock held)."""
+        self._refcounts[digest] -= 1
+        if self._refcounts[digest]:
+            return
+        del self._refcounts[digest]
+        self._bytes -= size
+        try:
+            os.unlink(self._blob_path(digest))
+        except FileNotFoundError:
+            pass
+
+    def _mark_dirty(self) -> None:
+        """Note an index change and persist it if the save interval has passed (lock held)."""
+        self._dirty = True
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self._save_index()
+
+    def _blob_path(self, digest: str) -> str:
+        """Filesystem path of a blob."""
+        return os.path.join(self.objects_dir, digest)
+
+    def _load_index(self) -> None:
+        """
+        Load the persisted index, dropping entries whose blob is gone.
+
+        Blobs the index does not reference are deleted; they were stored
+        after the last index write before a crash.
+        """
+        try:
+            with open(self.index_path, "r") as index_file:
+                entries = json.load(index_file)
+        except (FileNotFoundError, ValueError):
+            entries = []
+        for path, entry in entries:
+            if os.path.exists(self._blob_path(entry["hash"])):
+                self._add_entry(path, entry)
+        for name in os.listdir(self.objects_dir):
+            # Temp files from mkstemp may be another process's write in progress
+            if BLOB_NAME_PATTERN.match(name) and name not in self._refcounts:
+                os.unlink(self._blob_path(name))
+        self._last_save = time.monotonic()
+
+    def _save_index(self) -> None:
+        """Persist the index in LRU order (lock held)."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.root)
+        with os.fdopen(fd, "w") as index_file:
+            json.dump(list(self._index.items()), index_file)
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
+        self._last_save = time.monotonic()
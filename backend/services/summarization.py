@@ -20,7 +20,7 @@ class DocumentSummarizer:
             model=settings.OLLAMA_MODEL,
             base_url=settings.OLLAMA_BASE_URL,
             temperature=0,
-            keep_alive="5m"
+            keep_alive=settings.OLLAMA_KEEP_ALIVE
         )
     
     def summarize_documents(self, chunks: List[str], client_name: str) -> str:
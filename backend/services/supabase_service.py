@@ -1,13 +1,67 @@
 """Supabase service for client and file management."""
 import logging
-from typing import List, Optional, Dict, Any
+import os
+import re
+import threading
+from typing import Callable, List, Optional, Dict, Any, Tuple, Union
+from urllib.parse import quote
+import httpx
 from uuid import UUID
 from supabase import create_client, Client
 from config import settings
-from utils.helpers import generate_doc_id
+from utils.helpers import generate_doc_id, encode_cursor, decode_cursor
+from utils.cache import TTLCache
+from services.resumable_upload import ResumableUploader
+from services.storage_cache import StorageCache
 
 logger = logging.getLogger(__name__)
 
+# Columns returned by client listings; "summary" is opt-in since it can be large
+CLIENT_LIST_COLUMNS = ["id", "name", "doc_id", "created_at", "updated_at"]
+
+# Storage folder (per client) holding page-text sidecars for cited-page fetches
+PAGE_INDEX_FOLDER = ".pages"
+
+# Objects per storage list page and per remove request
+STORAGE_LIST_PAGE_SIZE = 1000
+STORAGE_REMOVE_BATCH_SIZE = 100
+
+
+# ISO 8601 timestamp as PostgREST returns created_at
+_CURSOR_TIMESTAMP = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d{1,9})?(Z|[+-]\d{2}(:?\d{2})?)?"
+)
+
+
+def _decode_client_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decode a client listing cursor into its (created_at, id) keyset.
+
+    The values are interpolated into a PostgREST filter, so anything but an
+    ISO timestamp and an integer id is rejected.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    values = decode_cursor(cursor)
+    if len(values) == 2:
+        created_at, client_id = values
+        if isinstance(client_id, str) and client_id.isdigit():
+            client_id = int(client_id)
+        if (
+            isinstance(created_at, str)
+            and _CURSOR_TIMESTAMP.fullmatch(created_at)
+            and isinstance(client_id, int)
+            and not isinstance(client_id, bool)
+        ):
+            return created_at, client_id
+    raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def page_index_path(doc_id: str, filename: str) -> str:
+    """Storage path of the page-text sidecar for a client file."""
+    return f"{doc_id}/{PAGE_INDEX_FOLDER}/{filename}.txt"
+
 
 class SupabaseService:
     """Service for interacting with Supabase PostgreSQL and Storage."""
@@ -18,6 +72,34 @@ class SupabaseService:
         self.client: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_KEY)
         self.bucket_name = settings.SUPABASE_BUCKET
 
+        # Bound concurrent storage uploads across all requests
+        self.upload_slots = threading.BoundedSemaphore(
+            settings.STORAGE_MAX_CONCURRENT_UPLOADS
+        )
+        self.resumable_uploader = ResumableUploader(
+            endpoint=f"{settings.SUPABASE_URL.rstrip('/')}/storage/v1/upload/resumable",
+            headers={
+                "Authorization": f"Bearer {settings.SUPABASE_SERVICE_KEY}",
+                "apikey": settings.SUPABASE_SERVICE_KEY,
+            },
+            chunk_size=settings.RESUMABLE_UPLOAD_CHUNK_SIZE,
+            max_retries=settings.UPLOAD_MAX_RETRIES,
+        )
+
+        # Local disk cache in front of storage downloads
+        self.storage_cache = StorageCache(
+            root=settings.STORAGE_CACHE_DIR,
+            max_bytes=settings.STORAGE_CACHE_MAX_BYTES,
+            save_interval=settings.STORAGE_CACHE_INDEX_SAVE_SECONDS,
+        )
+
+        # Client records are nearly immutable; cache lookups by doc_id
+        self.client_cache = TTLCache(
+            maxsize=settings.CLIENT_CACHE_SIZE,
+            ttl=settings.CLIENT_CACHE_TTL,
+            negative_ttl=settings.CLIENT_CACHE_NEGATIVE_TTL,
+        )
+
         # Ensure bucket exists
         try:
             buckets = self.client.storage.list_buckets()
@@ -60,6 +142,8 @@ class SupabaseService:
         logger.info(f"result: {result}")
         if result.data:
             logger.info(f"Created client: {name} with doc_id: {doc_id}")
+            self.client_cache.invalidate(doc_id)
+            self.client_cache.set(doc_id, result.data[0])
             return result.data[0]
         else:
             raise Exception("Failed to create client")
@@ -80,8 +164,11 @@ class SupabaseService:
             "updated_at": "now()"
         }).eq("doc_id", doc_id).execute()
 
+        self.client_cache.invalidate(doc_id)
+
         if result.data:
             logger.info(f"Updated summary for client: {doc_id}")
+            self.client_cache.set(doc_id, result.data[0])
             return result.data[0]
         else:
             raise Exception(f"Client not found: {doc_id}")
@@ -89,6 +176,9 @@ class SupabaseService:
     def get_client_by_doc_id(self, doc_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve client details by doc_id.
+
+        Served from the client cache when possible; misses (including
+        "not found") are cached too, the latter for a shorter TTL.
         
         Args:
             doc_id: Client document ID
@@ -96,11 +186,33 @@ class SupabaseService:
         Returns:
             Client record or None if not found
         """
+        found, client = self.client_cache.get(doc_id)
+        if found:
+            return dict(client) if client else None
+
         result = self.client.table("clients").select("*").eq("doc_id", doc_id).execute()
 
-        if result.data:
-            return result.data[0]
-        return None
+        client = result.data[0] if result.data else None
+        self.client_cache.set(doc_id, client)
+        return dict(client) if client else None
+
+    def invalidate_client(self, doc_id: str) -> None:
+        """
+        Drop a cached client record so the next lookup hits the database.
+        
+        Args:
+            doc_id: Client document ID
+        """
+        self.client_cache.invalidate(doc_id)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Report client cache hit-rate counters.
+        
+        Returns:
+            Dictionary of cache statistics
+        """
+        return self.client_cache.stats()
 
     def list_all_clients(self) -> List[Dict[str, Any]]:
         """
@@ -112,12 +224,75 @@ class SupabaseService:
         result = self.client.table("clients").select("*").order("created_at", desc=True).execute()
         return result.data if result.data else []
 
-    def upload_file(self, file_bytes: bytes, doc_id: str, filename: str) -> str:
+    def list_clients_page(
+        self, limit: int = 100, cursor: Optional[str] = None, include_summary: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        List clients newest first using keyset pagination on (created_at, id).
+        
+        Each page is a bounded index range scan instead of an OFFSET or full
+        table read, so latency stays flat as the table grows.
+        
+        Args:
+            limit: Maximum number of clients to return
+            cursor: Opaque cursor from the previous page, or None for the first page
+            include_summary: Whether to include the (potentially large) summary column
+            
+        Returns:
+            Tuple of (client records, cursor for the next page or None)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        columns = CLIENT_LIST_COLUMNS + (["summary"] if include_summary else [])
+
+        query = (
+            self.client.table("clients")
+            .select(",".join(columns))
+            .order("created_at", desc=True)
+            .order("id", desc=True)
+            .limit(limit + 1)
+        )
+
+        if cursor:
+            created_at, client_id = _decode_client_cursor(cursor)
+            query = query.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt.{client_id})'
+            )
+
+        result = query.execute()
+        rows = result.data if result.data else []
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor([last["created_at"], last["id"]])
+
+        return rows, next_cursor
+
+    def ping(self) -> bool:
+        """
+        Cheap reachability check (single-row indexed read).
+        
+        Returns:
+            True if the clients table answered
+        """
+        self.client.table("clients").select("id").limit(1).execute()
+        return True
+
+    def upload_file(self, file_bytes: Union[bytes, str], doc_id: str, filename: str) -> str:
         """
         Upload file to Supabase Storage organized by doc_id.
         
+        Files of at least RESUMABLE_UPLOAD_THRESHOLD bytes use a resumable
+        (TUS) upload in parts with per-part retry; smaller files are sent in a
+        single request. At most STORAGE_MAX_CONCURRENT_UPLOADS uploads run at
+        once per process; callers beyond that wait for a free slot.
+        
         Args:
-            file_bytes: File content as bytes
+            file_bytes: File content as bytes, or a local file path to stream from
             doc_id: Client document ID
             filename: Original filename
             
@@ -125,12 +300,20 @@ class SupabaseService:
             Storage path of uploaded file
         """
         storage_path = f"{doc_id}/{filename}"
+        self.storage_cache.invalidate(storage_path)
+        size = len(file_bytes) if isinstance(file_bytes, bytes) else os.path.getsize(file_bytes)
 
-        result = self.client.storage.from_(self.bucket_name).upload(
-            path=storage_path,
-            file=file_bytes,
-            file_options={"content-type": "application/octet-stream", "upsert": "true"}
-        )
+        with self.upload_slots:
+            if size >= settings.RESUMABLE_UPLOAD_THRESHOLD:
+                return self.resumable_uploader.upload(
+                    file_bytes, self.bucket_name, storage_path
+                )
+
+            result = self.client.storage.from_(self.bucket_name).upload(
+                path=storage_path,
+                file=file_bytes,
+                file_options={"content-type": "application/octet-stream", "upsert": "true"}
+            )
 
         if result:
             logger.info(f"Uploaded file: {storage_path}")
@@ -138,9 +321,27 @@ class SupabaseService:
         else:
             raise Exception(f"Failed to upload file: {filename}")
 
+    def upload_page_index(self, blob: bytes, doc_id: str, filename: str) -> str:
+        """
+        Upload the page-text sidecar of a client file.
+        
+        Args:
+            blob: Concatenated UTF-8 page texts (see DocumentProcessor.build_page_index)
+            doc_id: Client document ID
+            filename: Stored filename the pages belong to
+            
+        Returns:
+            Storage path of the sidecar
+        """
+        return self.upload_file(blob, doc_id, f"{PAGE_INDEX_FOLDER}/{filename}.txt")
+
     def download_file(self, file_path: str) -> bytes:
         """
-        Download file from Supabase Storage.
+        Download file from Supabase Storage through the local disk cache.
+        
+        Cached copies are revalidated against the object's ETag (when
+        STORAGE_CACHE_REVALIDATE is on) and concurrent downloads of the same
+        path share one request.
         
         Args:
             file_path: Storage path of the file
@@ -148,22 +349,104 @@ class SupabaseService:
         Returns:
             File content as bytes
         """
-        result = self.client.storage.from_(self.bucket_name).download(file_path)
+        return self.storage_cache.get(
+            file_path, lambda: self._fetch_object(file_path), self._etag_check(file_path)
+        )
 
-        if result:
-            return result
-        else:
+    def download_file_range(
+        self, file_path: str, start: int, end: Optional[int] = None
+    ) -> bytes:
+        """
+        Download part of a file without fetching the whole object.
+        
+        Served from the disk cache when the file is cached (revalidated like
+        download_file), otherwise with an HTTP Range request.
+        
+        Args:
+            file_path: Storage path of the file
+            start: First byte offset (inclusive)
+            end: Last byte offset (inclusive), or None for end of file
+            
+        Returns:
+            Requested bytes
+        """
+        cached = self.storage_cache.read_range(
+            file_path, start, end, self._etag_check(file_path)
+        )
+        if cached is not None:
+            return cached
+
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        response = self._storage_request("GET", file_path, {"Range": byte_range})
+        if response.status_code == 206:
+            return response.content
+        if response.status_code == 200:
+            # Server ignored the range; slice locally
+            return response.content[start : None if end is None else end + 1]
+        raise Exception(
+            f"Failed to download range {byte_range} of {file_path}: {response.status_code}"
+        )
+
+    def _fetch_object(self, file_path: str) -> Tuple[bytes, Optional[str]]:
+        """Download an object, returning (content, etag)."""
+        response = self._storage_request("GET", file_path)
+        if response.status_code != 200:
             raise Exception(f"Failed to download file: {file_path}")
+        return response.content, response.headers.get("etag")
 
-    def list_client_files(self, doc_id: str) -> List[Dict[str, Any]]:
+    def _etag_check(self, file_path: str) -> Optional[Callable[[], Optional[str]]]:
+        """ETag lookup for revalidating cached copies, None when revalidation is off."""
+        if not settings.STORAGE_CACHE_REVALIDATE:
+            return None
+        return lambda: self._get_object_etag(file_path)
+
+    def _get_object_etag(self, file_path: str) -> Optional[str]:
+        """Fetch an object's current ETag with a HEAD request."""
+        response = self._storage_request("HEAD", file_path)
+        if response.status_code != 200:
+            return None
+        return response.headers.get("etag")
+
+    def _storage_request(
+        self, method: str, file_path: str, headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """Send an authenticated request for a storage object."""
+        url = (
+            f"{settings.SUPABASE_URL.rstrip('/')}/storage/v1/object/"
+            f"{self.bucket_name}/{quote(file_path)}"
+        )
+        request_headers = {
+            "Authorization": f"Bearer {settings.SUPABASE_SERVICE_KEY}",
+            "apikey": settings.SUPABASE_SERVICE_KEY,
+            **(headers or {}),
+        }
+        return httpx.request(method, url, headers=request_headers, timeout=120.0)
+
+    def storage_cache_stats(self) -> Dict[str, Any]:
         """
-        List all files for a client from Supabase Storage.
+        Report storage download cache counters.
+        
+        Returns:
+            Dictionary of cache statistics
+        """
+        return self.storage_cache.stats()
+
+    def close(self) -> None:
+        """Persist the storage cache index."""
+        self.storage_cache.close()
+
+    def list_storage_files(self, doc_id: str) -> List[Dict[str, Any]]:
+        """
+        List all objects for a client directly from Supabase Storage.
+        
+        Prefer list_client_files for API responses; this is a live storage
+        listing without ingest metadata.
         
         Args:
             doc_id: Client document ID
             
         Returns:
-            List of file information dictionaries
+            List of storage object dictionaries
         """
         try:
             files = self.client.storage.from_(self.bucket_name).list(path=doc_id)
@@ -172,6 +455,67 @@ class SupabaseService:
             logger.error(f"Error listing files for client {doc_id}: {e}")
             return []
 
+    def list_client_files(self, doc_id: str) -> List[Dict[str, Any]]:
+        """
+        List all files for a client from the client_files manifest.
+        
+        Args:
+            doc_id: Client document ID
+            
+        Returns:
+            List of manifest records, newest first
+        """
+        result = (
+            self.client.table("client_files")
+            .select("*")
+            .eq("client_doc_id", doc_id)
+            .order("created_at", desc=True)
+            .execute()
+        )
+        return result.data if result.data else []
+
+    def get_file_manifest(self, doc_id: str, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the manifest record of one client file.
+        
+        Args:
+            doc_id: Client document ID
+            filename: Stored (sanitized) filename
+            
+        Returns:
+            Manifest record or None if the file was never ingested
+        """
+        result = (
+            self.client.table("client_files")
+            .select("*")
+            .eq("client_doc_id", doc_id)
+            .eq("filename", filename)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    def upsert_file_manifest(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Insert or update a client_files manifest record.
+        
+        Records are keyed by (client_doc_id, filename); only the keys present
+        in ``record`` are written.
+        
+        Args:
+            record: Manifest fields including client_doc_id and filename
+            
+        Returns:
+            Stored manifest record
+        """
+        result = (
+            self.client.table("client_files")
+            .upsert(record, on_conflict="client_doc_id,filename")
+            .execute()
+        )
+        if result.data:
+            return result.data[0]
+        raise Exception(f"Failed to write manifest for file: {record.get('filename')}")
+
     def delete_file(self, file_path: str) -> bool:
         """
         Delete a file from Supabase Storage.
@@ -183,9 +527,92 @@ class SupabaseService:
             True if successful
         """
         try:
+            self.storage_cache.invalidate(file_path)
             result = self.client.storage.from_(self.bucket_name).remove([file_path])
             logger.info(f"Deleted file: {file_path}")
             return True
         except Exception as e:
             logger.error(f"Error deleting file {file_path}: {e}")
             return False
+
+    def delete_files(self, file_paths: List[str]) -> int:
+        """
+        Delete storage objects in batches, raising on failure.
+
+        Args:
+            file_paths: Storage paths of the objects
+
+        Returns:
+            Number of objects removed
+        """
+        removed = 0
+        storage = self.client.storage.from_(self.bucket_name)
+        for start in range(0, len(file_paths), STORAGE_REMOVE_BATCH_SIZE):
+            batch = file_paths[start : start + STORAGE_REMOVE_BATCH_SIZE]
+            for file_path in batch:
+                self.storage_cache.invalidate(file_path)
+            result = storage.remove(batch)
+            removed += len(result) if isinstance(result, list) else len(batch)
+        logger.info(f"Deleted {removed} storage objects")
+        return removed
+
+    def list_storage_paths(self, doc_id: str) -> List[str]:
+        """
+        List every storage object path under a client's folder, including sidecars.
+
+        Args:
+            doc_id: Client document ID
+
+        Returns:
+            Object paths (folders are walked, not returned)
+        """
+        storage = self.client.storage.from_(self.bucket_name)
+        paths: List[str] = []
+        folders = [doc_id]
+        while folders:
+            folder = folders.pop()
+            offset = 0
+            while True:
+                entries = storage.list(
+                    path=folder,
+                    options={"limit": STORAGE_LIST_PAGE_SIZE, "offset": offset},
+                ) or []
+                for entry in entries:
+                    path = f"{folder}/{entry['name']}"
+                    # Folders are listed without an object id
+                    if entry.get("id") is None:
+                        folders.append(path)
+                    else:
+                        paths.append(path)
+                if len(entries) < STORAGE_LIST_PAGE_SIZE:
+                    break
+                offset += len(entries)
+        return paths
+
+    def delete_file_manifest(self, doc_id: str, filename: str) -> None:
+        """
+        Delete the manifest record of one client file.
+
+        Args:
+            doc_id: Client document ID
+            filename: Stored (sanitized) filename
+        """
+        (
+            self.client.table("client_files")
+            .delete()
+            .eq("client_doc_id", doc_id)
+            .eq("filename", filename)
+            .execute()
+        )
+
+    def delete_client(self, doc_id: str) -> None:
+        """
+        Delete a client record and its file manifest records.
+
+        Args:
+            doc_id: Client document ID
+        """
+        self.client.table("client_files").delete().eq("client_doc_id", doc_id).execute()
+        self.client.table("clients").delete().eq("doc_id", doc_id).execute()
+        self.client_cache.invalidate(doc_id)
+        logger.info(f"Deleted client record: {doc_id}")
@@ -0,0 +1,223 @@
+"""Streaming reader for plain-text and subtitle transcripts."""
+
+import logging
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_EXTENSIONS = {".txt", ".md", ".vtt", ".srt"}
+
+# "00:01:23.000 --> 00:01:27.500" (VTT) or "00:01:23,000 --> 00:01:27,500" (SRT)
+CUE_TIMING_PATTERN = re.compile(
+    r"^\s*((?:\d{1,2}:)?\d{1,2}:\d{2}(?:[.,]\d{1,3})?)\s*-->\s*\S+"
+)
+# "[00:01:23] Speaker 1:" as produced by the frontend transcription route, or
+# a bare "00:01:23"; a bare "10:30" is too often prose ("10:30 am the ...")
+TIMESTAMP_PREFIX_PATTERN = re.compile(
+    r"^\s*(?:[\[(]((?:\d{1,2}:)?\d{1,2}:\d{2})(?:[.,]\d{1,3})?[\])]"
+    r"|(\d{1,2}:\d{2}:\d{2})(?:[.,]\d{1,3})?(?=\s|$))\s*(.*)$"
+)
+# "THE COURT:", "MR. SMITH:", "Speaker 2:"; capitalised prose such as
+# "Note: ..." or "Exhibit: ..." is not a speaker
+SPEAKER_PATTERN = re.compile(
+    r"^((?:[A-Z][A-Z0-9'.\-]*)(?:\s+[A-Z0-9][A-Z0-9'.\-]*){0,4}|Speaker\s+\d+)\s*:\s*(.*)$"
+)
+# A timestamped line holding only a label ("[00:00:05] Judge:") names the
+# speaker in any case
+TIMESTAMPED_LABEL_PATTERN = re.compile(
+    r"^([A-Z][A-Za-z0-9'.\-]*(?:\s+[A-Za-z0-9'.\-]+){0,4})\s*:$"
+)
+# Deposition-style "Q. ..." / "A. ..."
+QA_PATTERN = re.compile(r"^([QA])\.\s+(.*)$")
+VTT_VOICE_PATTERN = re.compile(r"^<v(?:\.[^\s>]+)?\s+([^>]+)>(.*)$")
+TAG_PATTERN = re.compile(r"</?[^>]+>")
+
+
+def _normalize_timestamp(raw: str) -> str:
+    """Normalize a cue timestamp to HH:MM:SS."""
+    clock = re.split(r"[.,]", raw)[0]
+    parts = clock.split(":")
+    while len(parts) < 3:
+        parts.insert(0, "0")
+    return ":".join(part.zfill(2) for part in parts)
+
+
+class TranscriptReader:
+    """
+    Line-by-line transcript reader that groups lines into segments.
+
+    Segments break on speaker turns, and on cue/timestamp boundaries once the
+    buffered text reaches ``max_chars``. Only the current segment is held in
+    memory, so memory use is bounded by ``max_chars`` (or the longest single
+    line) rather than by the size of the file.
+    """
+
+    def __init__(self, max_chars: int):
+        """
+        Initialize transcript reader.
+
+        Args:
+            max_chars: Target maximum segment size in characters
+        """
+        self.max_chars = max_chars
+
+    def iter_segments(
+        self, lines: Iterable[str], file_ext: str
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream transcript segments from an iterable of lines.
+
+        Args:
+            lines: Lines of the transcript (e.g. an open text file)
+            file_ext: File extension used to pick the parser
+
+        Yields:
+            Dictionaries with text, starting line, optional timestamp and speaker
+        """
+        if file_ext in (".vtt", ".srt"):
+            events = self._iter_cue_events(lines)
+        else:
+            events = self._iter_text_events(lines)
+
+        buffer: List[str] = []
+        buffer_chars = 0
+        start_line: Optional[int] = None
+        start_timestamp: Optional[str] = None
+        speaker: Optional[str] = None
+        current_timestamp: Optional[str] = None
+
+        def flush() -> Optional[Dict[str, Any]]:
+            nonlocal buffer, buffer_chars, start_line, start_timestamp
+            if not buffer:
+                return None
+            body = " ".join(buffer)
+            segment = {
+                "text": f"{speaker}: {body}" if speaker else body,
+                "line": start_line,
+                "timestamp": start_timestamp,
+                "speaker": speaker,
+                "type": "transcript",
+            }
+            buffer = []
+            buffer_chars = 0
+            start_line = None
+            start_timestamp = None
+            return segment
+
+        for kind, line_num, value in events:
+            if kind == "timestamp":
+                current_timestamp = value
+                if buffer_chars >= self.max_chars:
+                    segment = flush()
+                    if segment:
+                        yield segment
+            elif kind == "speaker":
+                if value != speaker or buffer_chars >= self.max_chars:
+                    segment = flush()
+                    if segment:
+                        yield segment
+                speaker = value
+            elif kind == "boundary":
+                segment = flush()
+                if segment:
+                    yield segment
+            else:
+                if buffer and buffer_chars + len(value) > self.max_chars:
+                    segment = flush()
+                    if segment:
+                        yield segment
+                if not buffer:
+                    start_line = line_num
+                    start_timestamp = current_timestamp
+                buffer.append(value)
+                buffer_chars += len(value) + 1
+
+        segment = flush()
+        if segment:
+            yield segment
+
+    def _iter_text_events(self, lines: Iterable[str]) -> Iterator[tuple]:
+        """Tokenize plain-text/markdown transcripts into reader events."""
+        for line_num, raw_line in enumerate(lines, start=1):
+            line = raw_line.strip().lstrip("\ufeff")
+            if not line:
+                continue
+            if line.startswith("#") or line.startswith("==="):
+                yield ("boundary", line_num, None)
+                heading = line.strip("#= ").strip()
+                if heading and line.startswith("#"):
+                    yield ("text", line_num, heading)
+                continue
+
+            timestamp_match = TIMESTAMP_PREFIX_PATTERN.match(line)
+            if timestamp_match:
+                raw_timestamp = timestamp_match.group(1) or timestamp_match.group(2)
+                yield ("timestamp", line_num, _normalize_timestamp(raw_timestamp))
+                line = timestamp_match.group(3).strip()
+                if not line:
+                    continue
+                label_match = TIMESTAMPED_LABEL_PATTERN.match(line)
+                if label_match:
+                    yield ("speaker", line_num, label_match.group(1))
+                    continue
+
+            speaker, rest = self._split_speaker(line)
+            if speaker:
+                yield ("speaker", line_num, speaker)
+                line = rest
+            if line:
+                yield ("text", line_num, line)
+
+    def _iter_cue_events(self, lines: Iterable[str]) -> Iterator[tuple]:
+        """Tokenize WebVTT/SRT cues into reader events."""
+        in_cue = False
+        skipping_block = False
+
+        for line_num, raw_line in enumerate(lines, start=1):
+            line = raw_line.strip().lstrip("\ufeff")
+            if not line:
+                in_cue = False
+                skipping_block = False
+                continue
+            if skipping_block:
+                continue
+            if not in_cue and (
+                line.startswith("WEBVTT")
+                or line.startswith("NOTE")
+                or line.startswith("STYLE")
+                or line.startswith("REGION")
+            ):
+                skipping_block = True
+                continue
+
+            timing_match = CUE_TIMING_PATTERN.match(line)
+            if timing_match:
+                in_cue = True
+                yield ("timestamp", line_num, _normalize_timestamp(timing_match.group(1)))
+                continue
+            if not in_cue:
+                # Cue identifier or SRT sequence number
+                continue
+
+            voice_match = VTT_VOICE_PATTERN.match(line)
+            if voice_match:
+                yield ("speaker", line_num, voice_match.group(1).strip())
+                line = voice_match.group(2)
+            else:
+                speaker, rest = self._split_speaker(line)
+                if speaker:
+                    yield ("speaker", line_num, speaker)
+                    line = rest
+
+            text = TAG_PATTERN.sub("", line).strip()
+            if text:
+                yield ("text", line_num, text)
+
+    @staticmethod
+    def _split_speaker(line: str) -> tuple:
+        """Split a leading speaker label from a line, if present."""
+        match = SPEAKER_PATTERN.match(line) or QA_PATTERN.match(line)
+        if not match:
+            return None, line
+        return match.group(1).strip(), match.group(2).strip()
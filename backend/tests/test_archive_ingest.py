@@ -0,0 +1,191 @@
+"""Archive ingestion tests."""
+import asyncio
+import io
+import os
+import zipfile
+
+from services.archive_ingest import ArchiveIngestor
+from services.ingest_pipeline import IngestPipeline
+from services.neo4j_store import EmbeddingVersion
+
+
+class FakeProcessor:
+    """Returns one chunk per file read from disk."""
+
+    def process_document(self, file_path, source_filename, client_doc_id, client_name, stats=None):
+        with open(file_path, "r") as file:
+            text = file.read()
+        return [{"text": text, "source": source_filename, "location": "line.1"}]
+
+
+class FakeStorage:
+    """Records uploaded filenames and the local paths they came from."""
+
+    def __init__(self):
+        self.uploaded = {}
+
+    def upload_file(self, file_bytes, doc_id, filename):
+        self.uploaded[filename] = file_bytes
+        return f"{doc_id}/{filename}"
+
+    def get_file_manifest(self, doc_id, filename):
+        return None
+
+    def upsert_file_manifest(self, record):
+        return record
+
+
+class FakeVectorStore:
+    """Keeps written chunks in memory."""
+
+    active_version = EmbeddingVersion.default("embeddinggemma")
+
+    def __init__(self):
+        self.written = []
+
+    def embed_chunks(self, chunks):
+        return [[1.0] for _ in chunks]
+
+    def add_embedded_documents_for_client(
+        self, chunks, embeddings, client_doc_id, client_name, embedding_version=None
+    ):
+        self.written.extend(chunks)
+        return [chunk["text"] for chunk in chunks]
+
+
+def test_ingest_archive_streams_supported_entries():
+    """Supported entries are stored, parsed and written; others are rejected per entry."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("case/", "")
+        archive.writestr("case/hearing one.txt", "THE COURT: Be seated.")
+        archive.writestr("case/notes.md", "# Notes")
+        archive.writestr("case/tool.exe", b"\x00\x01")
+        archive.writestr("__MACOSX/case/._notes.md", b"")
+    buffer.seek(0)
+
+    storage = FakeStorage()
+    vector_store = FakeVectorStore()
+    pipeline = IngestPipeline(storage, FakeProcessor(), vector_store)
+    progress = []
+    ingestor = ArchiveIngestor(pipeline, max_workers=2)
+    result = asyncio.run(
+        ingestor.ingest_archive(
+            buffer, "doc-1", "Client", on_progress=lambda done, total, item: progress.append((done, total))
+        )
+    )
+
+    by_name = {item["filename"]: item for item in result["items"]}
+    assert set(by_name) == {"case__hearing_one.txt", "case__notes.md", "case__tool.exe"}
+    assert by_name["case__hearing_one.txt"]["status"] == "processed"
+    assert by_name["case__tool.exe"]["status"] == "rejected"
+    assert sorted(storage.uploaded) == ["case__hearing_one.txt", "case__notes.md"]
+    assert not any(os.path.exists(path) for path in storage.uploaded.values())
+    assert sorted(chunk["text"] for chunk in vector_store.written) == ["# Notes", "THE COURT: Be seated."]
+    assert progress[-1] == (3, 3)
+
+
+def test_same_named_entries_in_different_folders_do_not_collide():
+    """a/notes.txt and b/notes.txt are stored and indexed as separate files."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("a/notes.txt", "First matter.")
+        archive.writestr("b/notes.txt", "Second matter.")
+        archive.writestr("../escape.txt", "Outside.")
+    buffer.seek(0)
+
+    storage = FakeStorage()
+    vector_store = FakeVectorStore()
+    ingestor = ArchiveIngestor(IngestPipeline(storage, FakeProcessor(), vector_store))
+    result = asyncio.run(ingestor.ingest_archive(buffer, "doc-1", "Client"))
+
+    assert sorted(item["filename"] for item in result["items"]) == [
+        "a__notes.txt", "b__notes.txt", "escape.txt"
+    ]
+    assert sorted(storage.uploaded) == ["a__notes.txt", "b__notes.txt", "escape.txt"]
+    assert sorted(chunk["source"] for chunk in vector_store.written) == [
+        "a__notes.txt", "b__notes.txt", "escape.txt"
+    ]
+
+
+def test_upload_archive_endpoint_ingests_a_real_upload(monkeypatch, tmp_path):
+    """A zip posted over HTTP (a Starlette UploadFile) is ingested and its spool removed."""
+    import tempfile
+
+    from fastapi.testclient import TestClient
+
+    from main import app
+    from services import registry
+
+    doc = "00000000-0000-0000-0000-000000000001"
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("case/notes.txt", "The hearing is adjourned.")
+
+    storage = FakeStorage()
+    storage.get_client_by_doc_id = lambda doc_id: {"doc_id": doc_id, "name": "Client"}
+    vector_store = FakeVectorStore()
+    try:
+        registry.set_instance("supabase", storage)
+        registry.set_instance(
+            "archive_ingestor",
+            ArchiveIngestor(IngestPipeline(storage, FakeProcessor(), vector_store)),
+        )
+        response = TestClient(app).post(
+            f"/clients/{doc}/upload_archive",
+            files={"archive": ("case.zip", buffer.getvalue(), "application/zip")},
+        )
+        # Spooled uploads and entries go to the temp dir and are deleted
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+        again = TestClient(app).post(
+            f"/clients/{doc}/upload_archive",
+            files={"archive": ("case.zip", buffer.getvalue(), "application/zip")},
+        )
+    finally:
+        registry.close_all()
+
+    assert response.status_code == 200
+    assert [(f["filename"], f["status"]) for f in response.json()["files"]] == [
+        ("case__notes.txt", "processed")
+    ]
+    assert [chunk["text"] for chunk in vector_store.written] == ["The hearing is adjourned."] * 2
+    assert again.status_code == 200 and not list(tmp_path.iterdir())
+
+
+def test_upload_endpoint_spools_each_file_to_disk(monkeypatch, tmp_path):
+    """Uploaded files reach the pipeline as temp files, which are removed afterwards."""
+    import tempfile
+
+    from fastapi.testclient import TestClient
+
+    from main import app
+    from services import registry
+
+    doc = "00000000-0000-0000-0000-000000000001"
+    storage = FakeStorage()
+    storage.get_client_by_doc_id = lambda doc_id: {"doc_id": doc_id, "name": "Client"}
+    vector_store = FakeVectorStore()
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    try:
+        registry.set_instance("supabase", storage)
+        registry.set_instance(
+            "ingest_pipeline", IngestPipeline(storage, FakeProcessor(), vector_store)
+        )
+        response = TestClient(app).post(
+            f"/clients/{doc}/upload",
+            files=[
+                ("files", ("notes.txt", b"The hearing is adjourned.", "text/plain")),
+                ("files", ("photo.xyz", b"binary", "application/octet-stream")),
+            ],
+        )
+    finally:
+        registry.close_all()
+
+    assert response.status_code == 200
+    assert [(f["filename"], f["status"]) for f in response.json()["files"]] == [
+        ("notes.txt", "processed"), ("photo.xyz", "rejected")
+    ]
+    # Storage got the spooled path, not the file's bytes
+    assert isinstance(storage.uploaded["notes.txt"], str)
+    assert [chunk["text"] for chunk in vector_store.written] == ["The hearing is adjourned."]
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,78 @@
+"""Batch query endpoint tests (local stand-ins for Ollama, Neo4j and Supabase)."""
+import json
+
+from fastapi.testclient import TestClient
+
+from benchmarks.stand_ins import FakeOllamaServer, InMemoryStorage, local_vector_store
+from config import settings
+from services import registry
+from services.agent import LegalRAGAgent
+
+CLIENT = "550e8400-e29b-41d4-a716-446655440000"
+
+
+def _seed(vector_store):
+    texts = [
+        "The alibi witness places the defendant in Leeds on 4 March.",
+        "The parole board noted good conduct and completed courses.",
+        "DNA evidence from the scene excludes the defendant.",
+    ]
+    chunks = [
+        {"text": text, "source": "case.pdf", "location": f"p.{page}", "chunk_id": f"case.pdf_{page}"}
+        for page, text in enumerate(texts, start=1)
+    ]
+    vector_store.add_embedded_documents_for_client(
+        chunks, vector_store.embeddings.embed_documents(texts), CLIENT, "Client"
+    )
+
+
+def test_batch_embeds_once_dedups_and_streams_every_answer(monkeypatch):
+    """One embed request for all questions; repeats answered once; one line per question."""
+    from main import app
+
+    questions = [
+        "Is there an alibi?",
+        "What did the parole board say?",
+        "is there an  ALIBI?",
+        "What does the DNA evidence show?",
+    ]
+    with FakeOllamaServer(dims=32) as ollama:
+        monkeypatch.setattr(settings, "OLLAMA_BASE_URL", ollama.url)
+        storage = InMemoryStorage()
+        storage.add_client(CLIENT, "Client")
+        vector_store = local_vector_store(ollama.url)
+        try:
+            registry.set_instance("supabase", storage)
+            registry.set_instance("vector_store", vector_store)
+            registry.set_instance("rag_agent", LegalRAGAgent(vector_store))
+            _seed(vector_store)
+            before = dict(ollama.counts)
+
+            response = TestClient(app).post(
+                "/query/batch", json={"questions": questions, "client_doc_id": CLIENT}
+            )
+            too_many = TestClient(app).post(
+                "/query/batch",
+                json={
+                    "questions": ["q"] * (settings.QUERY_BATCH_MAX_QUESTIONS + 1),
+                    "client_doc_id": CLIENT,
+                },
+            )
+        finally:
+            registry.close_all()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(result["index"] for result in results) == [0, 1, 2, 3]
+    for result in results:
+        assert result["error"] is None
+        assert result["citations"] and result["citations"][0]["filename"] == "case.pdf"
+        assert result["context_tokens"] > 0
+    by_index = {result["index"]: result for result in results}
+    assert by_index[0]["answer"] == by_index[2]["answer"]
+
+    assert ollama.counts["embed_requests"] - before["embed_requests"] == 1
+    assert ollama.counts["embedded_texts"] - before["embedded_texts"] == 3
+    assert ollama.counts["chat_requests"] - before["chat_requests"] == 3
+    assert too_many.status_code == 400
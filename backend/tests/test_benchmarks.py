@@ -0,0 +1,88 @@
+"""Benchmark harness tests (tiny corpora, local stand-ins only)."""
+import pytest
+
+from benchmarks import ingest_bench
+
+
+def test_ingest_benchmark_reports_throughput():
+    """A small synthetic corpus is fully ingested and every metric is reported."""
+    report = ingest_bench.run(
+        ingest_bench.parse_args(["--pdf-docs", "2", "--pages", "3", "--docx-docs", "1",
+                                 "--paragraphs", "5", "--dims", "64"])
+    )
+
+    results = report["results"]
+    assert results["files_ok"] == 3 and not report["errors"]
+    assert results["pages"] == 6
+    assert results["chunks"] == results["indexed_chunks"] > 0
+    assert results["pages_per_second"] > 0 and results["chunks_per_second"] > 0
+    assert set(results["stage_seconds"]) == {"upload", "parse", "chunk", "embed", "write"}
+    assert results["peak_rss_mb"] > 0
+    assert results["embedding_requests"] >= 3
+
+
+def test_query_load_harness_runs_offline(monkeypatch):
+    """The load test serves /query against the mock LLM and splits time by stage."""
+    from benchmarks import query_load
+    from config import settings
+    from services import registry
+
+    monkeypatch.setattr(settings, "OLLAMA_BASE_URL", settings.OLLAMA_BASE_URL)
+    try:
+        report = query_load.run(
+            query_load.parse_args(["--requests", "4", "--concurrency", "2", "--warmup", "0",
+                                   "--clients", "2", "--docs-per-client", "2",
+                                   "--chunks-per-doc", "3", "--first-token-latency-ms", "0",
+                                   "--token-latency-ms", "0", "--embed-latency-ms", "0"])
+        )
+    finally:
+        registry.close_all()
+
+    results = report["results"]
+    assert results["statuses"] == {"200": 4}
+    assert results["llm_calls_per_query"] == 2
+    assert results["stages"]["vector_search"]["count"] == 4
+    assert 0 < results["latency_ms"]["p50"] <= results["latency_ms"]["p99"]
+    assert set(results["time_share"]) == {
+        "retrieval", "generation", "agent_overhead", "client_lookup", "server_and_queueing"
+    }
+
+
+def test_retrieval_bench_scores_each_strategy():
+    """Every strategy/k/over-fetch combination gets recall and MRR, but no in-memory latency."""
+    from benchmarks import retrieval_bench
+
+    report = retrieval_bench.run(
+        retrieval_bench.parse_args(["--sizes", "400", "--clients", "8", "--queries", "30",
+                                    "--k", "1,4", "--overfetch", "2", "--dims", "64"])
+    )
+
+    corpus = report["corpora"][0]
+    assert (corpus["chunks"], corpus["clients"], corpus["queries"]) == (400, 8, 30)
+    results = {(row["strategy"], row["k"]): row for row in report["results"]}
+    assert set(results) == {("overfetch", 1), ("overfetch", 4), ("filtered", 1), ("filtered", 4)}
+    for row in results.values():
+        assert 0 <= row["mrr_at_k"] <= row["recall_at_k"] <= 1
+        assert "latency_ms" not in row
+    assert (report["backend"], report["recall_is_upper_bound"]) == ("in_memory", True)
+    # The client filter inside the search always fills k; over-fetching from a
+    # shared index loses results to other clients
+    assert results[("filtered", 4)]["mean_results"] == 4
+    assert results[("filtered", 4)]["recall_at_k"] >= results[("overfetch", 4)]["recall_at_k"]
+
+
+def test_retrieval_bench_refuses_the_configured_neo4j_database(monkeypatch):
+    """--neo4j wipes its target, so it must not point at the API's database."""
+    from benchmarks import retrieval_bench
+    from config import settings
+
+    def connect(*args, **kwargs):
+        raise AssertionError("benchmark connected to the configured database")
+
+    monkeypatch.setattr(retrieval_bench.GraphDatabase, "driver", connect)
+    args = retrieval_bench.parse_args(
+        ["--neo4j", "--neo4j-database", settings.NEO4J_DATABASE, "--sizes", "10"]
+    )
+
+    with pytest.raises(SystemExit, match="configured API database"):
+        retrieval_bench.run(args)
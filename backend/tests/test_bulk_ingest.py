@@ -0,0 +1,95 @@
+"""Bulk ingestion CLI tests (local stand-ins for Ollama, Neo4j and Supabase)."""
+import asyncio
+import io
+import json
+
+from benchmarks.corpus import write_docx, write_pdf
+from benchmarks.stand_ins import FakeOllamaServer, InMemoryStorage, local_vector_store
+from services import registry
+from services.document_processor import DocumentProcessor
+import bulk_ingest
+
+
+def test_bulk_ingest_checkpoints_and_resumes(tmp_path):
+    """Files are parsed in worker processes, checkpointed, and skipped on the next run."""
+    root = tmp_path / "archive"
+    (root / "2019" / "case 12").mkdir(parents=True)
+    write_pdf(str(root / "2019" / "case 12" / "brief.pdf"), 2, seed=1)
+    write_pdf(str(root / "brief.pdf"), 1, seed=2)
+    write_docx(str(root / "memo.docx"), 4, seed=3)
+    (root / "notes.xyz").write_text("unsupported")
+    checkpoint = str(tmp_path / "load.ckpt.jsonl")
+
+    storage = InMemoryStorage()
+    storage.add_client("client-1", "Partner")
+    argv = ["--dir", str(root), "--client-doc-id", "client-1", "--checkpoint", checkpoint,
+            "--processes", "2", "--progress-interval", "0"]
+
+    with FakeOllamaServer(dims=32) as ollama:
+        vector_store = local_vector_store(ollama.url)
+        try:
+            registry.set_instance("supabase", storage)
+            registry.set_instance("document_processor", DocumentProcessor())
+            registry.set_instance("vector_store", vector_store)
+
+            progress = io.StringIO()
+            first = asyncio.run(bulk_ingest.ingest(bulk_ingest.parse_args(argv), progress))
+            indexed = vector_store.vector_store.size()
+            second = asyncio.run(bulk_ingest.ingest(bulk_ingest.parse_args(argv), io.StringIO()))
+        finally:
+            registry.close_all()
+
+    assert first["counts"] == {"processed": 3, "skipped": 0, "rejected": 1, "error": 0}
+    assert first["chunks"] == indexed > 0
+    assert first["embedding"]["batches"] <= 3
+    assert "ETA" in progress.getvalue() and "4/4 files" in progress.getvalue()
+
+    sources = {metadata["source"] for metadata in vector_store.vector_store.metadatas}
+    assert sources == {"2019__case_12__brief.pdf", "brief.pdf", "memo.docx"}
+
+    with open(checkpoint) as records:
+        statuses = sorted(json.loads(line)["status"] for line in records)
+    assert statuses == ["processed", "processed", "processed", "rejected"]
+
+    # Resume: everything is already finished, nothing is re-embedded
+    assert second["already_done"] == 4 and sum(second["counts"].values()) == 0
+    assert vector_store.vector_store.size() == indexed
+
+
+def test_checkpoint_retries_failed_and_changed_files(tmp_path):
+    """Only finished, unchanged files count as done; a torn last line is ignored."""
+    path = tmp_path / "ckpt.jsonl"
+    checkpoint = bulk_ingest.Checkpoint(str(path))
+    done = {"client_doc_id": "c", "local_path": "/a.pdf", "filename": "a.pdf",
+            "status": "processed", "size": 10, "mtime": 1}
+    failed = {**done, "local_path": "/b.pdf", "filename": "b.pdf", "status": "error"}
+    checkpoint.record(done)
+    checkpoint.record(failed)
+    checkpoint.close()
+    with open(path, "a") as file:
+        file.write('{"key": "c:/c.pdf", "sta')
+
+    reloaded = bulk_ingest.Checkpoint(str(path))
+    reloaded.close()
+    assert reloaded.is_done(done)
+    assert not reloaded.is_done(failed)
+    assert not reloaded.is_done({**done, "mtime": 2})
+
+
+def test_manifest_names_keep_folders_unless_given(tmp_path):
+    """Same-named files in different manifest folders get distinct stored names."""
+    manifest = tmp_path / "files.csv"
+    manifest.write_text(
+        "path,filename,client_doc_id\n"
+        "a/notes.txt,,client-1\n"
+        "b/notes.txt,,client-1\n"
+        "c/notes.txt,Final Notes.txt,client-2\n"
+    )
+
+    entries = list(bulk_ingest.iter_manifest(str(manifest)))
+
+    assert [entry["filename"] for entry in entries] == [
+        "a__notes.txt", "b__notes.txt", "Final_Notes.txt"
+    ]
+    assert entries[0]["local_path"] == str(tmp_path / "a" / "notes.txt")
+    assert entries[2]["client_doc_id"] == "client-2"
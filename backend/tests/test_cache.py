@@ -0,0 +1,39 @@
+"""TTL cache tests."""
+import time
+
+from utils.cache import TTLCache
+
+
+def test_hits_misses_and_negative_entries():
+    """Positive and negative results are cached and counted."""
+    cache = TTLCache(maxsize=10, ttl=60, negative_ttl=0.05)
+    cache.set("a", {"name": "Acme"})
+    cache.set("missing", None)
+
+    assert cache.get("a") == (True, {"name": "Acme"})
+    assert cache.get("missing") == (True, None)
+    assert cache.get("b") == (False, None)
+
+    time.sleep(0.06)
+    assert cache.get("missing") == (False, None)
+    assert cache.get("a")[0] is True
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["negative_hits"], stats["misses"]) == (2, 1, 2)
+    assert stats["hit_rate"] == 0.6
+
+
+def test_lru_eviction_and_invalidation():
+    """Least recently used entries are evicted; invalidation drops a key."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+
+    cache.invalidate("a")
+    assert cache.get("a") == (False, None)
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,103 @@
+"""Client listing pagination tests."""
+import pytest
+
+from services.supabase_service import SupabaseService
+from utils.helpers import decode_cursor, encode_cursor
+
+
+class FakeQuery:
+    """Records the PostgREST builder calls made by list_clients_page."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def __getattr__(self, name):
+        def record(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            return self
+        return record
+
+    def execute(self):
+        return type("Result", (), {"data": self.rows})()
+
+
+class FakeClient:
+    def __init__(self, query):
+        self.query = query
+
+    def table(self, name):
+        return self.query
+
+
+def make_service(rows):
+    service = SupabaseService.__new__(SupabaseService)
+    query = FakeQuery(rows)
+    service.client = FakeClient(query)
+    return service, query
+
+
+def test_cursor_round_trip():
+    """Cursors are opaque but decode back to the keyset values."""
+    cursor = encode_cursor(["2024-01-01T00:00:00+00:00", 42])
+    assert decode_cursor(cursor) == ["2024-01-01T00:00:00+00:00", 42]
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_list_clients_page_projects_and_paginates():
+    """Pages over-fetch by one row to detect a next page and skip summaries."""
+    rows = [{"id": i, "created_at": f"2024-01-0{i}T00:00:00"} for i in (3, 2, 1)]
+    service, query = make_service(rows)
+
+    page, next_cursor = service.list_clients_page(limit=2)
+
+    assert [row["id"] for row in page] == [3, 2]
+    assert decode_cursor(next_cursor) == ["2024-01-02T00:00:00", 2]
+    select = next(call for call in query.calls if call[0] == "select")
+    assert "summary" not in select[1][0]
+    assert ("limit", (3,), {}) in query.calls
+
+    service, query = make_service(rows[2:])
+    page, next_cursor = service.list_clients_page(limit=2, cursor=encode_cursor(["2024-01-02T00:00:00", 2]))
+
+    assert next_cursor is None
+    keyset = next(call for call in query.calls if call[0] == "or_")
+    assert keyset[1][0] == 'created_at.lt."2024-01-02T00:00:00",and(created_at.eq."2024-01-02T00:00:00",id.lt.2)'
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ['2024-01-02T00:00:00",id.gt.0', 2],
+        ["2024-01-02T00:00:00"],
+        ["2024-01-02T00:00:00", None],
+        ["2024-01-02T00:00:00", "2)"],
+        [None, 2],
+    ],
+)
+def test_malformed_cursor_values_are_rejected(values):
+    """Decoded cursors must hold an ISO timestamp and an integer id."""
+    service, query = make_service([])
+    with pytest.raises(ValueError):
+        service.list_clients_page(limit=2, cursor=encode_cursor(values))
+    assert not any(call[0] == "or_" for call in query.calls)
+
+
+def test_list_clients_endpoint_returns_400_for_a_malformed_cursor():
+    """A tampered cursor is a client error, not a 500."""
+    from fastapi.testclient import TestClient
+
+    from main import app
+    from services import registry
+
+    service, _ = make_service([])
+    try:
+        registry.set_instance("supabase", service)
+        response = TestClient(app).get(
+            "/clients", params={"cursor": encode_cursor(["2024-01-02T00:00:00", None])}
+        )
+    finally:
+        registry.close_all()
+
+    assert response.status_code == 400
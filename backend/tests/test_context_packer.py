@@ -0,0 +1,55 @@
+"""Token-budgeted context packing tests."""
+from langchain_core.documents import Document
+
+from services import context_packer
+from services.context_packer import PASSAGE_SEPARATOR, ContextPacker
+
+
+def count_words(text):
+    return len(text.split())
+
+
+def _passage(sentences, location, words=10):
+    text = " ".join(
+        " ".join([f"s{sentence}w{word}" for word in range(words - 1)] + [f"end{sentence}."])
+        for sentence in range(sentences)
+    )
+    return Document(page_content=text, metadata={"source": "a.pdf", "location": location})
+
+
+def test_passages_fit_whole_until_the_budget_then_cut_at_sentences():
+    """Best passages go in whole; the next is cut after a sentence, header kept."""
+    docs = [_passage(3, "p.1"), _passage(6, "p.2"), _passage(1, "p.3")]
+    packer = ContextPacker(max_tokens=70, counter=count_words)
+
+    packed = packer.pack(docs)
+
+    blocks = packed.text.split(PASSAGE_SEPARATOR)
+    assert [block.splitlines()[0] for block in blocks] == ["[a.pdf, p.1]", "[a.pdf, p.2]"]
+    assert blocks[1].endswith("end2.")  # three of six sentences fit
+    assert packed.tokens == count_words(packed.text) <= 70
+    assert (packed.passages, packed.truncated, packed.dropped) == (2, 1, 1)
+    assert (packed.included, packed.truncated_positions) == ([0], [1])
+
+
+def test_passage_too_large_for_what_is_left_is_skipped_for_a_smaller_one():
+    """A passage that would keep too little text is dropped; a later short one still fits."""
+    docs = [_passage(5, "p.1"), _passage(1, "p.2", words=60), _passage(1, "p.3", words=5)]
+    packer = ContextPacker(max_tokens=65, counter=count_words)
+
+    packed = packer.pack(docs)
+
+    assert "[a.pdf, p.2]" not in packed.text
+    assert packed.text.split(PASSAGE_SEPARATOR)[-1].startswith("[a.pdf, p.3]")
+    assert packed.tokens <= 65
+
+    unlimited = ContextPacker(max_tokens=0, counter=count_words).pack(docs)
+    assert (unlimited.passages, unlimited.truncated) == (3, 0)
+
+
+def test_count_tokens_falls_back_to_an_estimate(monkeypatch):
+    """Without a usable tiktoken encoding, tokens are estimated from length."""
+    monkeypatch.setattr(context_packer, "_counter", None)
+    monkeypatch.setattr(context_packer.settings, "CONTEXT_TOKENIZER", "no-such-encoding")
+
+    assert context_packer.count_tokens("x" * 40) == 10
@@ -0,0 +1,184 @@
+"""Client/file deletion and background job tests."""
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from config import settings
+from services import registry
+from services.deletion import ClientDeleter
+from services.jobs import JobManager
+from services.neo4j_store import Neo4jVectorStore
+
+
+class FakeNeo4jDriver:
+    """Driver whose write transactions delete up to $batch_size of ``remaining`` chunks."""
+
+    def __init__(self, remaining):
+        self.remaining = remaining
+        self.transactions = []
+
+    def session(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute_write(self, work):
+        return work(self)
+
+    def run(self, query, batch_size, **params):
+        deleted = min(batch_size, self.remaining)
+        self.remaining -= deleted
+        self.transactions.append((query, params, deleted))
+        return self
+
+    def single(self):
+        return {"updated": self.transactions[-1][2]}
+
+
+def test_neo4j_deletion_runs_in_bounded_transactions():
+    """Chunks are deleted LIMIT batch_size per transaction until none are left."""
+    store = Neo4jVectorStore.__new__(Neo4jVectorStore)
+    store.driver = FakeNeo4jDriver(12)
+    totals = []
+
+    deleted = store.delete_client_documents("client-1", batch_size=5, on_progress=totals.append)
+
+    assert deleted == 12 and store.driver.remaining == 0
+    assert [count for _, _, count in store.driver.transactions] == [5, 5, 2]
+    assert totals == [5, 10, 12]
+    query, params, _ = store.driver.transactions[0]
+    assert "LIMIT $batch_size DETACH DELETE n" in query
+    assert params == {"client_doc_id": "client-1"}
+
+    store.driver = FakeNeo4jDriver(3)
+    assert store.delete_file_documents("client-1", "a.pdf", batch_size=5) == 3
+    assert store.driver.transactions[0][1] == {"client_doc_id": "client-1", "source": "a.pdf"}
+
+    store.driver = FakeNeo4jDriver(2)
+    assert store.delete_stale_file_documents("client-1", "a.pdf", ["id-1"], batch_size=5) == 2
+    query, params, _ = store.driver.transactions[0]
+    assert "WHERE NOT n.id IN $keep_ids" in query
+    assert params == {"client_doc_id": "client-1", "source": "a.pdf", "keep_ids": ["id-1"]}
+
+
+class FakeBackends:
+    """Supabase and vector store stand-in recording deletion calls in order."""
+
+    def __init__(self):
+        self.calls = []
+        self.manifest = {
+            "a.pdf": {"filename": "a.pdf", "storage_path": "c1/a.pdf", "page_offsets": [[0, 4]]},
+            "b.docx": {"filename": "b.docx", "storage_path": "c1/b.docx", "page_offsets": None},
+        }
+
+    def delete_client_documents(self, doc_id, on_progress=None):
+        self.calls.append(("neo4j", doc_id))
+        on_progress(7)
+        return 7
+
+    def delete_file_documents(self, doc_id, source):
+        self.calls.append(("neo4j_file", source))
+        return 2
+
+    def list_storage_paths(self, doc_id):
+        return ["c1/a.pdf", "c1/orphan.txt"]
+
+    def list_client_files(self, doc_id):
+        return list(self.manifest.values())
+
+    def get_file_manifest(self, doc_id, filename):
+        return self.manifest.get(filename)
+
+    def delete_files(self, paths):
+        self.calls.append(("storage", sorted(paths)))
+        return len(paths)
+
+    def delete_file_manifest(self, doc_id, filename):
+        self.calls.append(("manifest", filename))
+
+    def delete_client(self, doc_id):
+        self.calls.append(("postgres", doc_id))
+
+
+def test_client_deletion_cascades_chunks_then_storage_then_records():
+    backends = FakeBackends()
+    progress = {}
+
+    result = ClientDeleter(backends, backends).delete_client("c1", lambda **f: progress.update(f))
+
+    assert backends.calls == [
+        ("neo4j", "c1"),
+        ("storage", ["c1/.pages/a.pdf.txt", "c1/a.pdf", "c1/b.docx", "c1/orphan.txt"]),
+        ("postgres", "c1"),
+    ]
+    assert result == {"client_doc_id": "c1", "chunks_deleted": 7, "storage_objects_deleted": 4}
+    assert progress == {"stage": "done", "chunks_deleted": 7, "storage_objects_deleted": 4}
+
+
+def test_file_deletion_removes_only_that_file():
+    backends = FakeBackends()
+    deleter = ClientDeleter(backends, backends)
+
+    assert deleter.delete_file("c1", "missing.pdf") is None
+    result = deleter.delete_file("c1", "a.pdf")
+
+    assert result == {"filename": "a.pdf", "chunks_deleted": 2, "storage_objects_deleted": 2}
+    assert backends.calls == [
+        ("neo4j_file", "a.pdf"),
+        ("storage", ["c1/.pages/a.pdf.txt", "c1/a.pdf"]),
+        ("manifest", "a.pdf"),
+    ]
+
+
+def test_job_manager_reuses_active_job_and_records_failures():
+    async def scenario():
+        manager = JobManager(max_finished=1)
+        slow = manager.submit("delete_client", "c1", lambda job: time.sleep(0.05) or "ok")
+        again = manager.submit("delete_client", "c1", lambda job: "duplicate")
+        failing = manager.submit("delete_client", "c2", lambda job: 1 / 0)
+        while slow.active or failing.active:
+            await asyncio.sleep(0.01)
+        return manager, slow, again, failing
+
+    manager, slow, again, failing = asyncio.run(scenario())
+    assert again is slow and slow.status == "succeeded" and slow.result == "ok"
+    assert failing.status == "failed" and "division" in failing.error
+    # Only the most recently finished job is kept
+    assert [job.id for job in manager.list()] == [slow.id]
+
+
+def test_delete_client_endpoint_runs_a_pollable_job(monkeypatch):
+    monkeypatch.setattr(settings, "STARTUP_WARMUP_SERVICES", "")
+    monkeypatch.setattr(settings, "MODEL_WARMUP_ENABLED", False)
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "secret")
+    backends = FakeBackends()
+    backends.get_client_by_doc_id = lambda doc_id: {"doc_id": doc_id} if doc_id == doc else None
+    doc = "00000000-0000-0000-0000-000000000001"
+    from main import app
+
+    try:
+        registry.set_instance("supabase", backends)
+        registry.set_instance("client_deleter", ClientDeleter(backends, backends))
+        with TestClient(app, headers={"X-Admin-Key": "secret"}) as client:
+            missing = client.delete("/clients/00000000-0000-0000-0000-000000000002")
+            started = client.delete(f"/clients/{doc}")
+            job_id = started.json()["job_id"]
+            for _ in range(100):
+                job = client.get(f"/jobs/{job_id}").json()
+                if job["status"] not in ("queued", "running"):
+                    break
+                time.sleep(0.01)
+            file_missing = client.delete(f"/clients/{doc}/files/nope.pdf")
+    finally:
+        registry.close_all()
+
+    assert missing.status_code == 404
+    assert started.status_code == 202 and started.json()["kind"] == "delete_client"
+    assert job["status"] == "succeeded"
+    assert job["result"]["chunks_deleted"] == 7
+    assert file_missing.status_code == 404
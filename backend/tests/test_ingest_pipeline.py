@@ -0,0 +1,190 @@
+"""Ingestion pipeline tests."""
+import asyncio
+import threading
+import time
+
+from services.ingest_pipeline import IngestPipeline
+from services.neo4j_store import EmbeddingVersion
+
+
+class SlowStages:
+    """Storage, processor and vector store stand-ins with fixed stage delays."""
+
+    active_version = EmbeddingVersion.default("embeddinggemma")
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.written = []
+        self.manifest = {}
+        self.deleted = []
+        self.events = []
+        self.lock = threading.Lock()
+
+    def upload_file(self, file_bytes, doc_id, filename):
+        time.sleep(self.delay)
+        return f"{doc_id}/{filename}"
+
+    def get_file_manifest(self, doc_id, filename):
+        return self.manifest.get((doc_id, filename))
+
+    def upsert_file_manifest(self, record):
+        key = (record["client_doc_id"], record["filename"])
+        with self.lock:
+            self.manifest.setdefault(key, {}).update(record)
+        return self.manifest[key]
+
+    def process_file_bytes(self, file_bytes, filename, client_doc_id, client_name, stats=None):
+        time.sleep(self.delay)
+        if filename == "broken.txt":
+            raise ValueError("unreadable")
+        stats["page_count"] = 1
+        return [{"text": file_bytes.decode(), "source": filename}]
+
+    def embed_chunks(self, chunks):
+        time.sleep(self.delay)
+        return [[0.0] for _ in chunks]
+
+    def add_embedded_documents_for_client(
+        self, chunks, embeddings, client_doc_id, client_name, embedding_version=None
+    ):
+        time.sleep(self.delay)
+        with self.lock:
+            self.written.extend(chunks)
+            self.events.append(("write", chunks[0]["source"]))
+        return [chunk["text"] for chunk in chunks]
+
+    def delete_stale_file_documents(self, client_doc_id, source, keep_ids):
+        self.deleted.append((source, keep_ids))
+        self.events.append(("delete_stale", source))
+
+
+def make_items(count):
+    return [
+        {
+            "filename": f"file{i}.txt",
+            "file_bytes": f"text {i}".encode(),
+            "client_doc_id": "doc-1",
+            "client_name": "Client",
+        }
+        for i in range(count)
+    ]
+
+
+def test_pipeline_overlaps_stages():
+    """Total time tracks the slowest stage rather than the sum of stages."""
+    stages = SlowStages(delay=0.05)
+    pipeline = IngestPipeline(
+        stages, stages, stages,
+        stage_workers={"upload": 1, "parse": 1, "embed": 1, "write": 1},
+        queue_size=1,
+    )
+    result = asyncio.run(pipeline.run(make_items(8)))
+
+    # Serial execution would take 8 files * 4 stages * 0.05s = 1.6s
+    assert result["stats"]["wall_seconds"] < 1.0
+    assert [item["filename"] for item in result["items"]] == [f"file{i}.txt" for i in range(8)]
+    assert all(item["status"] == "processed" for item in result["items"])
+    assert len(stages.written) == 8
+    assert result["stats"]["stages"]["parse"]["items"] == 8
+
+
+def test_pipeline_isolates_failures_and_skips_rejected():
+    """A failing file and a rejected file do not stop the others."""
+    stages = SlowStages(delay=0)
+    items = make_items(2)
+    items.append({"filename": "broken.txt", "file_bytes": b"", "client_doc_id": "doc-1", "client_name": "Client"})
+    items.append({"filename": "image.png", "status": "rejected", "message": "Unsupported"})
+    result = asyncio.run(IngestPipeline(stages, stages, stages).run(items))
+
+    statuses = {item["filename"]: item["status"] for item in result["items"]}
+    assert statuses == {
+        "file0.txt": "processed",
+        "file1.txt": "processed",
+        "broken.txt": "error",
+        "image.png": "rejected",
+    }
+    assert result["stats"]["stages"]["parse"]["errors"] == 1
+    assert result["stats"]["stages"]["embed"]["items"] == 2
+
+
+def test_pipeline_records_manifest_and_skips_unchanged_files():
+    """Manifest records are written; unchanged files are skipped, changed ones replaced."""
+    stages = SlowStages(delay=0)
+    pipeline = IngestPipeline(stages, stages, stages)
+    asyncio.run(pipeline.run(make_items(2)))
+
+    record = stages.manifest[("doc-1", "file0.txt")]
+    assert record["status"] == "indexed"
+    assert record["chunk_count"] == 1
+    assert record["page_count"] == 1
+    assert record["size_bytes"] == len(b"text 0")
+    assert record["parse_ms"] is not None
+
+    items = make_items(2)
+    items[1]["file_bytes"] = b"changed"
+    result = asyncio.run(pipeline.run(items))
+
+    assert [item["status"] for item in result["items"]] == ["skipped", "processed"]
+    # The previous version's chunks are deleted only after the new ones are written
+    assert stages.deleted == [("file1.txt", ["changed"])]
+    assert stages.events[-2:] == [("write", "file1.txt"), ("delete_stale", "file1.txt")]
+    assert len(stages.written) == 3
+
+
+def test_pipeline_batches_embeddings_and_writes():
+    """Concurrent files share embedding requests; writes are split into bounded batches."""
+    from services.embedding_batcher import EmbeddingBatcher
+
+    requests = []
+
+    def embed(texts):
+        requests.append(len(texts))
+        time.sleep(0.05)
+        return [[float(len(text))] for text in texts]
+
+    class ChunkedStages(SlowStages):
+        def process_file_bytes(self, file_bytes, filename, client_doc_id, client_name, stats=None):
+            return [{"text": f"{filename} {i}", "source": filename} for i in range(5)]
+
+        def add_embedded_documents_for_client(
+            self, chunks, embeddings, client_doc_id, client_name, embedding_version=None
+        ):
+            with self.lock:
+                self.written.append(len(chunks))
+            return [chunk["text"] for chunk in chunks]
+
+    stages = ChunkedStages(0)
+    batcher = EmbeddingBatcher(embed, max_batch=8, max_wait=0.02)
+    pipeline = IngestPipeline(
+        stages, stages, stages,
+        stage_workers={"upload": 1, "parse": 1, "embed": 4, "write": 1},
+        queue_size=4,
+        embed_batcher=batcher,
+        write_batch_size=2,
+    )
+    result = asyncio.run(pipeline.run(make_items(4)))
+    batcher.close()
+
+    assert all(item["status"] == "processed" for item in result["items"])
+    assert sum(requests) == 20 and max(requests) <= 8 and len(requests) < 4
+    assert stages.written == [2, 2, 1] * 4
+
+
+def test_chunk_time_is_only_taken_out_of_the_parse_stage():
+    """Chunking is reported apart from parse; embed and write keep their full time."""
+    from utils.metrics import INGEST_STAGE_SECONDS
+
+    class ChunkTimedStages(SlowStages):
+        def process_file_bytes(self, file_bytes, filename, client_doc_id, client_name, stats=None):
+            chunks = super().process_file_bytes(
+                file_bytes, filename, client_doc_id, client_name, stats
+            )
+            stats["chunk_seconds"] = self.delay
+            return chunks
+
+    stages = ChunkTimedStages(delay=0.05)
+    before = {stage: INGEST_STAGE_SECONDS.total(stage=stage) for stage in ("parse", "embed")}
+    asyncio.run(IngestPipeline(stages, stages, stages).run(make_items(1)))
+
+    assert INGEST_STAGE_SECONDS.total(stage="parse") - before["parse"] < 0.04
+    assert INGEST_STAGE_SECONDS.total(stage="embed") - before["embed"] >= 0.05
@@ -0,0 +1,42 @@
+"""Metrics registry and /metrics endpoint tests."""
+from fastapi.testclient import TestClient
+
+from utils.metrics import MetricsRegistry
+
+
+def test_render_exposition_format():
+    """Counters, gauges and histograms render in the Prometheus text format."""
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    depth = registry.gauge("queue_depth", "Depth.", ("stage",))
+    latency = registry.histogram("latency_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0))
+
+    requests.inc(route='/a"b')
+    requests.inc(2, route='/a"b')
+    depth.set(3, stage="parse")
+    latency.observe(0.05, stage="embed")
+    latency.observe(0.5, stage="embed")
+    latency.observe(5, stage="embed")
+
+    lines = registry.render().splitlines()
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{route="/a\\"b"} 3' in lines
+    assert 'queue_depth{stage="parse"} 3' in lines
+    assert 'latency_seconds_bucket{stage="embed",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{stage="embed",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{stage="embed",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{stage="embed"} 3' in lines
+    assert 'latency_seconds_sum{stage="embed"} 5.55' in lines
+
+
+def test_metrics_endpoint_reports_route_templates():
+    """Requests are labelled by route template, not the concrete path."""
+    from main import app
+
+    client = TestClient(app)
+    client.get("/metrics")
+    body = client.get("/metrics").text
+
+    assert 'http_requests_total{method="GET",route="/metrics",status="200"}' in body
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert "# TYPE ingest_stage_duration_seconds histogram" in body
@@ -0,0 +1,72 @@
+"""Ollama model residency manager tests."""
+import asyncio
+import json
+from datetime import datetime
+
+import httpx
+
+from services.model_residency import ModelResidencyManager, parse_policies
+
+
+class FakeOllama:
+    """Answers warm requests, reporting a slow load when a model is not loaded."""
+
+    def __init__(self):
+        self.loaded = set()
+        self.requests = []
+
+    def handle(self, request):
+        if request.url.path == "/api/ps":
+            return httpx.Response(200, json={"models": [{"name": name} for name in self.loaded]})
+        body = json.loads(request.content)
+        self.requests.append((request.url.path, body))
+        cold = body["model"] not in self.loaded
+        self.loaded.add(body["model"])
+        return httpx.Response(200, json={"load_duration": 4_000_000_000 if cold else 1_000_000})
+
+
+def make_manager(ollama, policies="mon-fri 08:00-19:00=15m"):
+    return ModelResidencyManager(
+        base_url="http://ollama",
+        models={"chat": "generate", "embedder": "embed"},
+        policies=parse_policies(policies),
+        transport=httpx.MockTransport(ollama.handle),
+    )
+
+
+def test_parse_policies_windows():
+    """Day ranges, lists, whole days and midnight-wrapping windows are matched."""
+    weekday, overnight, weekend = parse_policies(
+        "mon-fri 08:00-19:00=15m; tue 22:00-06:00=-1; sat,sun=5m"
+    )
+    monday_noon = datetime(2024, 1, 1, 12, 0)
+    assert weekday.matches(monday_noon)
+    assert not weekday.matches(datetime(2024, 1, 1, 19, 0))
+    assert overnight.matches(datetime(2024, 1, 2, 23, 30))
+    assert not overnight.matches(monday_noon)
+    assert weekend.matches(datetime(2024, 1, 6, 3, 0)) and weekend.keep_alive == "5m"
+
+
+def test_preload_and_keep_alive_track_cold_loads():
+    """Preload loads both models; pings during policy hours refresh keep_alive."""
+    ollama = FakeOllama()
+    manager = make_manager(ollama)
+
+    async def scenario():
+        await manager.preload()
+        await manager.tick(now=datetime(2024, 1, 1, 10, 0))  # Monday, in hours
+        ollama.loaded.discard("chat")  # evicted behind our back
+        await manager.tick(now=datetime(2024, 1, 1, 10, 1))
+        await manager.tick(now=datetime(2024, 1, 6, 10, 0))  # Saturday, no policy
+        return await manager.refresh_residency()
+
+    residency = asyncio.run(scenario())
+
+    assert [path for path, _ in ollama.requests].count("/api/embed") == 3
+    assert {body["keep_alive"] for _, body in ollama.requests[2:]} == {"15m"}
+    chat = manager.report()["models"]["chat"]
+    assert chat["cold_loads"] == 2
+    assert chat["unexpected_cold_loads"] == 1
+    assert chat["last_load_seconds"] == 4.0
+    assert manager.report()["models"]["embedder"]["cold_loads"] == 1
+    assert residency == {"chat": True, "embedder": True}
@@ -0,0 +1,30 @@
+"""Page index tests."""
+import io
+
+import PyPDF2
+
+from services.document_processor import DocumentProcessor
+
+
+def test_page_index_offsets_slice_each_page():
+    """Byte offsets recover each page, including blank and non-ASCII pages."""
+    pages = ["First page", "", "Página três — §2"]
+    blob, offsets = DocumentProcessor.build_page_index(pages)
+
+    assert [blob[start:end].decode("utf-8") for start, end in offsets] == pages
+    assert offsets[1][0] == offsets[1][1]
+
+
+def test_extract_pdf_page_returns_single_page():
+    """A single page is cut out of a multi-page PDF."""
+    writer = PyPDF2.PdfWriter()
+    for width in (100, 200, 300):
+        writer.add_blank_page(width=width, height=100)
+    source = io.BytesIO()
+    writer.write(source)
+
+    page_pdf = DocumentProcessor.extract_pdf_page(source.getvalue(), 2)
+
+    reader = PyPDF2.PdfReader(io.BytesIO(page_pdf))
+    assert len(reader.pages) == 1
+    assert float(reader.pages[0].mediabox.width) == 200
@@ -0,0 +1,215 @@
+"""Partition routing and migration tests."""
+import uuid
+
+import pytest
+
+from benchmarks.stand_ins import FakeOllamaServer, InMemoryVectorIndex, local_vector_store
+from services.neo4j_store import EmbeddingVersion, PartitionScheme
+from services.partitioning import PartitionMigrator
+
+
+def test_partition_routing_is_stable_and_spreads_clients():
+    """A client always maps to the same partition; clients spread over all partitions."""
+    scheme = PartitionScheme(16)
+    version = EmbeddingVersion.default("embeddinggemma")
+    clients = [str(uuid.UUID(int=index)) for index in range(1000)]
+
+    partitions = [scheme.partition_for(client) for client in clients]
+    assert partitions == [PartitionScheme(16).partition_for(client) for client in clients]
+    assert set(partitions) == set(range(16))
+
+    client = clients[0]
+    partition = scheme.partition_for(client)
+    assert scheme.label_for(client) == f"DocumentChunk_p16_{partition}"
+    assert scheme.index_for(version, client) == f"legal_documents_p16_{partition}"
+    assert PartitionScheme().label_for(client) is None
+    assert PartitionScheme().index_for(version, client) is None
+
+
+def test_search_uses_the_client_partition_index():
+    """Overfetch searches name the client's partition index; unpartitioned ones do not."""
+
+    class RecordingIndex(InMemoryVectorIndex):
+        def __init__(self):
+            super().__init__()
+            self.params = []
+
+        def similarity_search_by_vector(self, embedding, k=4, filter=None, params=None, **kwargs):
+            self.params.append(params)
+            return super().similarity_search_by_vector(embedding, k=k, filter=filter)
+
+    with FakeOllamaServer(dims=8) as ollama:
+        store = local_vector_store(ollama.url)
+        index = RecordingIndex()
+        scheme = PartitionScheme(8)
+        store._set_active(store.active_version, store.embeddings, index, scheme)
+
+        store.search_by_client("indemnity", "client-1", strategy="overfetch")
+        store._set_active(store.active_version, store.embeddings, index)
+        store.search_by_client("indemnity", "client-1", strategy="overfetch")
+
+    expected = scheme.index_for(store.active_version, "client-1")
+    assert index.params == [{"index": expected}, {}]
+
+
+def test_search_drives_the_langchain_neo4j_vector():
+    """Both strategies satisfy the real Neo4jVector search contract (it reads query)."""
+    from langchain_community.vectorstores.neo4j_vector import (
+        IndexType,
+        Neo4jVector,
+        SearchType,
+    )
+
+    from services.neo4j_store import retrieval_query
+
+    queries = []
+
+    def run_query(cypher, params=None):
+        queries.append(params)
+        return [{
+            "text": "Indemnity is capped at fees paid.",
+            "score": 0.9,
+            "metadata": {"source": "msa.pdf", "location": "p.3", "chunk_id": "msa.pdf_1",
+                         "client_doc_id": "client-1", "_embedding_": [0.1] * 8},
+        }]
+
+    with FakeOllamaServer(dims=8) as ollama:
+        store = local_vector_store(ollama.url)
+        version = store.active_version
+        # Neo4jVector without its constructor, which connects to Neo4j
+        index = Neo4jVector.__new__(Neo4jVector)
+        index.__dict__.update(
+            search_type=SearchType.VECTOR,
+            _index_type=IndexType.NODE,
+            _is_enterprise=False,
+            support_metadata_filter=True,
+            node_label="DocumentChunk",
+            embedding_node_property=version.embedding_property,
+            text_node_property="text",
+            embedding_dimension=8,
+            index_name=version.index_name,
+            keyword_index_name="keyword",
+            retrieval_query=retrieval_query(version.embedding_property),
+            query=run_query,
+        )
+        store._set_active(version, store.embeddings, index, PartitionScheme(8))
+
+        overfetch = store.search_by_client("indemnity?", "client-1", strategy="overfetch")
+        filtered = store.search_by_client("indemnity?", "client-1", strategy="filtered")
+
+    assert [doc.metadata["chunk_id"] for doc in overfetch + filtered] == ["msa.pdf_1"] * 2
+    assert all("_embedding_" not in doc.metadata for doc in overfetch + filtered)
+    assert [params["query"] for params in queries] == ["indemnity"] * 2
+    assert queries[0]["index"] == PartitionScheme(8).index_for(version, "client-1")
+
+
+class FakePartitionStore:
+    """The Neo4jVectorStore calls PartitionMigrator uses, over in-memory chunk labels."""
+
+    def __init__(self, clients, chunks_per_client):
+        self.chunks = [
+            {"client": client, "labels": set()}
+            for client in clients
+            for _ in range(chunks_per_client)
+        ]
+        self.partition_scheme = PartitionScheme()
+        self.retiring = None
+        self.indexes = {"legal_documents"}
+        self.on_activate = None
+        self.fail_cleanup = False
+
+    def list_embedding_versions(self):
+        return [
+            EmbeddingVersion(
+                name="v1", model="m", embedding_property="embedding",
+                index_name="legal_documents", dimensions=8, status="active",
+            )
+        ]
+
+    def create_version_indexes(self, version, partitions):
+        self.indexes.update(
+            partitions.index_name(version, partition) for partition in range(partitions.partitions)
+        )
+
+    def list_chunk_clients(self):
+        return sorted({chunk["client"] for chunk in self.chunks})
+
+    def label_client_chunks(self, partitions, client_doc_id, batch_size=None):
+        label = partitions.label_for(client_doc_id)
+        missing = [
+            chunk for chunk in self.chunks
+            if chunk["client"] == client_doc_id and label not in chunk["labels"]
+        ]
+        for chunk in missing:
+            chunk["labels"].add(label)
+        return len(missing)
+
+    def await_indexes(self, timeout):
+        pass
+
+    def activate_partition_scheme(self, partitions):
+        self.retiring = self.partition_scheme
+        self.partition_scheme = partitions
+        if self.on_activate:
+            self.on_activate()
+
+    def retiring_partition_scheme(self):
+        return self.retiring
+
+    def remove_partition_labels(self, partitions, partition, batch_size=None):
+        if self.fail_cleanup:
+            raise RuntimeError("connection lost")
+        label = partitions.label(partition)
+        labelled = [chunk for chunk in self.chunks if label in chunk["labels"]]
+        for chunk in labelled:
+            chunk["labels"].discard(label)
+        return len(labelled)
+
+    def drop_vector_indexes(self, version, partitions):
+        if partitions.partitions:
+            self.indexes -= {
+                partitions.index_name(version, partition)
+                for partition in range(partitions.partitions)
+            }
+        else:
+            self.indexes.discard(version.index_name)
+
+    def finish_partition_migration(self):
+        self.retiring = None
+
+
+def test_migration_labels_switches_catches_up_and_resumes_cleanup():
+    """Chunks get their partition labels, late writes are caught up, old labels go."""
+    clients = [f"client-{index}" for index in range(6)]
+    store = FakePartitionStore(clients, chunks_per_client=3)
+    migrator = PartitionMigrator(store, catch_up_delay=0)
+
+    def lagging_write():
+        # Another process writes a chunk without the new label just after the switch
+        store.chunks.append({"client": "client-0", "labels": set()})
+
+    store.on_activate = lagging_write
+    result = migrator.run(4)
+
+    assert result["chunks_labelled"] == 19
+    scheme = PartitionScheme(4)
+    assert all(chunk["labels"] == {scheme.label_for(chunk["client"])} for chunk in store.chunks)
+    assert store.partition_scheme == scheme and store.retiring is None
+    assert "legal_documents" in store.indexes  # kept unless drop_shared_indexes
+
+    # Re-partition; the cleanup of the old labels fails and is resumed by a rerun
+    store.on_activate = None
+    store.fail_cleanup = True
+    with pytest.raises(RuntimeError):
+        migrator.run(8)
+    assert store.partition_scheme == PartitionScheme(8) and store.retiring == scheme
+
+    store.fail_cleanup = False
+    result = migrator.run(8)
+    assert result["previous_partitions"] == 4 and result["chunks_unlabelled"] == 19
+    new_scheme = PartitionScheme(8)
+    assert all(chunk["labels"] == {new_scheme.label_for(chunk["client"])} for chunk in store.chunks)
+    assert not any(name.endswith(("_p4_0", "_p4_1", "_p4_2", "_p4_3")) for name in store.indexes)
+
+    with pytest.raises(ValueError):
+        migrator.run(8)
@@ -0,0 +1,72 @@
+"""MMR re-ranking and adjacent chunk merging tests."""
+from langchain_core.documents import Document
+
+from benchmarks.stand_ins import FakeOllamaServer, local_vector_store
+from services.neo4j_store import EMBEDDING_METADATA_KEY
+from services.passages import PassageRetriever, merge_passages, mmr_select
+
+
+def test_mmr_prefers_distinct_candidates():
+    """A near-duplicate of the best hit loses to a less similar but distinct one."""
+    query = [1.0, 0.0, 0.0]
+    candidates = [
+        [1.0, 0.1, 0.0],   # best hit
+        [1.0, 0.12, 0.0],  # near-duplicate of the best hit
+        [0.7, 0.0, 0.7],   # relevant, different direction
+    ]
+
+    assert mmr_select(query, candidates, 2, lambda_mult=0.5) == [0, 2]
+    assert mmr_select(query, candidates, 3, lambda_mult=1.0) == [0, 1, 2]
+    assert mmr_select(query, [], 2) == []
+
+
+def _chunk(text, number, location="p.1", source="a.pdf"):
+    return Document(
+        page_content=text,
+        metadata={"source": source, "location": location, "chunk_id": f"{source}_{number}"},
+    )
+
+
+def test_merge_joins_consecutive_chunks_and_drops_overlap():
+    """Consecutive chunks of a page become one passage; other chunks stay apart."""
+    docs = [
+        _chunk("the indemnity obligations survive termination.", 4),
+        _chunk("Clause 9 sets out the indemnity obligations", 3),
+        _chunk("Governing law is England.", 12, location="p.4"),
+        _chunk("Unrelated clause on notices.", 6),
+    ]
+
+    passages = merge_passages(docs)
+
+    assert [p.page_content for p in passages] == [
+        "Clause 9 sets out the indemnity obligations survive termination.",
+        "Governing law is England.",
+        "Unrelated clause on notices.",
+    ]
+    assert passages[0].metadata["chunk_ids"] == ["a.pdf_3", "a.pdf_4"]
+    assert passages[0].metadata["location"] == "p.1"
+    assert "chunk_ids" not in passages[1].metadata
+
+
+def test_retriever_returns_k_passages_without_vectors():
+    """End to end over the stand-in index; vectors never reach the prompt metadata."""
+    with FakeOllamaServer(dims=32) as ollama:
+        store = local_vector_store(ollama.url)
+        texts = [f"Indemnity clause {index} covers losses of type {index}." for index in range(12)]
+        chunks = [
+            {"text": text, "source": "a.pdf", "location": f"p.{index}", "chunk_id": f"a.pdf_{index}"}
+            for index, text in enumerate(texts)
+        ]
+        store.add_embedded_documents_for_client(
+            chunks, store.embeddings.embed_documents(texts), "client-1", "Client"
+        )
+
+        passages = PassageRetriever(store, mmr=True, candidates=3).retrieve(
+            "indemnity losses", "client-1", k=4
+        )
+        plain = store.search_by_client("indemnity losses", "client-1", k=4)
+
+    assert len(passages) == 4
+    assert len({p.metadata["chunk_id"] for p in passages}) == 4
+    for doc in passages + plain:
+        assert EMBEDDING_METADATA_KEY not in doc.metadata
@@ -0,0 +1,87 @@
+"""Request profiling tests."""
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from utils.metrics import QUERY_STAGE_SECONDS, timed
+from utils.profiling import ProfileSession, current_session, profiled, profiling_session
+
+
+@profiled("work.outer")
+def outer():
+    with timed(QUERY_STAGE_SECONDS, "embedding"):
+        inner()
+    return sum(range(1000))
+
+
+@profiled("work.inner")
+def inner():
+    return sorted(range(100), reverse=True)
+
+
+def test_profiled_calls_record_stages_and_cprofile_across_threads():
+    """Stages from worker threads land in the session and cProfile output is merged."""
+    session = ProfileSession("POST", "/query", "header")
+
+    async def request():
+        with profiling_session(session):
+            await asyncio.to_thread(outer)
+            outer()
+        assert current_session() is None
+
+    asyncio.run(request())
+    session.finish(200)
+    profile = session.to_dict()
+
+    assert profile["stage_totals"]["work.outer"]["count"] == 2
+    assert profile["stage_totals"]["work.inner"]["count"] == 2
+    assert profile["stage_totals"]["embedding"]["count"] == 2
+    assert "outer" in profile["cprofile"]
+    assert profile["status"] == 200
+
+
+def test_unprofiled_calls_are_untouched():
+    """Without an active session nothing is recorded."""
+    assert outer() == sum(range(1000))
+    assert current_session() is None
+
+
+def test_profile_header_stores_retrievable_profile(monkeypatch):
+    """X-Profile: 1 returns a profile id that the admin endpoint serves."""
+    from config import settings
+    from main import app
+
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "secret")
+    client = TestClient(app, headers={"X-Admin-Key": "secret"})
+    response = client.get("/clients/not-a-uuid/files", headers={"X-Profile": "1"})
+    profile_id = response.headers["X-Profile-Id"]
+
+    profile = client.get(f"/admin/profiles/{profile_id}").json()
+    assert profile["path"] == "/clients/not-a-uuid/files"
+    assert profile["status"] == response.status_code
+    assert profile["trigger"] == "header"
+    assert any(item["id"] == profile_id for item in client.get("/admin/profiles").json())
+    assert "X-Profile-Id" not in client.get("/clients/not-a-uuid/files").headers
+
+
+def test_admin_endpoints_fail_closed_without_a_key(monkeypatch):
+    """No configured key refuses admin calls unless auth is explicitly disabled."""
+    from config import settings
+    from main import app
+
+    client = TestClient(app)
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "")
+    unconfigured = client.get("/admin/profiles")
+    unprofiled = client.get("/clients/not-a-uuid/files", headers={"X-Profile": "1"})
+
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "secret")
+    wrong_key = client.get("/admin/profiles", headers={"X-Admin-Key": "guess"})
+
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "")
+    monkeypatch.setattr(settings, "ADMIN_AUTH_DISABLED", True)
+    disabled = client.get("/admin/profiles")
+
+    assert unconfigured.status_code == 503
+    assert "X-Profile-Id" not in unprofiled.headers
+    assert wrong_key.status_code == 403
+    assert disabled.status_code == 200
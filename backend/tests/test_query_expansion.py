@@ -0,0 +1,73 @@
+"""Multi-query expansion and rank fusion tests."""
+from types import SimpleNamespace
+
+from langchain_core.documents import Document
+
+from benchmarks.stand_ins import FakeOllamaServer, local_vector_store
+from services.passages import PassageRetriever
+from services.query_expansion import QueryExpander, rrf_fuse
+
+
+def test_rules_split_clauses_and_add_document_wording():
+    """Clauses become queries, keywords gain legal synonyms, the question comes first."""
+    expander = QueryExpander("rules", max_queries=5)
+    question = "Is there an alibi and what did the parole board decide?"
+
+    queries = expander.expand(question)
+
+    assert queries[0] == question
+    assert "Is there an alibi" in queries
+    assert "what did the parole board decide" in queries
+    assert any("whereabouts" in query and "release hearing" in query for query in queries)
+    assert len(QueryExpander("rules", max_queries=2).expand(question)) == 2
+    assert QueryExpander("off").expand(question) == [question]
+
+
+def test_llm_rewrites_are_cleaned_and_failures_fall_back_to_rules():
+    """Numbering and thinking are stripped; a failing LLM call uses the rules."""
+    reply = "<think>plan</think>\n1. defendant whereabouts on 4 March\n- witness placing defendant\n"
+    llm = SimpleNamespace(invoke=lambda prompt: SimpleNamespace(content=reply))
+    queries = QueryExpander("llm", max_queries=4, llm=llm).expand("Alibi?")
+    assert queries == ["Alibi?", "defendant whereabouts on 4 March", "witness placing defendant"]
+
+    def fail(prompt):
+        raise ConnectionError("ollama down")
+
+    fallback = QueryExpander("llm", max_queries=4, llm=SimpleNamespace(invoke=fail))
+    assert "alibi whereabouts at the time witness" in fallback.expand("Any alibi?")
+
+
+def test_rrf_prefers_documents_ranked_well_by_several_queries():
+    """A document in both lists beats one ranked first by a single list."""
+    a, b, c = (Document(page_content=x, metadata={"chunk_id": x}) for x in "abc")
+    fused = rrf_fuse([[a, b], [c, b]])
+    assert [doc.metadata["chunk_id"] for doc in fused] == ["b", "a", "c"]
+
+
+def test_expanded_retrieval_embeds_all_queries_in_one_request():
+    """Sub-queries share one embed request and fused results reach the caller."""
+    with FakeOllamaServer(dims=64) as ollama:
+        store = local_vector_store(ollama.url)
+        texts = [f"Witness {index} saw the defendant at the station." for index in range(6)]
+        texts += ["The parole board adjourned the release hearing.", "Fees are payable monthly."]
+        chunks = [
+            {"text": text, "source": "case.pdf", "location": f"p.{index}",
+             "chunk_id": f"case.pdf_{index}"}
+            for index, text in enumerate(texts)
+        ]
+        store.add_embedded_documents_for_client(
+            chunks, store.embeddings.embed_documents(texts), "client-1", "Client"
+        )
+        retriever = PassageRetriever(
+            store, mmr=True, candidates=2, expander=QueryExpander("rules", max_queries=4)
+        )
+        before = ollama.counts["embed_requests"]
+
+        passages = retriever.retrieve(
+            "Is there an alibi and what did the parole board say?", "client-1", k=3
+        )
+
+        assert ollama.counts["embed_requests"] - before == 1
+    assert len(passages) == 3
+    assert any("parole board" in passage.page_content for passage in passages)
+    assert all("_embedding_" not in passage.metadata for passage in passages)
@@ -0,0 +1,149 @@
+"""Embedding version and re-embed job tests."""
+import time
+
+import numpy as np
+import pytest
+
+from benchmarks.stand_ins import FakeOllamaServer, hash_embedding, local_vector_store
+from services.jobs import Job, JobCancelled
+from services.neo4j_store import EmbeddingVersion, version_name
+from services.reembedding import Reembedder
+
+
+class FakeEmbeddings:
+    """Embeds a text as [model tag, text length]."""
+
+    def __init__(self, model):
+        self.model = model
+        self.calls = 0
+
+    def embed_query(self, text):
+        return [0.0, 0.0]
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        return [[float(len(self.model)), float(len(text))] for text in texts]
+
+
+class FakeChunkStore:
+    """The Neo4jVectorStore calls Reembedder uses, over an in-memory set of chunks."""
+
+    def __init__(self, count):
+        self.chunks = {f"{index:04d}": {"text": f"chunk {index}"} for index in range(count)}
+        self.active_version = EmbeddingVersion.default("old-model")
+        self.versions = {self.active_version.name: self.active_version}
+        self.on_activate = None
+
+    def embeddings_for(self, model):
+        return FakeEmbeddings(model)
+
+    def prepare_embedding_version(self, model, dimensions):
+        version = self.versions.setdefault(version_name(model), EmbeddingVersion.for_model(model))
+        version.dimensions = dimensions
+        return version
+
+    def version_coverage(self, version):
+        prop = version.embedding_property
+        return {
+            "total": len(self.chunks),
+            "embedded": sum(prop in chunk for chunk in self.chunks.values()),
+        }
+
+    def scan_chunks(self, version, after, limit):
+        ids = sorted(chunk_id for chunk_id in self.chunks if chunk_id > after)[:limit]
+        prop = version.embedding_property
+        return [
+            (chunk_id, self.chunks[chunk_id]["text"], prop not in self.chunks[chunk_id])
+            for chunk_id in ids
+        ]
+
+    def write_version_embeddings(self, version, ids, embeddings):
+        for chunk_id, vector in zip(ids, embeddings):
+            self.chunks[chunk_id][version.embedding_property] = vector
+
+    def activate_embedding_version(self, name):
+        self.active_version.status = "retired"
+        self.active_version = self.versions[name]
+        self.active_version.status = "active"
+        if self.on_activate:
+            self.on_activate()
+
+
+def test_reembed_fills_new_version_switches_and_catches_up():
+    """Every chunk gets the new vector, the switch happens, and late writes are caught up."""
+    store = FakeChunkStore(10)
+    new_property = EmbeddingVersion.for_model("new-model").embedding_property
+
+    def lagging_write():
+        # Another process writes with the old version just after the switch
+        store.chunks["0003b"] = {"text": "late chunk"}
+
+    store.on_activate = lagging_write
+    reembedder = Reembedder(store, batch_size=4, max_texts_per_second=0, catch_up_delay=0)
+    job = Job("reembed", "new-model")
+
+    result = reembedder.run("new-model", job)
+
+    assert store.active_version.name == "new_model"
+    assert result["chunks_embedded"] == 11
+    assert all(new_property in chunk for chunk in store.chunks.values())
+    assert job.progress["stage"] == "done"
+    assert job.progress["embedded"] == job.progress["total"] == 10
+    with pytest.raises(ValueError):
+        reembedder.check_model("new-model")
+
+
+def test_reembed_resumes_after_cancel_without_redoing_work():
+    """A cancelled job leaves the old version active; a rerun embeds only what is left."""
+    store = FakeChunkStore(10)
+    reembedder = Reembedder(store, batch_size=3, max_texts_per_second=0, catch_up_delay=0)
+    job = Job("reembed", "new-model")
+    written = []
+    original_write = store.write_version_embeddings
+
+    def write_then_cancel(version, ids, embeddings):
+        original_write(version, ids, embeddings)
+        written.extend(ids)
+        job.cancel()
+
+    store.write_version_embeddings = write_then_cancel
+    with pytest.raises(JobCancelled):
+        reembedder.run("new-model", job)
+    assert store.active_version.name == "old_model"
+    assert len(written) == 3
+
+    store.write_version_embeddings = original_write
+    result = reembedder.run("new-model", Job("reembed", "new-model"))
+    assert result["chunks_embedded"] == 7
+    assert store.active_version.name == "new_model"
+
+
+def test_reembed_throttles_to_max_rate():
+    """Throughput stays under max_texts_per_second."""
+    store = FakeChunkStore(20)
+    reembedder = Reembedder(store, batch_size=5, max_texts_per_second=100, catch_up_delay=0)
+
+    started = time.monotonic()
+    reembedder.run("new-model", Job("reembed", "new-model"))
+
+    assert time.monotonic() - started >= 0.19
+
+
+def test_write_reembeds_when_version_changed_since_embedding():
+    """Vectors computed under a no longer active version are recomputed before writing."""
+    with FakeOllamaServer(dims=16) as ollama:
+        store = local_vector_store(ollama.url)
+        chunk = {
+            "text": "Clause 4 covers indemnity.",
+            "source": "a.pdf",
+            "location": "p.1",
+            "chunk_id": "a.pdf_1",
+        }
+
+        store.add_embedded_documents_for_client(
+            [chunk], [[0.0] * 16], "client-1", "Client", embedding_version="retired_model"
+        )
+
+        stored = store.vector_store.matrix()[0]
+        expected = np.asarray(hash_embedding(chunk["text"], 16), dtype=np.float32)
+        assert np.allclose(stored, expected, atol=1e-5)
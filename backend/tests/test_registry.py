@@ -0,0 +1,50 @@
+"""Lazy service registry tests."""
+import asyncio
+import threading
+import time
+
+from services import registry
+
+
+def test_get_or_create_builds_once_under_concurrency():
+    """Concurrent first calls share a single construction."""
+    builds = []
+
+    def factory():
+        time.sleep(0.05)
+        builds.append(1)
+        return object()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry._get_or_create("test_once", factory)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert all(result is results[0] for result in results)
+    registry._instances.pop("test_once")
+
+
+def test_warm_up_reports_failures_without_raising(monkeypatch):
+    """A failing service is reported and retried later; others still warm up."""
+
+    def broken():
+        raise ConnectionError("backend down")
+
+    monkeypatch.setitem(registry.WARMUP_GETTERS, "broken", broken)
+    monkeypatch.setitem(registry.WARMUP_GETTERS, "fine", lambda: registry._get_or_create("fine", object))
+
+    report = asyncio.run(registry.warm_up(["broken", "fine", "unknown"]))
+
+    assert set(report) == {"broken", "fine"}
+    assert report["broken"]["ok"] is False
+    assert "backend down" in report["broken"]["error"]
+    assert report["fine"]["ok"] is True
+    assert registry.peek("broken") is None
+    assert registry.peek("fine") is not None
+    registry._instances.pop("fine")
@@ -0,0 +1,138 @@
+"""Conversation session tests."""
+import time
+
+from fastapi.testclient import TestClient
+
+from types import SimpleNamespace
+
+from langchain_core.documents import Document
+
+from benchmarks.stand_ins import FakeOllamaServer, InMemoryStorage, local_vector_store
+from config import settings
+from services import registry
+from services.agent import LegalRAGAgent
+from services.context_packer import ContextPacker
+from services.sessions import SessionStore, SessionTurn
+
+CLIENT = "550e8400-e29b-41d4-a716-446655440000"
+
+
+def test_sessions_expire_when_idle_and_least_recently_used_are_evicted():
+    """Idle sessions expire; beyond max_sessions the least recently used one goes."""
+    store = SessionStore(idle_seconds=0.05, max_sessions=2, max_tokens=100)
+    first = store.create(CLIENT)
+    time.sleep(0.1)
+    assert store.get(first.id) is None
+
+    store.idle_seconds = 60
+    a, b = store.create(CLIENT), store.create(CLIENT)
+    store.get(a.id)
+    c = store.create(CLIENT)
+    assert store.get(b.id) is None
+    assert store.get(a.id) is a and store.get(c.id) is c
+    assert store.delete(c.id) and not store.delete(c.id)
+
+
+def test_token_cap_drops_oldest_turns_and_their_passages():
+    """Beyond max_tokens the oldest turns go; their passages may be sent again."""
+    session = SessionStore(max_tokens=100).create(CLIENT)
+    session.add_turn(SessionTurn("q1", "a1", passages=[("a.pdf", "a.pdf_1", ())], tokens=60))
+    dropped = session.add_turn(
+        SessionTurn("q2", "a2", passages=[("a.pdf", "a.pdf_2", ())], tokens=60)
+    )
+
+    assert dropped == 1
+    assert [turn.content for turn in session.turns] == ["q2"]
+    assert session.sent == {("a.pdf", "a.pdf_2", ())} and session.tokens == 60
+
+
+class RecordingOllama(FakeOllamaServer):
+    """Fake Ollama keeping the messages of every chat request."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.chats = []
+
+    def stream_chat(self, body):
+        self.chats.append(body.get("messages", []))
+        return super().stream_chat(body)
+
+
+def test_follow_up_extends_the_previous_prompt_without_resending_passages(monkeypatch):
+    """Turn two's prompt starts with turn one's; already sent passages are not repeated."""
+    from main import app
+
+    with RecordingOllama(dims=32) as ollama:
+        monkeypatch.setattr(settings, "OLLAMA_BASE_URL", ollama.url)
+        storage = InMemoryStorage()
+        storage.add_client(CLIENT, "Client")
+        vector_store = local_vector_store(ollama.url)
+        texts = [
+            "The alibi witness places the defendant in Leeds on 4 March.",
+            "The parole board noted good conduct.",
+        ]
+        vector_store.add_embedded_documents_for_client(
+            [
+                {"text": text, "source": "case.pdf", "location": f"p.{page}",
+                 "chunk_id": f"case.pdf_{page}"}
+                for page, text in enumerate(texts, start=1)
+            ],
+            vector_store.embeddings.embed_documents(texts),
+            CLIENT,
+            "Client",
+        )
+        try:
+            registry.set_instance("supabase", storage)
+            registry.set_instance("vector_store", vector_store)
+            registry.set_instance("rag_agent", LegalRAGAgent(vector_store))
+            client = TestClient(app)
+
+            session_id = client.post("/sessions", json={"client_doc_id": CLIENT}).json()[
+                "session_id"
+            ]
+            ask = {"question": "Is there an alibi?", "client_doc_id": CLIENT,
+                   "session_id": session_id}
+            first = client.post("/query", json=ask).json()
+            second = client.post("/query", json=ask).json()
+            state = client.get(f"/sessions/{session_id}").json()
+            other_client = client.post(
+                "/query", json={**ask, "client_doc_id": "00000000-0000-0000-0000-000000000000"}
+            )
+            ended = client.delete(f"/sessions/{session_id}")
+            expired = client.post("/query", json=ask)
+        finally:
+            registry.close_all()
+
+    assert first["session_id"] == session_id and first["citations"]
+    assert first["context_tokens"] > 0 and second["context_tokens"] == 0
+    first_prompt, second_prompt = ollama.chats
+    assert second_prompt[: len(first_prompt)] == first_prompt
+    assert second_prompt[len(first_prompt)]["role"] == "assistant"
+    assert "Leeds" not in second_prompt[-1]["content"]
+    assert state["turns"] == 2 and state["passages"] == 2
+    assert other_client.status_code == 400
+    assert ended.status_code == 200 and expired.status_code == 404
+
+
+def test_truncated_passages_are_not_recorded_as_sent(monkeypatch):
+    """A passage cut by the budget is sent again, whole, in a later turn."""
+    short = Document(page_content="The alibi witness places the defendant in Leeds.",
+                     metadata={"source": "case.pdf", "location": "p.1", "chunk_id": "case.pdf_1"})
+    long = Document(page_content=" ".join(f"Sentence {index} of the parole file." for index in range(30)),
+                    metadata={"source": "case.pdf", "location": "p.9", "chunk_id": "case.pdf_9"})
+
+    with FakeOllamaServer(dims=32) as ollama:
+        monkeypatch.setattr(settings, "OLLAMA_BASE_URL", ollama.url)
+        agent = LegalRAGAgent(local_vector_store(ollama.url))
+        agent.retriever = SimpleNamespace(retrieve=lambda question, client_doc_id: [short, long])
+        agent.packer = ContextPacker(max_tokens=60, counter=lambda text: len(text.split()))
+        session = SessionStore().create(CLIENT)
+
+        first = agent.query_in_session("Is there an alibi?", session)
+        agent.packer = ContextPacker(max_tokens=0)
+        second = agent.query_in_session("Is there an alibi?", session)
+
+    assert first["context_tokens"] > 0 and second["context_tokens"] > 0
+    assert session.turns[0].passages == [("case.pdf", "case.pdf_1", ())]
+    assert "Leeds" not in session.turns[1].content
+    assert "Sentence 29 of the parole file." in session.turns[1].content
@@ -0,0 +1,78 @@
+"""Storage download cache tests."""
+import threading
+import time
+
+from services.storage_cache import StorageCache
+
+
+def test_single_flight_and_range_reads(tmp_path):
+    """Concurrent misses share one download; ranges are served from disk."""
+    cache = StorageCache(str(tmp_path), max_bytes=1024)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return b"0123456789", "etag-1"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("doc/a.pdf", fetch))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [b"0123456789"] * 5
+    assert len(calls) == 1
+    assert cache.read_range("doc/a.pdf", 2, 4) == b"234"
+    assert cache.read_range("doc/a.pdf", 7, None) == b"789"
+    assert cache.read_range("doc/missing.pdf", 0, 1) is None
+
+
+def test_etag_revalidation_and_lru_eviction(tmp_path):
+    """Changed ETags force a refetch; the size cap evicts least recently used paths."""
+    cache = StorageCache(str(tmp_path), max_bytes=20)
+    versions = {"doc/a.pdf": (b"version-1", "v1")}
+
+    cache.get("doc/a.pdf", lambda: versions["doc/a.pdf"], lambda: "v1")
+    versions["doc/a.pdf"] = (b"version-2", "v2")
+    assert cache.get("doc/a.pdf", lambda: versions["doc/a.pdf"], lambda: "v1") == b"version-1"
+    assert cache.get("doc/a.pdf", lambda: versions["doc/a.pdf"], lambda: "v2") == b"version-2"
+    # Range reads are revalidated too: a stale entry is dropped, not served
+    assert cache.read_range("doc/a.pdf", 0, 6, lambda: "v2") == b"version"
+    assert cache.read_range("doc/a.pdf", 0, 6, lambda: "v3") is None
+    assert cache.stats()["revalidation_misses"] == 2
+    cache.get("doc/a.pdf", lambda: versions["doc/a.pdf"])
+
+    cache.get("doc/b.pdf", lambda: (b"bbbbbbbbbb", None))
+    cache.get("doc/c.pdf", lambda: (b"cccccccccc", None))
+
+    assert cache.read_range("doc/a.pdf", 0, None) is None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["revalidation_misses"] == 2
+
+    # The index survives a restart
+    cache.close()
+    reopened = StorageCache(str(tmp_path), max_bytes=20)
+    assert reopened.read_range("doc/c.pdf", 0, None) == b"cccccccccc"
+
+
+def test_index_writes_are_batched_and_unsaved_blobs_dropped(tmp_path):
+    """Shared blobs are counted once; blobs the saved index never saw are removed on startup."""
+    cache = StorageCache(str(tmp_path), max_bytes=1024, save_interval=3600)
+    cache.get("doc/a.pdf", lambda: (b"same", None))
+    cache.get("doc/copy.pdf", lambda: (b"same", None))
+    assert not (tmp_path / "index.json").exists()
+    assert cache.stats()["bytes"] == 4
+
+    cache.invalidate("doc/a.pdf")
+    assert cache.read_range("doc/copy.pdf", 0, None) == b"same"
+    cache.close()
+    cache.get("doc/b.pdf", lambda: (b"unsaved", None))
+
+    # Restart without close: doc/b.pdf was never written to the index
+    reopened = StorageCache(str(tmp_path), max_bytes=1024)
+    assert reopened.read_range("doc/copy.pdf", 0, None) == b"same"
+    assert reopened.read_range("doc/b.pdf", 0, None) is None
+    assert len(list((tmp_path / "objects").iterdir())) == 1
+    assert reopened.stats()["bytes"] == 4
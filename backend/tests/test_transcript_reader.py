@@ -0,0 +1,90 @@
+"""Transcript reader tests."""
+from services.transcript_reader import TranscriptReader
+
+
+def test_speaker_turns_with_timestamps():
+    """Frontend-style transcripts split on speaker turns with timestamps."""
+    lines = [
+        "=== AUDIO TRANSCRIPT ===",
+        "",
+        "[00:00:05] Judge:",
+        "Please state your name.",
+        "[00:00:09] Speaker 2:",
+        "John Doe.",
+        "I live on Elm Street.",
+    ]
+    segments = list(TranscriptReader(max_chars=512).iter_segments(lines, ".txt"))
+
+    assert [s["speaker"] for s in segments] == ["Judge", "Speaker 2"]
+    assert segments[0]["timestamp"] == "00:00:05"
+    assert segments[1]["text"] == "Speaker 2: John Doe. I live on Elm Street."
+    assert segments[1]["line"] == 6
+
+
+def test_plain_text_uses_line_numbers_and_bounded_segments():
+    """Untimed text records starting lines and never exceeds the segment size."""
+    lines = (f"line number {i} of the record" for i in range(1, 1001))
+    segments = list(TranscriptReader(max_chars=100).iter_segments(lines, ".txt"))
+
+    assert segments[0]["line"] == 1
+    assert segments[0]["timestamp"] is None
+    assert all(len(s["text"]) <= 100 for s in segments)
+    assert sum(s["text"].count("line number") for s in segments) == 1000
+
+
+def test_vtt_and_srt_cues():
+    """Subtitle cues keep voice labels and normalized start times."""
+    vtt = [
+        "WEBVTT",
+        "",
+        "1",
+        "00:01:02.500 --> 00:01:04.000",
+        "<v Attorney>Where were you that night?",
+        "",
+        "01:05.000 --> 01:07.000",
+        "<v Witness>At home.",
+    ]
+    srt = [
+        "1",
+        "00:00:01,000 --> 00:00:02,000",
+        "THE COURT: Be seated.",
+    ]
+    reader = TranscriptReader(max_chars=512)
+    vtt_segments = list(reader.iter_segments(vtt, ".vtt"))
+    srt_segments = list(reader.iter_segments(srt, ".srt"))
+
+    assert [s["timestamp"] for s in vtt_segments] == ["00:01:02", "00:01:05"]
+    assert vtt_segments[1]["text"] == "Witness: At home."
+    assert srt_segments[0]["speaker"] == "THE COURT"
+    assert srt_segments[0]["text"] == "THE COURT: Be seated."
+
+
+def test_prose_times_are_not_timestamps():
+    """Only HH:MM:SS or bracketed times start a cue; clock times in prose stay text."""
+    lines = [
+        "10:30 am the parties met at the courthouse.",
+        "01:02:03 The hearing resumed.",
+        "(12:15) Recess.",
+    ]
+    segments = list(TranscriptReader(max_chars=10).iter_segments(lines, ".txt"))
+
+    assert segments[0]["text"] == "10:30 am the parties met at the courthouse."
+    assert segments[0]["timestamp"] is None
+    assert [s["timestamp"] for s in segments[1:]] == ["01:02:03", "00:12:15"]
+
+
+def test_capitalised_prose_is_not_a_speaker():
+    """Speaker turns need an upper-case name; "Note:" and "Exhibit:" lines are text."""
+    lines = [
+        "MR. SMITH: Objection.",
+        "Note: the witness paused.",
+        "Exhibit: photograph of the scene.",
+        "THE COURT: Overruled.",
+    ]
+    segments = list(TranscriptReader(max_chars=512).iter_segments(lines, ".txt"))
+
+    assert [s["speaker"] for s in segments] == ["MR. SMITH", "THE COURT"]
+    assert segments[0]["text"] == (
+        "MR. SMITH: Objection. Note: the witness paused. "
+        "Exhibit: photograph of the scene."
+    )
@@ -1,8 +1,16 @@
 """Helper utility functions."""
+import base64
+import hashlib
+import json
+import shutil
+import tempfile
 import uuid
-from typing import Optional
+from typing import Any, BinaryIO, List, Optional, Tuple, Union
 from pathlib import Path
 
+# Bytes copied per read when spooling a stream to disk
+COPY_BUFFER_SIZE = 1024 * 1024
+
 
 def generate_doc_id() -> str:
     """Generate a UUID for document ID."""
@@ -10,8 +18,8 @@ def generate_doc_id() -> str:
 
 
 def validate_file_type(filename: str) -> bool:
-    """Validate if file type is supported (.pdf, .docx, .doc)."""
-    allowed_extensions = {".pdf", ".docx", ".doc"}
+    """Validate if file type is supported (.pdf, .docx, .doc, .txt, .md, .vtt, .srt)."""
+    allowed_extensions = {".pdf", ".docx", ".doc", ".txt", ".md", ".vtt", ".srt"}
     file_ext = Path(filename).suffix.lower()
     return file_ext in allowed_extensions
 
@@ -29,3 +37,58 @@ def sanitize_filename(filename: str) -> str:
     safe_name = safe_name.replace(" ", "_")
     return safe_name
 
+
+def storage_filename(relative_path: str) -> str:
+    """
+    Storage filename for a file at a relative path (in a directory or archive).
+
+    Subdirectories are folded into the name so same-named files in different
+    folders do not overwrite each other: ``2019/case 12/brief.pdf`` becomes
+    ``2019__case_12__brief.pdf``. Root and ``..`` components are dropped.
+    """
+    parts = [part for part in Path(relative_path).parts if part.strip("/\\.")]
+    return sanitize_filename("__".join(parts))
+
+
+def spool_to_temp_file(stream: BinaryIO, filename: str) -> str:
+    """
+    Copy a stream into a temporary file in fixed-size reads and return its path.
+
+    The file keeps the extension of ``filename``; the caller deletes it.
+    """
+    file_ext = Path(filename).suffix.lower()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
+        shutil.copyfileobj(stream, tmp_file, COPY_BUFFER_SIZE)
+        return tmp_file.name
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode keyset pagination values as an opaque URL-safe cursor."""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor produced by encode_cursor; raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(values, list):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return values
+
+
+def compute_file_hash(data: Union[bytes, str]) -> Tuple[str, int]:
+    """Return (sha256 hex digest, size in bytes) for file bytes or a local file path."""
+    if isinstance(data, bytes):
+        return hashlib.sha256(data).hexdigest(), len(data)
+
+    digest = hashlib.sha256()
+    size = 0
+    with open(data, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+            size += len(block)
+    return digest.hexdigest(), size
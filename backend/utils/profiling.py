@@ -0,0 +1,220 @@
+"""Opt-in per-request profiling: stage timings plus cProfile traces."""
+import cProfile
+import functools
+import io
+import pstats
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+_current: ContextVar[Optional["ProfileSession"]] = ContextVar("profile_session", default=None)
+
+# Per-thread flag so nested profiled stages share the outer profiler
+_thread_state = threading.local()
+
+
+class ProfileSession:
+    """
+    Profile of one request.
+
+    Stage timings arrive from ``profiled`` functions and from the metrics
+    stage helpers. Each outermost ``profiled`` call in a thread runs under
+    its own cProfile profiler, and the profilers are merged when the session
+    is finished. This also covers work that runs in worker threads.
+    """
+
+    def __init__(self, method: str, path: str, trigger: str, top_functions: int = 40):
+        """
+        Initialize profile session.
+
+        Args:
+            method: HTTP method
+            path: Request path
+            trigger: Why the request is profiled ("header" or "sample")
+            top_functions: Number of functions kept in the cProfile report
+        """
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.top_functions = top_functions
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.status: Optional[int] = None
+        self.stages: List[Dict[str, Any]] = []
+        self.report: Optional[str] = None
+        self._profilers: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def record_stage(self, name: str, seconds: float) -> None:
+        """Record a stage that ended now and took ``seconds``."""
+        offset = time.perf_counter() - self._started - seconds
+        with self._lock:
+            self.stages.append(
+                {
+                    "stage": name,
+                    "offset_ms": round(max(0.0, offset) * 1000, 2),
+                    "ms": round(seconds * 1000, 2),
+                    "thread": threading.current_thread().name,
+                }
+            )
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a stage, running cProfile if no profiler is active in this thread."""
+        profiler = None
+        if not getattr(_thread_state, "profiling", False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                _thread_state.profiling = True
+            except ValueError:
+                # Another profiler owns this interpreter; keep timings only
+                profiler = None
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+                _thread_state.profiling = False
+                with self._lock:
+                    self._profilers.append(profiler)
+            self.record_stage(name, elapsed)
+
+    def finish(self, status: int) -> None:
+        """Stop the clock and render the merged cProfile report."""
+        self.duration = time.perf_counter() - self._started
+        self.status = status
+        with self._lock:
+            profilers = list(self._profilers)
+            self._profilers.clear()
+        if not profilers:
+            return
+
+        buffer = io.StringIO()
+        stats = pstats.Stats(profilers[0], stream=buffer)
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        stats.sort_stats("cumulative").print_stats(self.top_functions)
+        self.report = buffer.getvalue()
+
+    def summary(self) -> Dict[str, Any]:
+        """Short description used in profile listings."""
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "trigger": self.trigger,
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+            "duration_ms": round(self.duration * 1000, 2) if self.duration else None,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Full profile: summary, stage timeline, per-stage totals and cProfile report."""
+        with self._lock:
+            stages = sorted(self.stages, key=lambda stage: stage["offset_ms"])
+        totals: Dict[str, Dict[str, float]] = {}
+        for stage in stages:
+            total = totals.setdefault(stage["stage"], {"count": 0, "ms": 0.0})
+            total["count"] += 1
+            total["ms"] = round(total["ms"] + stage["ms"], 2)
+        return {
+            **self.summary(),
+            "stage_totals": totals,
+            "stages": stages,
+            "cprofile": self.report,
+        }
+
+
+class ProfileStore:
+    """Bounded in-memory store of finished profiles (oldest dropped first)."""
+
+    def __init__(self, max_profiles: int):
+        """
+        Initialize profile store.
+
+        Args:
+            max_profiles: Number of profiles kept
+        """
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, ProfileSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, session: ProfileSession) -> None:
+        """Store a finished profile."""
+        with self._lock:
+            self._profiles[session.id] = session
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[ProfileSession]:
+        """Return a profile by id, if still stored."""
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Summaries of stored profiles, newest first."""
+        with self._lock:
+            sessions = list(self._profiles.values())
+        return [session.summary() for session in reversed(sessions)]
+
+    def clear(self) -> None:
+        """Drop all stored profiles."""
+        with self._lock:
+            self._profiles.clear()
+
+
+def current_session() -> Optional[ProfileSession]:
+    """Return the profile session of the current request, if it is being profiled."""
+    return _current.get()
+
+
+@contextmanager
+def profiling_session(session: ProfileSession) -> Iterator[ProfileSession]:
+    """Make ``session`` the active profile for the enclosed block (and its threads)."""
+    token = _current.set(session)
+    try:
+        yield session
+    finally:
+        _current.reset(token)
+
+
+def record_stage(name: str, seconds: float) -> None:
+    """Add a stage timing to the active profile, if any."""
+    session = _current.get()
+    if session is not None:
+        session.record_stage(name, seconds)
+
+
+def profiled(stage: str) -> Callable:
+    """
+    Decorate a function so it is timed (and cProfiled) when its request is profiled.
+
+    Outside a profiled request the wrapper only costs one context variable lookup.
+
+    Args:
+        stage: Stage name recorded in the profile
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            session = _current.get()
+            if session is None:
+                return func(*args, **kwargs)
+            with session.stage(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator